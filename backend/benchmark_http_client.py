@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark outbound HTTP latency: a new httpx.AsyncClient per request (the old
+OAuth callback behaviour) versus one shared, pooled client (server.http_client).
+
+Runs against a local stub server, so it measures connection setup overhead
+only; real OAuth providers add DNS and TLS handshakes on top of this.
+
+Usage: python benchmark_http_client.py [requests] [concurrency]
+"""
+import asyncio
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+REQUESTS = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+CONCURRENCY = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Mimics a small JSON OAuth response with keep-alive enabled"""
+    protocol_version = "HTTP/1.1"
+    body = b'{"keys": [], "access_token": "stub", "email": "stub@example.com"}'
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/oauth2/v3/certs"
+
+
+async def run(label, fetch):
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            response = await fetch()
+            response.raise_for_status()
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(REQUESTS)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{label:<22} mean {statistics.mean(latencies):7.2f} ms   "
+          f"p50 {statistics.median(latencies):7.2f} ms   p95 {p95:7.2f} ms   "
+          f"{REQUESTS / elapsed:8.1f} req/s")
+
+
+async def main():
+    server, url = start_stub_server()
+    print(f"{REQUESTS} requests, concurrency {CONCURRENCY}, stub at {url}\n")
+
+    async def per_request_client():
+        async with httpx.AsyncClient() as client:
+            return await client.get(url)
+
+    # Same settings as server.http_client
+    shared = httpx.AsyncClient(
+        timeout=httpx.Timeout(10.0, connect=5.0),
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60.0),
+    )
+
+    try:
+        await run("client per request", per_request_client)
+        await run("shared pooled client", lambda: shared.get(url))
+    finally:
+        await shared.aclose()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
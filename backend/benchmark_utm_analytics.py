@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark the UTM analytics endpoint's aggregation (server.utm_analytics_pipeline)
+against the old approach of pulling registrations into Python and bucketing them.
+
+Loads synthetic registrations into a scratch database (dropped afterwards unless
+--keep is given), then times the Python loop, the pipeline without the
+registered_at index, and the pipeline with it.
+
+Needs a real MongoDB: MONGO_URL (default mongodb://localhost:27017). The
+scratch database is BENCHMARK_DB_NAME (default hackov8_benchmark), never the
+app's DB_NAME.
+
+Usage: python benchmark_utm_analytics.py [registrations] [--keep]
+"""
+import asyncio
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+BENCHMARK_DB_NAME = os.environ.get("BENCHMARK_DB_NAME", "hackov8_benchmark")
+if BENCHMARK_DB_NAME == os.environ.get("DB_NAME"):
+    # The benchmark drops its database; refuse to point it at the app's
+    sys.exit(f"BENCHMARK_DB_NAME must differ from DB_NAME ({BENCHMARK_DB_NAME!r})")
+# server.py needs a DB_NAME to import; the benchmark never uses its connection
+os.environ.setdefault("DB_NAME", BENCHMARK_DB_NAME)
+
+from server import utm_analytics_pipeline  # noqa: E402
+
+REGISTRATIONS = int(sys.argv[1]) if len(sys.argv) > 1 and sys.argv[1].isdigit() else 1_000_000
+KEEP = "--keep" in sys.argv
+BATCH_SIZE = 10_000
+DAYS = 30
+
+SOURCES = ["google", "twitter", "linkedin", "newsletter", "referral", "discord", None]
+MEDIUMS = ["cpc", "social", "email", "user_share", None]
+CAMPAIGNS = [f"campaign-{i}" for i in range(200)] + [None]
+REFERRERS = [str(uuid.uuid4()) for _ in range(5000)]
+
+
+def synthetic_registration(now):
+    return {
+        "_id": str(uuid.uuid4()),
+        "user_id": str(uuid.uuid4()),
+        "hackathon_id": f"hackathon-{random.randint(1, 500)}",
+        "status": "registered",
+        "registered_at": now - timedelta(seconds=random.randint(0, 365 * 86400)),
+        "referred_by": random.choice(REFERRERS) if random.random() < 0.2 else None,
+        "utm_source": random.choice(SOURCES),
+        "utm_campaign": random.choice(CAMPAIGNS),
+        "utm_medium": random.choice(MEDIUMS),
+    }
+
+
+async def load(db):
+    now = datetime.now(timezone.utc)
+    await db.registrations.drop()
+    started = time.perf_counter()
+    for offset in range(0, REGISTRATIONS, BATCH_SIZE):
+        batch = [synthetic_registration(now) for _ in range(min(BATCH_SIZE, REGISTRATIONS - offset))]
+        await db.registrations.insert_many(batch, ordered=False)
+    print(f"Loaded {REGISTRATIONS:,} registrations in {time.perf_counter() - started:.1f}s\n")
+
+
+async def python_bucketing(db, start_date):
+    """The previous implementation, minus its 10k cap"""
+    counters = {"utm_source": {}, "utm_campaign": {}, "utm_medium": {}, "referred_by": {}}
+    defaults = {"utm_source": "direct", "utm_campaign": "none", "utm_medium": "none", "referred_by": "none"}
+    async for reg in db.registrations.find({"registered_at": {"$gte": start_date}}):
+        for field, counts in counters.items():
+            value = reg.get(field) or defaults[field]
+            counts[value] = counts.get(value, 0) + 1
+    return {field: sorted(counts.items(), key=lambda x: x[1], reverse=True)[:10] for field, counts in counters.items()}
+
+
+async def pipeline(db, start_date):
+    return await db.registrations.aggregate(utm_analytics_pipeline(start_date), allowDiskUse=True).to_list(1)
+
+
+async def timed(label, runs, fn):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await fn()
+        timings.append(time.perf_counter() - started)
+    print(f"{label:<32} best {min(timings) * 1000:9.1f} ms   mean {sum(timings) / len(timings) * 1000:9.1f} ms")
+
+
+async def main():
+    client = AsyncIOMotorClient(os.environ["MONGO_URL"])
+    db = client[BENCHMARK_DB_NAME]
+    start_date = datetime.now(timezone.utc) - timedelta(days=DAYS)
+
+    try:
+        await load(db)
+        print(f"Window: last {DAYS} days\n")
+        await timed("python bucketing (old)", 3, lambda: python_bucketing(db, start_date))
+        await timed("pipeline, no index", 3, lambda: pipeline(db, start_date))
+        await db.registrations.create_index("registered_at")
+        await timed("pipeline, registered_at index", 3, lambda: pipeline(db, start_date))
+    finally:
+        if not KEEP:
+            await client.drop_database(BENCHMARK_DB_NAME)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
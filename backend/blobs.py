@@ -0,0 +1,194 @@
+"""
+Content-addressed storage for uploaded files.
+
+An upload is stored once, under the key blobs/<aa>/<sha256>.<ext> in the
+storage backend (see storage.py), however many documents use it. The blobs
+collection holds one document per file with a reference count: callers
+retain() a URL when a document starts pointing at it and release() it when
+the document stops. Files whose count has stayed at zero for a grace period
+are garbage collected together with their recorded variants.
+
+A blob's URL changes whenever its content does, so blobs can be served with
+an immutable, year-long Cache-Control.
+"""
+import asyncio
+import re
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import ReturnDocument, UpdateOne
+
+from static_files import IMMUTABLE_CACHE_CONTROL
+from storage import StorageBackend
+
+BLOB_DIR = "blobs"
+TRASH_DIR = ".trash"
+DIGEST_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+
+class BlobStore:
+    """Deduplicating file store: objects in a storage backend plus a collection of refcounts"""
+
+    def __init__(self, collection, storage: StorageBackend):
+        self.collection = collection
+        self.storage = storage
+
+    def url_for(self, key: str) -> str:
+        return self.storage.url_for(key)
+
+    def digest_for_url(self, url: Optional[str]) -> Optional[str]:
+        """The sha256 behind a blob URL, or None for legacy and external URLs"""
+        key = self.storage.key_for_url(url)
+        if not key or not key.startswith(f"{BLOB_DIR}/"):
+            return None
+        digest = key.rsplit("/", 1)[-1].split(".", 1)[0]
+        return digest if DIGEST_PATTERN.fullmatch(digest) else None
+
+    def variant_key(self, blob: Dict[str, Any], name: str, width: int) -> str:
+        return f"{blob['path'].rsplit('.', 1)[0]}-{name}-{width}w.webp"
+
+    # ---- storing ----
+
+    async def claim(self, digest: str, size: int, extension: str,
+                    content_type: Optional[str] = None) -> Dict[str, Any]:
+        """Find or create the document for some content, restarting its grace period"""
+        now = datetime.now(timezone.utc)
+        return await self.collection.find_one_and_update(
+            {"_id": digest},
+            {
+                "$setOnInsert": {
+                    "path": f"{BLOB_DIR}/{digest[:2]}/{digest}.{extension}",
+                    "size": size,
+                    "content_type": content_type,
+                    "refcount": 0,
+                    "variants": {},
+                    "created_at": now
+                },
+                # GC leaves the blob alone until it is referenced or the grace period lapses
+                "$set": {"touched_at": now}
+            },
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def place(self, blob: Dict[str, Any], spooled: Path):
+        """Upload a claimed blob's file, or drop the spooled copy if the content is already stored"""
+        try:
+            if await self.storage.exists(blob["path"]):
+                await asyncio.to_thread(spooled.unlink, missing_ok=True)
+            else:
+                await self.storage.put_file(blob["path"], spooled, blob.get("content_type"), IMMUTABLE_CACHE_CONTROL)
+        except BaseException:
+            await asyncio.to_thread(spooled.unlink, missing_ok=True)
+            raise
+
+    async def put(self, spooled: Path, digest: str, size: int, extension: str,
+                  content_type: Optional[str] = None) -> Dict[str, Any]:
+        """Store a spooled file under its digest, or drop it if that content is already stored"""
+        blob = await self.claim(digest, size, extension, content_type)
+        await self.place(blob, spooled)
+        return blob
+
+    async def put_variants(self, blob: Dict[str, Any], name: str,
+                           rendered: List[Tuple[int, Path]]) -> List[Dict[str, Any]]:
+        """Upload rendered variant files (width, local path) and record them on the blob"""
+        variants = []
+        for width, path in rendered:
+            key = self.variant_key(blob, name, width)
+            await self.storage.put_file(key, path, "image/webp", IMMUTABLE_CACHE_CONTROL)
+            variants.append({"width": width, "url": self.url_for(key)})
+        await self.collection.update_one({"_id": blob["_id"]}, {"$set": {f"variants.{name}": variants}})
+        return variants
+
+    async def variants_for_url(self, url: Optional[str], name: str) -> List[Dict[str, Any]]:
+        """Recorded variants of a blob URL ([] for legacy and external URLs)"""
+        digest = self.digest_for_url(url)
+        if not digest:
+            return []
+        blob = await self.collection.find_one({"_id": digest}, {f"variants.{name}": 1})
+        return (blob or {}).get("variants", {}).get(name, [])
+
+    # ---- references ----
+
+    async def retain(self, url: Optional[str]):
+        digest = self.digest_for_url(url)
+        if digest:
+            await self.collection.update_one({"_id": digest}, {"$inc": {"refcount": 1}})
+
+    async def release(self, url: Optional[str]):
+        digest = self.digest_for_url(url)
+        if digest:
+            await self.collection.update_one(
+                {"_id": digest},
+                {"$inc": {"refcount": -1}, "$set": {"touched_at": datetime.now(timezone.utc)}}
+            )
+
+    async def swap(self, old_url: Optional[str], new_url: Optional[str]):
+        """Move a document's reference from old_url to new_url"""
+        if old_url != new_url:
+            await self.retain(new_url)
+            await self.release(old_url)
+
+    async def reconcile(self, counts: Dict[str, int]) -> Dict[str, int]:
+        """Reset refcounts to the actual number of references (digest -> count)"""
+        now = datetime.now(timezone.utc)
+        operations = []
+        async for blob in self.collection.find({}, {"refcount": 1}):
+            actual = counts.get(blob["_id"], 0)
+            if blob.get("refcount") != actual:
+                update = {"refcount": actual}
+                if actual == 0:
+                    # The grace period starts from the correction, not from the stale touched_at
+                    update["touched_at"] = now
+                # Matching the count we read means a concurrent retain/release is never overwritten
+                operations.append(UpdateOne({"_id": blob["_id"], "refcount": blob.get("refcount")}, {"$set": update}))
+
+        for i in range(0, len(operations), 1000):
+            await self.collection.bulk_write(operations[i:i + 1000], ordered=False)
+        return {"corrected": len(operations)}
+
+    # ---- garbage collection ----
+
+    def _blob_keys(self, blob: Dict[str, Any]) -> List[str]:
+        keys = [blob["path"]]
+        for variants in blob.get("variants", {}).values():
+            keys += [self.storage.key_for_url(variant["url"]) for variant in variants]
+        return [key for key in keys if key]
+
+    async def _move_to_trash(self, blob: Dict[str, Any]) -> List[Tuple[str, str]]:
+        moved = []
+        for key in self._blob_keys(blob):
+            trash_key = f"{TRASH_DIR}/{blob['_id']}/{key.rsplit('/', 1)[-1]}"
+            try:
+                await self.storage.rename(key, trash_key)
+            except FileNotFoundError:
+                continue
+            moved.append((key, trash_key))
+        return moved
+
+    async def _collect(self, blob: Dict[str, Any], orphan_filter: Dict[str, Any]) -> bool:
+        # Files go out of reach before the document is deleted: a put() racing with this
+        # either keeps the document alive (files are restored) or re-uploads the files
+        moved = await self._move_to_trash(blob)
+        result = await self.collection.delete_one({"_id": blob["_id"], **orphan_filter})
+        for key, trash_key in moved:
+            if result.deleted_count:
+                await self.storage.delete(trash_key)
+            else:
+                await self.storage.rename(trash_key, key)
+        return bool(result.deleted_count)
+
+    async def collect_garbage(self, grace: timedelta) -> int:
+        """Delete blobs that have had no references for longer than grace; returns how many"""
+        orphan_filter = {"refcount": {"$lte": 0}, "touched_at": {"$lt": datetime.now(timezone.utc) - grace}}
+        collected = 0
+        async for blob in self.collection.find(orphan_filter, {"path": 1, "variants": 1}):
+            collected += await self._collect(blob, orphan_filter)
+        return collected
+
+    async def discard_if_unreferenced(self, digest: str):
+        """Delete a blob straight away unless something references it (e.g. an upload that failed validation)"""
+        blob = await self.collection.find_one({"_id": digest}, {"path": 1, "variants": 1})
+        if blob:
+            await self._collect(blob, {"refcount": {"$lte": 0}})
@@ -1,71 +1,97 @@
 #!/usr/bin/env python3
 """
-Script to add slugs to hackathons that don't have them
+Script to add slugs to hackathons that don't have them, rename duplicate
+hackathon and profile slugs, clear empty profile slugs, and then build the
+unique slug indexes the API relies on
 """
 import asyncio
 import os
-import re
 from motor.motor_asyncio import AsyncIOMotorClient
 from dotenv import load_dotenv
 
+from slugs import slugify, allocate_unique_slug, ensure_slug_indexes
+
 load_dotenv()
 
 MONGO_URL = os.environ.get('MONGO_URL', 'mongodb://localhost:27017')
 
-def generate_slug(title, existing_slugs):
-    """Generate SEO-friendly slug from title"""
-    slug = re.sub(r'[^a-z0-9]+', '-', title.lower()).strip('-')
+async def reassign_slug(db, hackathon):
+    """Give a hackathon the next free slug derived from its title"""
+    title = hackathon.get("title") or "untitled"
+    
+    async def set_slug(slug):
+        await db.hackathons.update_one({"_id": hackathon["_id"]}, {"$set": {"slug": slug}})
     
-    if slug not in existing_slugs:
-        return slug
+    slug = await allocate_unique_slug(db.hackathons, "slug", slugify(title, fallback="hackathon"), set_slug)
+    print(f"✅ Set slug '{slug}' on '{title}'")
+
+async def reassign_profile_slug(db, user, base: str):
+    """Give a user the next free profile slug derived from the one they shared"""
+    async def set_slug(slug):
+        await db.users.update_one({"_id": user}, {"$set": {"profile_slug": slug}})
     
-    # If slug exists, append number
-    counter = 1
-    while f"{slug}-{counter}" in existing_slugs:
-        counter += 1
-    return f"{slug}-{counter}"
+    slug = await allocate_unique_slug(db.users, "profile_slug", slugify(base, fallback="user"), set_slug)
+    print(f"✅ Set profile slug '{slug}' on user {user}")
+
+async def fix_profile_slugs(db):
+    """Clear empty profile slugs and rename duplicates (earlier versions allowed both)"""
+    cleared = await db.users.update_many({"profile_slug": ""}, {"$unset": {"profile_slug": ""}})
+    
+    # Duplicates: the oldest account keeps the slug, the rest get a numbered one
+    duplicates = db.users.aggregate([
+        {"$match": {"profile_slug": {"$type": "string"}}},
+        {"$sort": {"created_at": 1}},
+        {"$group": {"_id": "$profile_slug", "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}}
+    ])
+    renamed = 0
+    async for group in duplicates:
+        print(f"Profile slug '{group['_id']}' is shared by {group['count']} users")
+        extra_ids = group["ids"][1:]
+        await db.users.update_many({"_id": {"$in": extra_ids}}, {"$unset": {"profile_slug": ""}})
+        for user_id in extra_ids:
+            await reassign_profile_slug(db, user_id, group["_id"])
+        renamed += len(extra_ids)
+    
+    print(f"✅ Profile slugs: {cleared.modified_count} empty cleared, {renamed} duplicates renamed")
 
 async def fix_slugs():
-    """Add slugs to hackathons that don't have them"""
+    """Add missing slugs and resolve duplicates before indexing"""
     client = AsyncIOMotorClient(MONGO_URL)
     db = client.hackov8
     
     try:
-        # Find all hackathons
-        hackathons = await db.hackathons.find({}).to_list(1000)
-        print(f"Found {len(hackathons)} hackathons")
-        
-        # Get existing slugs
-        existing_slugs = [h.get("slug") for h in hackathons if h.get("slug")]
-        print(f"Existing slugs: {len(existing_slugs)}")
+        # Duplicates: keep the slug on the oldest hackathon, rename the rest
+        duplicates = db.hackathons.aggregate([
+            {"$match": {"slug": {"$type": "string", "$ne": ""}}},
+            {"$sort": {"created_at": 1}},
+            {"$group": {"_id": "$slug", "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+            {"$match": {"count": {"$gt": 1}}}
+        ])
+        renamed = 0
+        async for group in duplicates:
+            # Clear first so the allocator doesn't see them as taken
+            extra_ids = group["ids"][1:]
+            await db.hackathons.update_many({"_id": {"$in": extra_ids}}, {"$unset": {"slug": ""}})
+            print(f"Slug '{group['_id']}' is shared by {group['count']} hackathons")
+            renamed += len(extra_ids)
         
-        # Find hackathons without slugs
-        missing_slug = [h for h in hackathons if not h.get("slug")]
-        print(f"Hackathons without slugs: {len(missing_slug)}")
+        # Hackathons without slugs, streamed rather than loaded in one list
+        missing_query = {"$or": [{"slug": {"$exists": False}}, {"slug": None}, {"slug": ""}]}
+        updated = 0
+        async for hackathon in db.hackathons.find(missing_query, {"title": 1}):
+            await reassign_slug(db, hackathon)
+            updated += 1
         
-        if not missing_slug:
-            print("✅ All hackathons have slugs!")
-            return
+        if updated:
+            print(f"\n✅ Updated {updated} hackathons with slugs ({renamed} were duplicates)!")
+        else:
+            print("✅ All hackathons have unique slugs!")
         
-        # Add slugs to hackathons
-        updated = 0
-        for hackathon in missing_slug:
-            title = hackathon.get("title", "untitled")
-            slug = generate_slug(title, existing_slugs)
-            existing_slugs.append(slug)
-            
-            result = await db.hackathons.update_one(
-                {"_id": hackathon["_id"]},
-                {"$set": {"slug": slug}}
-            )
-            
-            if result.modified_count > 0:
-                updated += 1
-                print(f"✅ Added slug '{slug}' to '{title}'")
-            else:
-                print(f"❌ Failed to update '{title}'")
+        await fix_profile_slugs(db)
         
-        print(f"\n✅ Updated {updated} hackathons with slugs!")
+        if await ensure_slug_indexes(db):
+            print("✅ Unique slug indexes are in place")
         
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Move uploads referenced by the old naming scheme (hackathon_banners/<uuid>,
+profile_photos/<user id>, certificate_templates/<hackathon id>_template) into
+the content-addressed blob store and point the documents at the blob URLs.
+
+Legacy files are read from the local uploads directory and stored through
+the configured storage backend, so this also moves them to S3 when
+STORAGE_BACKEND=s3. Originals are left in place; once the new URLs are live
+they can be deleted.
+Image variants are not generated here, so migrated images keep being served
+without srcset until they are re-uploaded.
+
+Usage: python migrate_uploads_to_blobs.py [--dry-run]
+"""
+import asyncio
+import hashlib
+import sys
+import tempfile
+from pathlib import Path
+
+from server import BLOB_REFERENCES, UPLOADS_DIR, UPLOADS_URL_PATTERN, blob_store, client, db, storage
+
+DRY_RUN = "--dry-run" in sys.argv
+
+
+def spool_copy(source: Path):
+    """Copy a legacy file into the storage spool, hashing it on the way"""
+    storage.spool_dir.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256()
+    with open(source, "rb") as src, tempfile.NamedTemporaryFile(dir=storage.spool_dir, delete=False) as dst:
+        while chunk := src.read(1024 * 1024):
+            digest.update(chunk)
+            dst.write(chunk)
+    return Path(dst.name), digest.hexdigest(), source.stat().st_size
+
+
+async def migrate_reference(collection_name: str, field: str, doc) -> bool:
+    url = doc[field]
+    key = storage.key_for_url(url)
+    source = UPLOADS_DIR / key if key else None
+    if not source or not source.is_file():
+        print(f"⚠️ {collection_name} {doc['_id']}: {url} is missing on disk, skipped")
+        return False
+    if DRY_RUN:
+        print(f"Would migrate {collection_name} {doc['_id']}: {url}")
+        return True
+
+    spooled, digest, size = await asyncio.to_thread(spool_copy, source)
+    extension = source.suffix.lstrip(".").lower() or "bin"
+    blob = await blob_store.put(spooled, digest, size, extension)
+    blob_url = blob_store.url_for(blob["path"])
+
+    # Only swap if the document still points at the legacy file
+    result = await db[collection_name].update_one({"_id": doc["_id"], field: url}, {"$set": {field: blob_url}})
+    if result.modified_count:
+        await blob_store.retain(blob_url)
+        print(f"✅ {collection_name} {doc['_id']}: {url} -> {blob_url}")
+    return bool(result.modified_count)
+
+
+async def migrate():
+    try:
+        migrated = 0
+        # Relative or absolute upload URLs that are not blobs yet
+        legacy_pattern = f"{UPLOADS_URL_PATTERN}(?!blobs/)"
+        for collection_name, field in BLOB_REFERENCES:
+            cursor = db[collection_name].find({field: {"$regex": legacy_pattern}}, {field: 1})
+            async for doc in cursor:
+                migrated += await migrate_reference(collection_name, field, doc)
+
+        action = "would be migrated" if DRY_RUN else "migrated"
+        print(f"\n✅ {migrated} references {action}")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
@@ -1,12 +1,14 @@
 from fastapi import FastAPI, APIRouter, HTTPException, Depends, Response, Request, UploadFile, File, Form
-from fastapi.responses import JSONResponse, FileResponse, RedirectResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import JSONResponse, FileResponse, RedirectResponse, StreamingResponse
+from fastapi.encoders import jsonable_encoder
 from dotenv import load_dotenv
 import aiosmtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import DeleteOne, UpdateOne
+from pymongo.errors import OperationFailure, DuplicateKeyError
 import os
 import logging
 from pathlib import Path
@@ -15,13 +17,32 @@ from typing import List, Optional, Dict, Any
 import uuid
 from datetime import datetime, timezone, timedelta
 import httpx
+import jwt
+from cachetools import TTLCache
 from passlib.context import CryptContext
 import secrets
 import json
-import shutil
+import html
+import hashlib
+import base64
 import re
 import asyncio
 import gc
+import time
+import random
+import math
+import csv
+import io
+import zlib
+import tempfile
+from string import Template
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import format_datetime, parsedate_to_datetime
+
+from slugs import slugify, allocate_unique_slug, ensure_slug_indexes
+from blobs import BlobStore, BLOB_DIR
+from static_files import CachedStaticFiles
+from storage import UPLOADS_URL_PATTERN, storage_from_env, is_public_key
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -40,6 +61,43 @@ api_router = APIRouter(prefix="/api")
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Notification retention: read notifications expire via TTL index, old unread
+# ones are compacted into monthly per-user buckets in notification_archives
+NOTIFICATION_READ_TTL_DAYS = int(os.environ.get('NOTIFICATION_READ_TTL_DAYS', '30'))
+NOTIFICATION_ARCHIVE_AFTER_DAYS = int(os.environ.get('NOTIFICATION_ARCHIVE_AFTER_DAYS', '90'))
+
+# Homepage hackathon listings are cached briefly per filter; writes clear the
+# cache in this worker and the TTL bounds staleness in the others
+HACKATHON_LISTING_CACHE_TTL = int(os.environ.get('HACKATHON_LISTING_CACHE_TTL', '30'))
+hackathon_listing_cache = TTLCache(maxsize=512, ttl=HACKATHON_LISTING_CACHE_TTL)
+
+# Rendered public profiles keyed by slug; dropped on profile changes and new registrations
+PUBLIC_PROFILE_CACHE_TTL = int(os.environ.get('PUBLIC_PROFILE_CACHE_TTL', '300'))
+public_profile_cache = TTLCache(maxsize=2048, ttl=PUBLIC_PROFILE_CACHE_TTL)
+
+# Shared outbound HTTP client (OAuth providers, Emergent Auth). One pool for the
+# app's lifetime so connections, DNS lookups and TLS sessions are reused.
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_ENABLED = True
+except ImportError:
+    HTTP2_ENABLED = False
+
+# Parquet exports need pyarrow (pinned in requirements.txt); without it the format is refused
+try:
+    import pyarrow
+    import pyarrow.parquet
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+http_client = httpx.AsyncClient(
+    http2=HTTP2_ENABLED,
+    timeout=httpx.Timeout(10.0, connect=5.0),
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60.0),
+    headers={"User-Agent": "Hackov8/1.0"},
+)
+
 # ==================== MODELS ====================
 
 class User(BaseModel):
@@ -70,6 +128,7 @@ class User(BaseModel):
     certifications: Optional[List[dict]] = []  # [{name, issuer, date, link}]
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     last_login: Optional[datetime] = None  # Track user logins for retention
+    participation_count: int = 0  # Hackathon registrations, kept with $inc
     email_verified: bool = False
     verification_token: Optional[str] = None
     # Referral system
@@ -77,6 +136,7 @@ class User(BaseModel):
     # Public profile
     profile_slug: Optional[str] = None  # Custom URL slug for public profile
     profile_photo: Optional[str] = None  # URL to profile photo
+    profile_photo_variants: List[Dict[str, Any]] = []  # [{width, url}] WebP renditions
     
     class Config:
         populate_by_name = True
@@ -106,6 +166,7 @@ class Hackathon(BaseModel):
     slug: str  # SEO-friendly URL slug
     description: str
     cover_image: Optional[str] = None
+    cover_image_variants: List[Dict[str, Any]] = []  # [{width, url}] WebP renditions for srcset
     organizer_id: str
     organizer_name: str
     category: str
@@ -139,6 +200,9 @@ class Hackathon(BaseModel):
     sponsors: List[Dict[str, str]] = []  # [{name, logo, website}]
     judges: List[Dict[str, str]] = []    # [{name, photo, bio, linkedin}] - Display only
     assigned_judges: List[str] = []  # List of user IDs (judges) assigned to evaluate this hackathon
+    # Denormalized counters, kept in step with $inc and reconciled by reconcile_hackathon_counters
+    registration_count: int = 0
+    submission_count: int = 0
     
     class Config:
         populate_by_name = True
@@ -216,6 +280,7 @@ class Notification(BaseModel):
     title: str
     message: str
     read: bool = False
+    read_at: Optional[datetime] = None  # Set when marked read, drives the TTL index
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     
     class Config:
@@ -341,123 +406,504 @@ class UserUpdate(BaseModel):
     profile_slug: Optional[str] = None
 
 
-# Email utility functions
-async def send_verification_email(to_email: str, user_name: str, verification_token: str):
-    """Send verification email to user"""
-    # Force reload environment to ensure latest values
-    from dotenv import load_dotenv
-    load_dotenv(override=True)
-    
-    smtp_host = os.environ.get('SMTP_HOST', 'smtp.gmail.com')
-    smtp_port = int(os.environ.get('SMTP_PORT', '587'))
-    smtp_user = os.environ.get('SMTP_USER')
-    smtp_password = os.environ.get('SMTP_PASSWORD')
-    from_email = os.environ.get('SMTP_FROM_EMAIL')
-    from_name = os.environ.get('SMTP_FROM_NAME', 'Hackov8')
-    frontend_url = os.environ.get('FRONTEND_URL', 'https://hackov8.xyz')
-    
-    print(f"📧 EMAIL DEBUG - FRONTEND_URL from env: {frontend_url}")
-    print(f"📧 EMAIL DEBUG - All env keys: {list(os.environ.keys())[:10]}")
-    
-    if not all([smtp_user, smtp_password, from_email]):
-        print("SMTP credentials not configured, skipping email send")
-        return False
-    
-    # Create verification URL
-    verification_url = f"{frontend_url}/verify-email?token={verification_token}"
-    
-    # Log the URL being used (for debugging)
-    print(f"🔗 Generating verification email with URL: {verification_url}")
-    
-    # Create email content
-    subject = "Verify Your Hackov8 Account"
-    
-    html_body = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <style>
-            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-            .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
-            .content {{ background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }}
-            .button {{ display: inline-block; padding: 15px 30px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; text-decoration: none; border-radius: 5px; font-weight: bold; margin: 20px 0; }}
-            .footer {{ text-align: center; margin-top: 20px; font-size: 12px; color: #666; }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>🚀 Welcome to Hackov8!</h1>
-            </div>
-            <div class="content">
-                <h2>Hi {user_name},</h2>
-                <p>Thank you for signing up for Hackov8! We're excited to have you join our hackathon community.</p>
-                <p>To complete your registration and start exploring hackathons, please verify your email address by clicking the button below:</p>
-                <div style="text-align: center;">
-                    <a href="{verification_url}" class="button">Verify Email Address</a>
-                </div>
-                <p>Or copy and paste this link into your browser:</p>
-                <p style="word-break: break-all; color: #667eea;">{verification_url}</p>
-                <p><strong>This link will expire in 24 hours.</strong></p>
-                <p>If you didn't create an account with Hackov8, you can safely ignore this email.</p>
-                <p>Best regards,<br>The Hackov8 Team</p>
+# ==================== EMAIL ====================
+
+# Shared HTML shell; each template's heading and content are spliced in once
+# at import so rendering is a single substitute() per recipient
+EMAIL_LAYOUT_HTML = Template("""<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+        .header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }
+        .content { background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }
+        .button { display: inline-block; padding: 15px 30px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; text-decoration: none; border-radius: 5px; font-weight: bold; margin: 20px 0; }
+        .footer { text-align: center; margin-top: 20px; font-size: 12px; color: #666; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>$heading</h1>
+        </div>
+        <div class="content">
+$content
+            <p>Best regards,<br>The Hackov8 Team</p>
+        </div>
+        <div class="footer">
+            <p>© 2025 Hackov8. All rights reserved.</p>
+        </div>
+    </div>
+</body>
+</html>
+""")
+
+EMAIL_TEXT_SIGNATURE = """
+Best regards,
+The Hackov8 Team
+"""
+
+
+class EmailTemplate:
+    """Email template compiled once; render() only substitutes per-recipient variables"""
+    
+    def __init__(self, subject: str, heading: str, html_content: str, text_content: str):
+        self.subject = Template(subject)
+        self.html = Template(EMAIL_LAYOUT_HTML.substitute(heading=heading, content=html_content))
+        self.text = Template(text_content + EMAIL_TEXT_SIGNATURE)
+    
+    def render(self, **variables) -> tuple:
+        """Return (subject, text_body, html_body) for one recipient"""
+        # Subjects are single-line headers; user-supplied titles must not break them
+        subject = " ".join(self.subject.substitute(variables).split())
+        escaped = {
+            key: html.escape(str(value)).replace("\n", "<br>\n")
+            for key, value in variables.items()
+        }
+        return subject, self.text.substitute(variables), self.html.substitute(escaped)
+
+
+EMAIL_TEMPLATES: Dict[str, EmailTemplate] = {
+    "verification": EmailTemplate(
+        subject="Verify Your Hackov8 Account",
+        heading="🚀 Welcome to Hackov8!",
+        html_content="""            <h2>Hi $user_name,</h2>
+            <p>Thank you for signing up for Hackov8! We're excited to have you join our hackathon community.</p>
+            <p>To complete your registration and start exploring hackathons, please verify your email address by clicking the button below:</p>
+            <div style="text-align: center;">
+                <a href="$verification_url" class="button">Verify Email Address</a>
             </div>
-            <div class="footer">
-                <p>© 2025 Hackov8. All rights reserved.</p>
+            <p>Or copy and paste this link into your browser:</p>
+            <p style="word-break: break-all; color: #667eea;">$verification_url</p>
+            <p><strong>This link will expire in 24 hours.</strong></p>
+            <p>If you didn't create an account with Hackov8, you can safely ignore this email.</p>""",
+        text_content="""Hi $user_name,
+
+Thank you for signing up for Hackov8!
+
+To complete your registration, please verify your email address by clicking the link below:
+$verification_url
+
+This link will expire in 24 hours.
+
+If you didn't create an account with Hackov8, you can safely ignore this email.
+"""
+    ),
+    "hackathon_announcement": EmailTemplate(
+        subject="Update: $hackathon_title",
+        heading="📣 $hackathon_title",
+        html_content="""            <h2>Hi $user_name,</h2>
+            <p>The organizers of <strong>$hackathon_title</strong> have posted an update:</p>
+            <h3>$title</h3>
+            <p>$message</p>
+            <div style="text-align: center;">
+                <a href="$hackathon_url" class="button">View Hackathon</a>
+            </div>""",
+        text_content="""Hi $user_name,
+
+The organizers of $hackathon_title have posted an update:
+
+$title
+
+$message
+
+View the hackathon: $hackathon_url
+"""
+    ),
+    "certificate_ready": EmailTemplate(
+        subject="Your $event_name certificate is ready",
+        heading="🎓 Your Certificate is Ready",
+        html_content="""            <h2>Hi $user_name,</h2>
+            <p>Your <strong>$role</strong> certificate for <strong>$event_name</strong> has been issued.</p>
+            <div style="text-align: center;">
+                <a href="$certificate_url" class="button">Download Certificate</a>
             </div>
-        </div>
-    </body>
-    </html>
-    """
-    
-    text_body = f"""
-    Hi {user_name},
-    
-    Thank you for signing up for Hackov8!
-    
-    To complete your registration, please verify your email address by clicking the link below:
-    {verification_url}
-    
-    This link will expire in 24 hours.
-    
-    If you didn't create an account with Hackov8, you can safely ignore this email.
+            <p>Anyone can confirm it is genuine at:</p>
+            <p style="word-break: break-all; color: #667eea;">$verify_url</p>""",
+        text_content="""Hi $user_name,
+
+Your $role certificate for $event_name has been issued.
+
+Download it here: $certificate_url
+
+Anyone can confirm it is genuine at: $verify_url
+"""
+    ),
+    "referral_success": EmailTemplate(
+        subject="Referral Success! Someone joined $hackathon_title",
+        heading="🎉 Referral Success!",
+        html_content="""            <h2>Hi $user_name,</h2>
+            <p>Someone just registered for <strong>$hackathon_title</strong> using your referral link.</p>
+            <p>Keep sharing to bring more builders along:</p>
+            <p style="word-break: break-all; color: #667eea;">$referral_link</p>""",
+        text_content="""Hi $user_name,
+
+Someone just registered for $hackathon_title using your referral link.
+
+Keep sharing to bring more builders along:
+$referral_link
+"""
+    ),
+}
+
+
+class SMTPConnectionPool:
+    """Pool of persistent, authenticated SMTP connections"""
+    
+    def __init__(self, hostname: str, port: int, username: Optional[str], password: Optional[str],
+                 start_tls: bool = True, size: int = 2, timeout: float = 30.0):
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.password = password
+        self.start_tls = start_tls
+        self.size = size
+        self.timeout = timeout
+        self._idle: List[aiosmtplib.SMTP] = []
+        self._slots = asyncio.Semaphore(size)
+    
+    async def acquire(self) -> aiosmtplib.SMTP:
+        await self._slots.acquire()
+        try:
+            while self._idle:
+                smtp = self._idle.pop()
+                if smtp.is_connected:
+                    return smtp
+            
+            # connect() performs STARTTLS and login once for the connection's lifetime
+            smtp = aiosmtplib.SMTP(
+                hostname=self.hostname,
+                port=self.port,
+                username=self.username,
+                password=self.password,
+                start_tls=self.start_tls,
+                timeout=self.timeout,
+            )
+            await smtp.connect()
+            return smtp
+        except Exception:
+            self._slots.release()
+            raise
+    
+    def release(self, smtp: aiosmtplib.SMTP, broken: bool = False):
+        if broken or not smtp.is_connected:
+            smtp.close()
+        else:
+            self._idle.append(smtp)
+        self._slots.release()
+    
+    async def close(self):
+        idle, self._idle = self._idle, []
+        for smtp in idle:
+            try:
+                await smtp.quit()
+            except Exception:
+                smtp.close()
+
+
+def is_permanent_smtp_failure(error: Exception) -> bool:
+    """5xx replies (unknown mailbox, rejected content) fail the same way on every retry"""
+    if isinstance(error, aiosmtplib.SMTPRecipientsRefused):
+        return all(refused.code >= 500 for refused in error.recipients)
+    return isinstance(error, aiosmtplib.SMTPResponseException) and error.code >= 500
+
+
+class Mailer:
+    """Background email sender: bounded queue, batched sends over pooled connections, retry with backoff"""
+    
+    def __init__(self):
+        self.from_email = os.environ.get('SMTP_FROM_EMAIL')
+        self.from_name = os.environ.get('SMTP_FROM_NAME', 'Hackov8')
+        self.batch_size = int(os.environ.get('EMAIL_BATCH_SIZE', '20'))
+        self.max_retries = int(os.environ.get('EMAIL_MAX_RETRIES', '5'))
+        # Seconds before the first retry; doubles with each attempt
+        self.retry_delay = float(os.environ.get('EMAIL_RETRY_DELAY', '1'))
+        self.queue_size = int(os.environ.get('EMAIL_QUEUE_SIZE', '10000'))
+        self.pool = SMTPConnectionPool(
+            hostname=os.environ.get('SMTP_HOST', 'smtp.gmail.com'),
+            port=int(os.environ.get('SMTP_PORT', '587')),
+            username=os.environ.get('SMTP_USER'),
+            password=os.environ.get('SMTP_PASSWORD'),
+            # Set SMTP_START_TLS=false to test against a local debugging SMTP server
+            start_tls=os.environ.get('SMTP_START_TLS', 'true').lower() == 'true',
+            size=int(os.environ.get('SMTP_POOL_SIZE', '2')),
+        )
+        self.metrics = {"queued": 0, "sent": 0, "retried": 0, "failed": 0, "dropped": 0, "send_time_ms": 0.0}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._retry_tasks = set()
+        self._started_at: Optional[float] = None
+    
+    @property
+    def configured(self) -> bool:
+        # Local debugging servers accept unauthenticated mail
+        return bool(self.from_email and (self.pool.username or not self.pool.start_tls))
+    
+    def start(self):
+        if not self.configured:
+            print("SMTP credentials not configured, email sending disabled")
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.pool.size)]
+        self._started_at = time.monotonic()
+    
+    async def stop(self, drain_timeout: float = 10.0):
+        if self._queue is not None:
+            try:
+                await asyncio.wait_for(self._queue.join(), drain_timeout)
+            except asyncio.TimeoutError:
+                print(f"Mailer stopped with {self._queue.qsize()} emails still queued")
+        tasks = self._workers + list(self._retry_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._queue = None
+        await self.pool.close()
+    
+    def build_message(self, to_email: str, subject: str, text_body: str, html_body: str) -> MIMEMultipart:
+        message = MIMEMultipart('alternative')
+        message['Subject'] = subject
+        message['From'] = f"{self.from_name} <{self.from_email}>"
+        message['To'] = to_email
+        message.attach(MIMEText(text_body, 'plain'))
+        message.attach(MIMEText(html_body, 'html'))
+        return message
+    
+    def enqueue(self, message: MIMEMultipart) -> bool:
+        """Queue a message for delivery; returns False if the mailer is down or full"""
+        if self._queue is None:
+            return False
+        try:
+            self._queue.put_nowait({"message": message, "attempts": 0})
+        except asyncio.QueueFull:
+            self.metrics["dropped"] += 1
+            return False
+        self.metrics["queued"] += 1
+        return True
     
-    Best regards,
-    The Hackov8 Team
-    """
+    def stats(self) -> Dict[str, Any]:
+        uptime = time.monotonic() - self._started_at if self._started_at else 0
+        sent = self.metrics["sent"]
+        return {
+            **self.metrics,
+            "send_time_ms": round(self.metrics["send_time_ms"], 2),
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "pending_retries": len(self._retry_tasks),
+            "idle_connections": len(self.pool._idle),
+            "avg_send_ms": round(self.metrics["send_time_ms"] / sent, 2) if sent else 0,
+            "throughput_per_min": round(sent / uptime * 60, 2) if uptime else 0,
+            "running": self._queue is not None
+        }
     
-    # Create message
-    message = MIMEMultipart('alternative')
-    message['Subject'] = subject
-    message['From'] = f"{from_name} <{from_email}>"
-    message['To'] = to_email
+    async def _worker(self):
+        while True:
+            jobs = [await self._queue.get()]
+            # Drain whatever else is ready so the batch shares one connection
+            while len(jobs) < self.batch_size and not self._queue.empty():
+                jobs.append(self._queue.get_nowait())
+            try:
+                await self._send_batch(jobs)
+            except Exception as e:
+                print(f"Mailer worker error: {str(e)}")
+            finally:
+                for _ in jobs:
+                    self._queue.task_done()
+    
+    async def _send_batch(self, jobs: List[dict]):
+        try:
+            smtp = await self.pool.acquire()
+        except Exception as e:
+            print(f"Failed to connect to SMTP server: {str(e)}")
+            for job in jobs:
+                self._schedule_retry(job)
+            return
+        
+        broken = False
+        for index, job in enumerate(jobs):
+            started = time.perf_counter()
+            try:
+                await smtp.send_message(job["message"])
+            except aiosmtplib.SMTPServerDisconnected:
+                # Connection dropped (idle timeout etc.); retry the rest on a fresh one
+                broken = True
+                for pending in jobs[index:]:
+                    self._schedule_retry(pending)
+                break
+            except Exception as e:
+                if is_permanent_smtp_failure(e):
+                    self.metrics["failed"] += 1
+                    print(f"Email to {job['message']['To']} rejected: {str(e)}")
+                else:
+                    print(f"Failed to send email to {job['message']['To']}: {str(e)}")
+                    self._schedule_retry(job)
+                continue
+            self.metrics["sent"] += 1
+            self.metrics["send_time_ms"] += (time.perf_counter() - started) * 1000
+        
+        self.pool.release(smtp, broken=broken)
+    
+    def _schedule_retry(self, job: dict):
+        job["attempts"] += 1
+        if job["attempts"] > self.max_retries:
+            self.metrics["failed"] += 1
+            print(f"Giving up on email to {job['message']['To']} after {self.max_retries} retries")
+            return
+        
+        self.metrics["retried"] += 1
+        delay = min(self.retry_delay * 2 ** job["attempts"], 300) + random.uniform(0, self.retry_delay)
+        task = asyncio.create_task(self._requeue_later(job, delay))
+        self._retry_tasks.add(task)
+        task.add_done_callback(self._retry_tasks.discard)
     
-    # Attach both plain text and HTML versions
-    part1 = MIMEText(text_body, 'plain')
-    part2 = MIMEText(html_body, 'html')
-    message.attach(part1)
-    message.attach(part2)
+    async def _requeue_later(self, job: dict, delay: float):
+        await asyncio.sleep(delay)
+        if self._queue is not None:
+            await self._queue.put(job)
+
+
+mailer = Mailer()
+
+
+def queue_email(template_name: str, to_email: str, **variables) -> bool:
+    """Render a registered template for one recipient and queue it for delivery"""
+    if not mailer.configured:
+        return False
+    subject, text_body, html_body = EMAIL_TEMPLATES[template_name].render(**variables)
+    return mailer.enqueue(mailer.build_message(to_email, subject, text_body, html_body))
+
+
+async def send_verification_email(to_email: str, user_name: str, verification_token: str):
+    """Queue verification email for background delivery"""
+    if not mailer.configured:
+        print("SMTP credentials not configured, skipping email send")
+        return False
     
-    try:
-        # Send email using aiosmtplib
-        await aiosmtplib.send(
-            message,
-            hostname=smtp_host,
-            port=smtp_port,
-            username=smtp_user,
-            password=smtp_password,
-            start_tls=True,
-        )
-        print(f"Verification email sent to {to_email}")
+    frontend_url = os.environ.get('FRONTEND_URL', 'https://hackov8.xyz')
+    return queue_email(
+        "verification",
+        to_email,
+        user_name=user_name,
+        verification_url=f"{frontend_url}/verify-email?token={verification_token}"
+    )
+
+# ==================== GOOGLE ID TOKEN VERIFICATION ====================
+
+GOOGLE_CERTS_URL = 'https://www.googleapis.com/oauth2/v3/certs'
+GOOGLE_ISSUERS = ["accounts.google.com", "https://accounts.google.com"]
+
+
+class GoogleJWKSCache:
+    """Google's signing keys, cached for the Cache-Control max-age and shared
+    across workers through a local file so only one process has to fetch them"""
+    
+    def __init__(self, cache_path: str, refresh_margin: int = 300, min_forced_interval: int = 60):
+        self.cache_path = Path(cache_path)
+        self.refresh_margin = refresh_margin
+        self.min_forced_interval = min_forced_interval
+        self._keys: Dict[str, jwt.PyJWK] = {}
+        self._expires_at = 0.0
+        self._last_forced = 0.0
+        self._lock = asyncio.Lock()
+        self._background_refresh: Optional[asyncio.Task] = None
+    
+    async def get_key(self, kid: str) -> Optional[jwt.PyJWK]:
+        now = time.time()
+        if now >= self._expires_at:
+            await self.refresh()
+        elif now >= self._expires_at - self.refresh_margin and not self._background_refresh:
+            # Refresh ahead of expiry so logins never wait on Google
+            self._background_refresh = asyncio.create_task(self.refresh())
+            self._background_refresh.add_done_callback(self._background_refresh_done)
+        
+        key = self._keys.get(kid)
+        if key is None and now - self._last_forced >= self.min_forced_interval:
+            # Google may have rotated keys before our copy expired; rate limited
+            # so tokens with bogus key IDs can't make us hammer the endpoint
+            self._last_forced = now
+            await self.refresh(force=True)
+            key = self._keys.get(kid)
+        return key
+    
+    async def refresh(self, force: bool = False):
+        async with self._lock:
+            # Another coroutine may have refreshed while we waited for the lock
+            if not force and time.time() < self._expires_at - self.refresh_margin:
+                return
+            # ...or another worker may have refreshed the shared file
+            if not force and await asyncio.to_thread(self._load_file):
+                return
+            
+            response = await http_client.get(GOOGLE_CERTS_URL)
+            response.raise_for_status()
+            jwks = response.json()
+            expires_at = time.time() + self._max_age(response.headers.get("cache-control", ""))
+            self._install(jwks, expires_at)
+            await asyncio.to_thread(self._save_file, jwks, expires_at)
+    
+    def _background_refresh_done(self, task: asyncio.Task):
+        self._background_refresh = None
+        if not task.cancelled() and task.exception():
+            print(f"Google JWKS background refresh failed: {task.exception()}")
+    
+    @staticmethod
+    def _max_age(cache_control: str) -> int:
+        match = re.search(r'max-age=(\d+)', cache_control)
+        return int(match.group(1)) if match else 3600
+    
+    def _install(self, jwks: dict, expires_at: float):
+        keys = {}
+        for jwk_data in jwks.get("keys", []):
+            try:
+                keys[jwk_data["kid"]] = jwt.PyJWK(jwk_data)
+            except (KeyError, jwt.PyJWKError) as e:
+                print(f"Skipping unusable Google JWK: {str(e)}")
+        self._keys = keys
+        self._expires_at = expires_at
+    
+    def _load_file(self) -> bool:
+        try:
+            cached = json.loads(self.cache_path.read_text())
+        except (OSError, ValueError):
+            return False
+        if cached.get("expires_at", 0) - self.refresh_margin <= time.time():
+            return False
+        self._install(cached["jwks"], cached["expires_at"])
         return True
-    except Exception as e:
-        print(f"Failed to send email to {to_email}: {str(e)}")
-        return False
+    
+    def _save_file(self, jwks: dict, expires_at: float):
+        # Write-then-rename so other workers never read a partial file
+        tmp_path = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}.tmp")
+        try:
+            tmp_path.write_text(json.dumps({"jwks": jwks, "expires_at": expires_at}))
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"Failed to write Google JWKS cache file: {str(e)}")
+
+
+google_jwks = GoogleJWKSCache(os.environ.get('GOOGLE_JWKS_CACHE_PATH', '/tmp/hackov8_google_jwks.json'))
+
+
+async def verify_google_id_token(credential: str, client_id: str) -> Dict[str, Any]:
+    """Verify a Google Identity Services ID token against cached keys and return its claims"""
+    header = jwt.get_unverified_header(credential)
+    key = await google_jwks.get_key(header.get("kid"))
+    if key is None:
+        raise ValueError("Token signed with an unknown key")
+    
+    claims = jwt.decode(
+        credential,
+        key.key,
+        algorithms=["RS256"],
+        audience=client_id,
+        issuer=GOOGLE_ISSUERS,
+        leeway=30,
+        options={"require": ["exp", "iat", "aud", "iss"]}
+    )
+    if not claims.get("email") or not claims.get("email_verified"):
+        raise ValueError("Google account email is not verified")
+    return claims
 
-    linkedin_link: Optional[str] = None
-    profile_slug: Optional[str] = None
-    profile_photo: Optional[str] = None
 
 # ==================== AUTH HELPER ====================
 
@@ -511,24 +957,201 @@ async def get_verified_user(request: Request) -> User:
 
 # ==================== HELPER FUNCTIONS ====================
 
-def generate_slug(title: str, existing_slugs: List[str] = []) -> str:
-    """Generate a URL-friendly slug from title"""
-    # Convert to lowercase and replace spaces with hyphens
-    slug = title.lower().strip()
-    # Remove special characters, keep only alphanumeric and hyphens
-    slug = re.sub(r'[^a-z0-9\s-]', '', slug)
-    slug = re.sub(r'\s+', '-', slug)
-    slug = re.sub(r'-+', '-', slug)
-    slug = slug.strip('-')
-    
-    # Ensure uniqueness by appending number if needed
-    original_slug = slug
-    counter = 1
-    while slug in existing_slugs:
-        slug = f"{original_slug}-{counter}"
-        counter += 1
-    
-    return slug
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check the request's If-None-Match header against an ETag"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in candidates
+
+def etag_response(request: Request, body: bytes, media_type: str = "application/json",
+                  etag: Optional[str] = None, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Serve pre-serialized bytes with a strong ETag, answering 304 when the client is current"""
+    etag = etag or f'"{hashlib.sha1(body).hexdigest()}"'
+    response_headers = {"ETag": etag, "Cache-Control": "no-cache", **(headers or {})}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=response_headers)
+    return Response(content=body, media_type=media_type, headers=response_headers)
+
+def serialize_json(payload: Any) -> bytes:
+    return json.dumps(jsonable_encoder(payload), separators=(",", ":")).encode()
+
+def invalidate_hackathon_listings():
+    hackathon_listing_cache.clear()
+
+def invalidate_public_profile(slug: Optional[str]):
+    if slug:
+        public_profile_cache.pop(slug, None)
+
+def coerce_timestamp(value) -> Optional[datetime]:
+    """A stored timestamp as a naive UTC datetime; legacy ISO strings are parsed, anything unreadable is None"""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+# Timestamp fields the JSON export/import round trip (database_export/) leaves as ISO strings
+LEGACY_TIMESTAMP_FIELDS = {
+    "users": ["created_at", "updated_at", "last_login"],
+    "hackathons": [
+        "created_at", "updated_at", "approved_at", "featured_at", "registration_start",
+        "registration_end", "event_start", "event_end", "submission_deadline"
+    ],
+    "registrations": ["registered_at", "created_at", "updated_at"],
+}
+# Documents converted per collection by this process's startup migration
+converted_timestamps: Dict[str, int] = {}
+
+async def migrate_legacy_timestamps(collection_name: str, fields: List[str]) -> int:
+    """Store string timestamps as dates, which range queries, keyset cursors and rollups require"""
+    collection = db[collection_name]
+    operations = []
+    cursor = collection.find(
+        {"$or": [{field: {"$type": "string"}} for field in fields]},
+        {field: 1 for field in fields}
+    )
+    async for doc in cursor:
+        # Unreadable strings are left as they are rather than losing the value
+        parsed = {field: coerce_timestamp(doc[field]) for field in fields if isinstance(doc.get(field), str)}
+        dates = {field: value for field, value in parsed.items() if value is not None}
+        if dates:
+            operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": dates}))
+    for i in range(0, len(operations), 1000):
+        await collection.bulk_write(operations[i:i + 1000], ordered=False)
+    return len(operations)
+
+# Daily rollup field -> (collection, timestamp field) it counts
+DAILY_STAT_SOURCES = {
+    "user_signups": ("users", "created_at"),
+    "hackathon_creations": ("hackathons", "created_at"),
+    "registrations": ("registrations", "registered_at"),
+}
+
+async def record_daily_stat(field: str):
+    """Bump one counter on today's (UTC) daily_stats row"""
+    day = datetime.now(timezone.utc).date().isoformat()
+    await db.daily_stats.update_one({"_id": day}, {"$inc": {field: 1}}, upsert=True)
+
+async def backfill_registered_at() -> int:
+    """Give registrations written without registered_at (import_registrations.py, database_export/) their created_at"""
+    result = await db.registrations.update_many(
+        {"registered_at": {"$exists": False}, "created_at": {"$type": "date"}},
+        [{"$set": {"registered_at": "$created_at"}}]
+    )
+    return result.modified_count
+
+async def backfill_daily_stats(since: Optional[datetime] = None) -> Dict[str, int]:
+    """Rebuild daily_stats rows from the source collections, optionally only from `since` onwards"""
+    days_written = {}
+    for field, (collection_name, timestamp_field) in DAILY_STAT_SOURCES.items():
+        match = {timestamp_field: {"$type": "date"}}
+        if since:
+            match = {timestamp_field: {"$gte": since}}
+        pipeline = [
+            {"$match": match},
+            {"$group": {
+                "_id": {"$dateToString": {"format": "%Y-%m-%d", "date": f"${timestamp_field}"}},
+                "count": {"$sum": 1}
+            }}
+        ]
+        operations = [
+            UpdateOne({"_id": group["_id"]}, {"$set": {field: group["count"]}}, upsert=True)
+            async for group in db[collection_name].aggregate(pipeline)
+        ]
+        # Days whose count dropped to zero (deleted rows) must not keep a stale value
+        day_range = {"_id": {"$gte": since.date().isoformat()}} if since else {}
+        await db.daily_stats.update_many(day_range, {"$unset": {field: ""}})
+        for i in range(0, len(operations), 1000):
+            await db.daily_stats.bulk_write(operations[i:i + 1000], ordered=False)
+        days_written[field] = len(operations)
+    return days_written
+
+class HyperLogLog:
+    """Fixed-size distinct counter: 2^p one-byte registers, ~1.04/sqrt(2^p) relative error"""
+    
+    def __init__(self, p: int = 12, registers: Optional[List[int]] = None):
+        self.p = p
+        self.m = 1 << p
+        self.registers = registers or [0] * self.m
+    
+    @staticmethod
+    def position(p: int, value: str) -> tuple:
+        """Register index and rank (leading zeros + 1) for a value"""
+        h = int.from_bytes(hashlib.sha1(value.encode()).digest()[:8], "big")
+        index = h >> (64 - p)
+        remainder = h & ((1 << (64 - p)) - 1)
+        return index, (64 - p) - remainder.bit_length() + 1
+    
+    def add(self, value: str):
+        index, rank = self.position(self.p, value)
+        self.registers[index] = max(self.registers[index], rank)
+    
+    def merge(self, other: "HyperLogLog"):
+        self.registers = [max(a, b) for a, b in zip(self.registers, other.registers)]
+    
+    def count(self) -> int:
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        estimate = alpha * self.m * self.m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * self.m and zeros:
+            # Small-range correction (linear counting)
+            estimate = self.m * math.log(self.m / zeros)
+        return round(estimate)
+
+ACTIVITY_SKETCH_PRECISION = 12
+ACTIVITY_SKETCH_RETENTION_DAYS = 400
+
+async def record_user_activity(user_id: str):
+    """Add a login to today's active-user sketch; $max keeps concurrent updates safe"""
+    now = datetime.now(timezone.utc)
+    index, rank = HyperLogLog.position(ACTIVITY_SKETCH_PRECISION, user_id)
+    await db.activity_sketches.update_one(
+        {"_id": now.date().isoformat()},
+        {"$max": {f"r.{index}": rank}, "$setOnInsert": {"day": now.replace(hour=0, minute=0, second=0, microsecond=0)}},
+        upsert=True
+    )
+
+async def count_active_users(days: int) -> int:
+    """Approximate distinct users active in the last `days` UTC days (including today)"""
+    since = (datetime.now(timezone.utc) - timedelta(days=days - 1)).date().isoformat()
+    union = HyperLogLog(ACTIVITY_SKETCH_PRECISION)
+    async for sketch in db.activity_sketches.find({"_id": {"$gte": since}}, {"r": 1}):
+        for index, rank in sketch.get("r", {}).items():
+            index = int(index)
+            union.registers[index] = max(union.registers[index], rank)
+    return union.count()
+
+async def seed_activity_sketches(days: int = 30):
+    """Build per-day sketches from users' last_login so retention has history on first deploy"""
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+    sketches: Dict[str, HyperLogLog] = {}
+    cursor = db.users.find({"last_login": {"$gte": since}}, {"last_login": 1})
+    async for u in cursor:
+        day = u["last_login"].date().isoformat()
+        sketches.setdefault(day, HyperLogLog(ACTIVITY_SKETCH_PRECISION)).add(u["_id"])
+    for day, sketch in sketches.items():
+        registers = {f"r.{i}": rank for i, rank in enumerate(sketch.registers) if rank}
+        await db.activity_sketches.update_one(
+            {"_id": day},
+            {"$max": registers, "$setOnInsert": {"day": datetime.fromisoformat(day).replace(tzinfo=timezone.utc)}},
+            upsert=True
+        )
+    return len(sketches)
+
+async def get_daily_stats(since: datetime) -> List[dict]:
+    """Read rollup rows from `since`'s day onwards, oldest first"""
+    return await db.daily_stats.find(
+        {"_id": {"$gte": since.date().isoformat()}}
+    ).sort("_id", 1).to_list(None)
 
 # ==================== AUTH ROUTES ====================
 
@@ -539,16 +1162,15 @@ async def process_session(request: Request):
         raise HTTPException(status_code=400, detail="Missing session ID")
     
     # Call Emergent Auth API
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(
-                f"{os.environ.get('EMERGENT_AUTH_BACKEND_URL', 'https://demobackend.emergentagent.com')}/auth/v1/env/oauth/session-data",
-                headers={"X-Session-ID": session_id}
-            )
-            response.raise_for_status()
-            data = response.json()
-        except Exception as e:
-            raise HTTPException(status_code=400, detail=f"Failed to validate session: {str(e)}")
+    try:
+        response = await http_client.get(
+            f"{os.environ.get('EMERGENT_AUTH_BACKEND_URL', 'https://demobackend.emergentagent.com')}/auth/v1/env/oauth/session-data",
+            headers={"X-Session-ID": session_id}
+        )
+        response.raise_for_status()
+        data = response.json()
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Failed to validate session: {str(e)}")
     
     # Check if user exists
     existing_user = await db.users.find_one({"email": data["email"]})
@@ -571,6 +1193,7 @@ async def process_session(request: Request):
         )
         user_dict = user.dict(by_alias=True)
         await db.users.insert_one(user_dict)
+        await record_daily_stat("user_signups")
         user_id = user_dict["_id"]
     
     # Create session
@@ -580,6 +1203,7 @@ async def process_session(request: Request):
         expires_at=datetime.now(timezone.utc) + timedelta(days=7)
     )
     await db.user_sessions.insert_one(session.dict())
+    await record_user_activity(user_id)
     
     # Get user data to include all fields
     user_doc = await db.users.find_one({"_id": user_id})
@@ -603,32 +1227,8 @@ async def google_callback(request: GoogleCallbackRequest):
         raise HTTPException(status_code=500, detail="Google OAuth not configured")
     
     try:
-        # Verify and decode the JWT token
-        async with httpx.AsyncClient() as client:
-            # Get Google's public keys
-            keys_response = await client.get('https://www.googleapis.com/oauth2/v3/certs')
-            keys_response.raise_for_status()
-            keys = keys_response.json()
-            
-            # For simplicity, we'll decode without verification (in production, verify the signature)
-            # Decode the JWT payload
-            import json
-            import base64
-            
-            # Split JWT and decode payload
-            header, payload, signature = request.credential.split('.')
-            
-            # Add padding if needed
-            payload += '=' * (4 - len(payload) % 4)
-            
-            # Decode payload
-            decoded_payload = base64.urlsafe_b64decode(payload)
-            user_info = json.loads(decoded_payload)
-            
-            # Verify the audience (client_id)
-            if user_info.get('aud') != client_id:
-                raise HTTPException(status_code=400, detail="Invalid token audience")
-                
+        # Verify the JWT signature, audience, issuer and expiry
+        user_info = await verify_google_id_token(request.credential, client_id)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Google token verification failed: {str(e)}")
     
@@ -656,6 +1256,7 @@ async def google_callback(request: GoogleCallbackRequest):
         )
         user_dict = user.dict(by_alias=True)
         await db.users.insert_one(user_dict)
+        await record_daily_stat("user_signups")
         user_id = user_dict["_id"]
         
         # Create company if user is organizer
@@ -683,6 +1284,7 @@ async def google_callback(request: GoogleCallbackRequest):
         expires_at=datetime.now(timezone.utc) + timedelta(days=7)
     )
     await db.user_sessions.insert_one(session.dict())
+    await record_user_activity(user_id)
     
     # Get user data
     user_doc = await db.users.find_one({"_id": user_id})
@@ -740,55 +1342,54 @@ async def github_callback(code: str = None, state: str = None, error: str = None
     
     # Exchange code for access token
     try:
-        async with httpx.AsyncClient() as client:
-            token_response = await client.post(
-                "https://github.com/login/oauth/access_token",
-                data={
-                    "client_id": github_client_id,
-                    "client_secret": github_client_secret,
-                    "code": code,
-                },
-                headers={"Accept": "application/json"},
-                timeout=10.0
-            )
-            
-            if token_response.status_code != 200:
-                redirect_url = f"{frontend_url}?github_auth=error&error=token_exchange_failed"
-                return RedirectResponse(url=redirect_url)
-            
-            token_data = token_response.json()
-            
-            # Check for error in response
-            if "error" in token_data:
-                redirect_url = f"{frontend_url}?github_auth=error&error={token_data.get('error', 'unknown')}"
-                return RedirectResponse(url=redirect_url)
-            
-            access_token = token_data.get("access_token")
-            
-            if not access_token:
-                redirect_url = f"{frontend_url}?github_auth=error&error=no_access_token"
-                return RedirectResponse(url=redirect_url)
-            
-            # Get user information from GitHub
-            user_response = await client.get(
-                "https://api.github.com/user",
-                headers={
-                    "Authorization": f"Bearer {access_token}",
-                    "Accept": "application/json"
-                },
-                timeout=10.0
-            )
-            
-            if user_response.status_code != 200:
-                redirect_url = f"{frontend_url}?github_auth=error&error=user_info_failed"
-                return RedirectResponse(url=redirect_url)
+        token_response = await http_client.post(
+            "https://github.com/login/oauth/access_token",
+            data={
+                "client_id": github_client_id,
+                "client_secret": github_client_secret,
+                "code": code,
+            },
+            headers={"Accept": "application/json"},
+            timeout=10.0
+        )
+        
+        if token_response.status_code != 200:
+            redirect_url = f"{frontend_url}?github_auth=error&error=token_exchange_failed"
+            return RedirectResponse(url=redirect_url)
+        
+        token_data = token_response.json()
+        
+        # Check for error in response
+        if "error" in token_data:
+            redirect_url = f"{frontend_url}?github_auth=error&error={token_data.get('error', 'unknown')}"
+            return RedirectResponse(url=redirect_url)
+        
+        access_token = token_data.get("access_token")
+        
+        if not access_token:
+            redirect_url = f"{frontend_url}?github_auth=error&error=no_access_token"
+            return RedirectResponse(url=redirect_url)
+        
+        # Get user information from GitHub
+        user_response = await http_client.get(
+            "https://api.github.com/user",
+            headers={
+                "Authorization": f"Bearer {access_token}",
+                "Accept": "application/json"
+            },
+            timeout=10.0
+        )
+        
+        if user_response.status_code != 200:
+            redirect_url = f"{frontend_url}?github_auth=error&error=user_info_failed"
+            return RedirectResponse(url=redirect_url)
         
         github_user = user_response.json()
         
         # Get user email if not in profile
         email = github_user.get("email")
         if not email:
-            email_response = await client.get(
+            email_response = await http_client.get(
                 "https://api.github.com/user/emails",
                 headers={
                     "Authorization": f"Bearer {access_token}",
@@ -842,6 +1443,7 @@ async def github_callback(code: str = None, state: str = None, error: str = None
             user_dict["github_login"] = github_user.get("login")
             
             await db.users.insert_one(user_dict)
+            await record_daily_stat("user_signups")
             user_id = user_dict["_id"]
             user_doc = await db.users.find_one({"_id": user_id})
         
@@ -853,6 +1455,7 @@ async def github_callback(code: str = None, state: str = None, error: str = None
             expires_at=datetime.now(timezone.utc) + timedelta(days=7)
         )
         await db.user_sessions.insert_one(session.dict())
+        await record_user_activity(user_id)
         
         # Redirect to frontend with token
         redirect_url = f"{frontend_url}?github_auth=success&token={session_token}"
@@ -883,9 +1486,11 @@ async def get_my_referral_stats(request: Request):
     # Count successful referrals (registrations made by referred users)
     referrals = await db.registrations.count_documents({"referred_by": user.id})
     
-    # Get referral details with hackathon info
+    # Get referral details with hackathon info; only the page that is returned is joined
     pipeline = [
         {"$match": {"referred_by": user.id}},
+        {"$sort": {"registered_at": -1}},
+        {"$limit": 50},
         {"$lookup": {
             "from": "hackathons",
             "localField": "hackathon_id", 
@@ -906,9 +1511,7 @@ async def get_my_referral_stats(request: Request):
             "hackathon_name": {"$arrayElemAt": ["$hackathon.title", 0]},
             "user_name": {"$arrayElemAt": ["$user.name", 0]},
             "user_email": {"$arrayElemAt": ["$user.email", 0]}
-        }},
-        {"$sort": {"registered_at": -1}},
-        {"$limit": 50}
+        }}
     ]
     
     referral_details = await db.registrations.aggregate(pipeline).to_list(length=None)
@@ -945,6 +1548,12 @@ async def get_referral_link(hackathon_id: str, request: Request):
         }
     }
 
+# Referral analytics read per-(hackathon, referrer) counters in referral_stats,
+# kept with $inc at registration and rebuilt by reconcile_referral_stats()
+REFERRAL_TOP_REFERRERS = 10
+REFERRAL_RECENT_LIMIT = 20
+REFERRAL_RECENT_PER_REFERRER = 3
+
 @api_router.get("/hackathons/{hackathon_id}/referral-analytics")
 async def get_hackathon_referral_analytics(hackathon_id: str, request: Request):
     """Get referral analytics for organizers"""
@@ -962,9 +1571,35 @@ async def get_hackathon_referral_analytics(hackathon_id: str, request: Request):
     if not (is_organizer or is_co_organizer or is_admin):
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    # Get referral statistics
-    pipeline = [
-        {"$match": {"hackathon_id": hackathon_id, "referred_by": {"$ne": None}}},
+    # Totals and the top referrers come from the per-referrer counters, so no
+    # registration is read or joined except the handful that are returned
+    totals_cursor = db.referral_stats.aggregate([
+        {"$match": {"hackathon_id": hackathon_id}},
+        {"$group": {"_id": None, "referrers": {"$sum": 1}, "referrals": {"$sum": "$count"}}}
+    ])
+    top_cursor = db.referral_stats.aggregate([
+        {"$match": {"hackathon_id": hackathon_id}},
+        {"$sort": {"count": -1, "last_referred_at": -1}},
+        {"$limit": REFERRAL_TOP_REFERRERS},
+        {"$lookup": {
+            "from": "users",
+            "localField": "referrer_id",
+            "foreignField": "_id",
+            "as": "referrer"
+        }},
+        {"$project": {
+            "_id": 0,
+            "referrer_id": 1,
+            "count": 1,
+            "name": {"$arrayElemAt": ["$referrer.name", 0]},
+            "email": {"$arrayElemAt": ["$referrer.email", 0]},
+            "referral_code": {"$arrayElemAt": ["$referrer.referral_code", 0]}
+        }}
+    ])
+    recent_cursor = db.registrations.aggregate([
+        {"$match": {"hackathon_id": hackathon_id, "referred_by": {"$type": "string"}}},
+        {"$sort": {"registered_at": -1}},
+        {"$limit": REFERRAL_RECENT_LIMIT},
         {"$lookup": {
             "from": "users",
             "localField": "referred_by",
@@ -972,7 +1607,7 @@ async def get_hackathon_referral_analytics(hackathon_id: str, request: Request):
             "as": "referrer"
         }},
         {"$lookup": {
-            "from": "users", 
+            "from": "users",
             "localField": "user_id",
             "foreignField": "_id",
             "as": "referred_user"
@@ -980,48 +1615,105 @@ async def get_hackathon_referral_analytics(hackathon_id: str, request: Request):
         {"$project": {
             "registered_at": 1,
             "utm_source": 1,
-            "utm_campaign": 1, 
+            "utm_campaign": 1,
             "utm_medium": 1,
             "referrer_name": {"$arrayElemAt": ["$referrer.name", 0]},
             "referrer_email": {"$arrayElemAt": ["$referrer.email", 0]},
             "referrer_code": {"$arrayElemAt": ["$referrer.referral_code", 0]},
             "referred_user_name": {"$arrayElemAt": ["$referred_user.name", 0]},
             "referred_user_email": {"$arrayElemAt": ["$referred_user.email", 0]}
-        }},
-        {"$sort": {"registered_at": -1}}
-    ]
-    
-    referrals = await db.registrations.aggregate(pipeline).to_list(length=None)
-    
-    # Count by referrer
-    referrer_stats = {}
-    for referral in referrals:
-        referrer_email = referral.get("referrer_email")
-        if referrer_email:
-            if referrer_email not in referrer_stats:
-                referrer_stats[referrer_email] = {
-                    "name": referral.get("referrer_name"),
-                    "email": referrer_email,
-                    "referral_code": referral.get("referrer_code"),
-                    "count": 0,
-                    "recent_referrals": []
-                }
-            referrer_stats[referrer_email]["count"] += 1
-            referrer_stats[referrer_email]["recent_referrals"].append({
-                "user_name": referral.get("referred_user_name"),
-                "registered_at": referral.get("registered_at")
-            })
-    
-    # Sort by count
-    top_referrers = sorted(referrer_stats.values(), key=lambda x: x["count"], reverse=True)[:10]
+        }}
+    ])
+    totals, top_referrers, recent_referrals = await asyncio.gather(
+        totals_cursor.to_list(length=1),
+        top_cursor.to_list(length=None),
+        recent_cursor.to_list(length=None)
+    )
+    # Referrers whose account was deleted are counted but not listed
+    top_referrers = [r for r in top_referrers if r.get("email")]
+    
+    # A few latest referrals per listed referrer (one indexed query each), then their names in one query
+    per_referrer = await asyncio.gather(*[
+        db.registrations.find(
+            {"hackathon_id": hackathon_id, "referred_by": r["referrer_id"]},
+            {"user_id": 1, "registered_at": 1, "_id": 0}
+        ).sort("registered_at", -1).limit(REFERRAL_RECENT_PER_REFERRER).to_list(length=None)
+        for r in top_referrers
+    ])
+    user_ids = list({reg["user_id"] for regs in per_referrer for reg in regs})
+    names = {u["_id"]: u.get("name") async for u in db.users.find({"_id": {"$in": user_ids}}, {"name": 1})}
+    for referrer, regs in zip(top_referrers, per_referrer):
+        referrer["recent_referrals"] = [
+            {"user_name": names.get(reg["user_id"]), "registered_at": reg.get("registered_at")}
+            for reg in regs
+        ]
+        del referrer["referrer_id"]
     
+    totals = totals[0] if totals else {"referrers": 0, "referrals": 0}
     return {
-        "total_referrals": len(referrals),
-        "total_referrers": len(referrer_stats),
+        "total_referrals": totals["referrals"],
+        "total_referrers": totals["referrers"],
         "top_referrers": top_referrers,
-        "recent_referrals": referrals[:20]
+        "recent_referrals": recent_referrals
     }
 
+async def record_referral(hackathon_id: str, referrer_id: str, referred_at: datetime):
+    """Count a registration towards its referrer's per-hackathon total"""
+    await db.referral_stats.update_one(
+        {"hackathon_id": hackathon_id, "referrer_id": referrer_id},
+        {"$inc": {"count": 1}, "$max": {"last_referred_at": referred_at}},
+        upsert=True
+    )
+
+async def _decrement_referral_stats(owner_query: Dict[str, Any]):
+    """Subtract referred registrations from the referral counters before they are deleted"""
+    per_referrer = db.registrations.aggregate([
+        {"$match": {**owner_query, "referred_by": {"$type": "string"}}},
+        {"$group": {"_id": {"hackathon_id": "$hackathon_id", "referrer_id": "$referred_by"}, "count": {"$sum": 1}}}
+    ])
+    operations = [
+        UpdateOne(group["_id"], {"$inc": {"count": -group["count"]}})
+        async for group in per_referrer
+    ]
+    if operations:
+        await db.referral_stats.bulk_write(operations, ordered=False)
+        await db.referral_stats.delete_many({"count": {"$lte": 0}})
+
+async def reconcile_referral_stats() -> Dict[str, int]:
+    """Rebuild drifted per-referrer counters from the registrations"""
+    actual = {}
+    async for group in db.registrations.aggregate([
+        {"$match": {"referred_by": {"$type": "string"}}},
+        {"$group": {
+            "_id": {"hackathon_id": "$hackathon_id", "referrer_id": "$referred_by"},
+            "count": {"$sum": 1},
+            "last_referred_at": {"$max": "$registered_at"}
+        }}
+    ]):
+        actual[(group["_id"]["hackathon_id"], group["_id"]["referrer_id"])] = group
+    
+    operations = []
+    async for stat in db.referral_stats.find({}, {"hackathon_id": 1, "referrer_id": 1, "count": 1, "last_referred_at": 1}):
+        group = actual.pop((stat["hackathon_id"], stat["referrer_id"]), None)
+        if group is None:
+            operations.append(DeleteOne({"_id": stat["_id"]}))
+        elif (stat.get("count"), stat.get("last_referred_at")) != (group["count"], group["last_referred_at"]):
+            operations.append(UpdateOne(
+                {"_id": stat["_id"]},
+                {"$set": {"count": group["count"], "last_referred_at": group["last_referred_at"]}}
+            ))
+    for group in actual.values():
+        operations.append(UpdateOne(
+            group["_id"],
+            {"$set": {"count": group["count"], "last_referred_at": group["last_referred_at"]}},
+            upsert=True
+        ))
+    
+    for i in range(0, len(operations), 1000):
+        await db.referral_stats.bulk_write(operations[i:i + 1000], ordered=False)
+    
+    return {"corrected": len(operations)}
+
 
 # ==================== CERTIFICATE ROUTES ====================
 
@@ -1051,15 +1743,7 @@ async def upload_certificate_template(
         raise HTTPException(status_code=400, detail="Only PNG and JPG images are allowed")
     
     # Save template file
-    template_dir = Path("/app/uploads/certificate_templates")
-    template_dir.mkdir(parents=True, exist_ok=True)
-    
-    file_extension = file.filename.split(".")[-1]
-    template_filename = f"{hackathon_id}_template.{file_extension}"
-    template_path = template_dir / template_filename
-    
-    with open(template_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    template_url = blob_store.url_for((await store_upload(file))["path"])
     
     # Check if template already exists
     existing_template = await db.certificate_templates.find_one({"hackathon_id": hackathon_id})
@@ -1069,25 +1753,27 @@ async def upload_certificate_template(
         await db.certificate_templates.update_one(
             {"hackathon_id": hackathon_id},
             {"$set": {
-                "template_url": f"/api/uploads/certificate_templates/{template_filename}",
+                "template_url": template_url,
                 "updated_at": datetime.now(timezone.utc)
             }}
         )
+        await blob_store.swap(existing_template.get("template_url"), template_url)
         template_id = existing_template["_id"]
     else:
         # Create new template
         template = CertificateTemplate(
             hackathon_id=hackathon_id,
-            template_url=f"/api/uploads/certificate_templates/{template_filename}",
+            template_url=template_url,
             text_positions={}
         )
         result = await db.certificate_templates.insert_one(template.dict(by_alias=True))
+        await blob_store.retain(template_url)
         template_id = str(result.inserted_id)
     
     return {
         "message": "Template uploaded successfully",
         "template_id": template_id,
-        "template_url": f"/api/uploads/certificate_templates/{template_filename}"
+        "template_url": template_url
     }
 
 @api_router.put("/hackathons/{hackathon_id}/certificate-template/positions")
@@ -1139,6 +1825,7 @@ async def get_certificate_template(hackathon_id: str, request: Request = None):
 async def bulk_generate_certificates(
     hackathon_id: str,
     file: UploadFile = File(...),
+    send_emails: bool = False,
     request: Request = None
 ):
     """Bulk generate certificates from CSV file"""
@@ -1170,7 +1857,7 @@ async def bulk_generate_certificates(
         raise HTTPException(status_code=400, detail="Only CSV files are allowed")
     
     # Read CSV content
-    content = await file.read()
+    content = await read_upload(file, MAX_CSV_UPLOAD_BYTES)
     csv_content = content.decode("utf-8")
     
     # Parse CSV
@@ -1204,20 +1891,15 @@ async def bulk_generate_certificates(
     certificates_generated = 0
     errors = []
     
-    # Load template image
-    # Get template path from URL
-    template_url = template['template_url']
-    # Remove /api prefix if present since static files are mounted at /api/uploads -> /app/uploads
-    if template_url.startswith('/api/uploads/'):
-        template_path = Path(f"/app/uploads/{template_url[13:]}")  # Remove '/api/uploads/' prefix
-    else:
-        template_path = Path(f"/app{template_url}")
-    
-    if not template_path.exists():
+    # Load template image from storage
+    template_key = storage.key_for_url(template['template_url'])
+    try:
+        if not template_key:
+            raise FileNotFoundError(template['template_url'])
+        base_image = Image.open(BytesIO(await storage.read_bytes(template_key)))
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Template image not found")
     
-    base_image = Image.open(template_path)
-    
     # Get text positions
     positions = template.get("text_positions", {})
     
@@ -1231,9 +1913,6 @@ async def bulk_generate_certificates(
         font_role = ImageFont.load_default()
         font_date = ImageFont.load_default()
     
-    # Create certificate directory
-    cert_dir = Path("/app/uploads/certificates")
-    cert_dir.mkdir(parents=True, exist_ok=True)
     
     # Batch processing - collect certificates to insert
     certificates_to_insert = []
@@ -1323,8 +2002,9 @@ async def bulk_generate_certificates(
             
             # Save certificate with fast compression
             cert_filename = f"{hackathon_id}_{cert_id}.png"
-            cert_path = cert_dir / cert_filename
-            cert_image.save(cert_path, optimize=False, compress_level=1)  # Fast compression
+            cert_png = BytesIO()
+            cert_image.save(cert_png, "PNG", optimize=False, compress_level=1)  # Fast compression
+            await storage.put_bytes(f"certificates/{cert_filename}", cert_png.getvalue(), "image/png")
             
             # Memory management: explicitly close and delete image to free memory
             cert_image.close()
@@ -1345,6 +2025,18 @@ async def bulk_generate_certificates(
             certificates_to_insert.append(certificate)
             certificates_generated += 1
             
+            if send_emails:
+                frontend_url = os.environ.get('FRONTEND_URL', 'https://hackov8.xyz')
+                queue_email(
+                    "certificate_ready",
+                    email,
+                    user_name=name,
+                    role=role.capitalize(),
+                    event_name=hackathon.get("title", ""),
+                    certificate_url=f"{frontend_url}{certificate['certificate_url']}",
+                    verify_url=f"{frontend_url}/verify-certificate/{cert_id}"
+                )
+            
             # Force garbage collection every 10 certificates to prevent memory buildup
             if certificates_generated % 10 == 0:
                 gc.collect()
@@ -1458,18 +2150,8 @@ async def generate_standalone_certificates(
     except:
         raise HTTPException(status_code=400, detail="Invalid positions format")
     
-    # Save template temporarily
-    template_dir = Path("/app/uploads/certificate_templates")
-    template_dir.mkdir(parents=True, exist_ok=True)
-    
-    template_filename = f"standalone_{user.id}_{uuid.uuid4()}.png"
-    template_path = template_dir / template_filename
-    
-    with open(template_path, "wb") as f:
-        f.write(await template.read())
-    
     # Read CSV content
-    csv_content = await csv.read()
+    csv_content = await read_upload(csv, MAX_CSV_UPLOAD_BYTES)
     csv_text = csv_content.decode("utf-8")
     
     # Parse CSV
@@ -1505,11 +2187,14 @@ async def generate_standalone_certificates(
     errors = []
     generated_certs = []
     
-    # Load template image
-    if not template_path.exists():
-        raise HTTPException(status_code=404, detail="Template image not found")
-    
-    base_image = Image.open(template_path)
+    # Spool the template to disk and decode it once; the temp file is not needed afterwards
+    template_path, _, _ = await spool_upload(template, MAX_IMAGE_UPLOAD_BYTES)
+    try:
+        base_image = await asyncio.to_thread(lambda: Image.open(template_path).copy())
+    except Exception:
+        raise HTTPException(status_code=400, detail="Template image could not be read")
+    finally:
+        await asyncio.to_thread(_discard, template_path)
     
     # Pre-load fonts once
     try:
@@ -1523,9 +2208,6 @@ async def generate_standalone_certificates(
         font_org = ImageFont.load_default()
         font_date = ImageFont.load_default()
     
-    # Create certificate directory
-    cert_dir = Path("/app/uploads/certificates")
-    cert_dir.mkdir(parents=True, exist_ok=True)
     
     # Batch processing
     certificates_to_insert = []
@@ -1605,8 +2287,9 @@ async def generate_standalone_certificates(
             
             # Save certificate with fast compression
             cert_filename = f"standalone_{user.id}_{cert_id}.png"
-            cert_path = cert_dir / cert_filename
-            cert_image.save(cert_path, optimize=False, compress_level=1)  # Fast compression
+            cert_png = BytesIO()
+            cert_image.save(cert_png, "PNG", optimize=False, compress_level=1)  # Fast compression
+            await storage.put_bytes(f"certificates/{cert_filename}", cert_png.getvalue(), "image/png")
             
             # Memory management: explicitly close and delete image to free memory
             cert_image.close()
@@ -1747,12 +2430,13 @@ async def signup(signup_data: SignupRequest):
     )
     user_dict = user.dict(by_alias=True)
     await db.users.insert_one(user_dict)
+    await record_daily_stat("user_signups")
     user_id = user_dict["_id"]
     
-    # Send verification email
+    # Queue verification email (delivered in the background)
     try:
-        await send_verification_email(signup_data.email, signup_data.name, verification_token)
-        print(f"✅ Verification email sent to {signup_data.email}")
+        if await send_verification_email(signup_data.email, signup_data.name, verification_token):
+            print(f"✅ Verification email queued for {signup_data.email}")
     except Exception as e:
         print(f"⚠️ Failed to send verification email: {str(e)}")
         # Continue with signup even if email fails
@@ -1823,6 +2507,7 @@ async def login(login_data: LoginRequest):
         expires_at=datetime.now(timezone.utc) + timedelta(days=7)
     )
     await db.user_sessions.insert_one(session.dict())
+    await record_user_activity(user_doc["_id"])
     
     return SessionResponse(
         id=user_doc["_id"],
@@ -1968,10 +2653,10 @@ async def resend_verification(request: Request):
         {"$set": {"verification_token": verification_token}}
     )
     
-    # Send verification email
+    # Queue verification email (delivered in the background)
     try:
-        await send_verification_email(user_doc['email'], user_doc['name'], verification_token)
-        print(f"✅ Verification email resent to {user_doc['email']}")
+        if await send_verification_email(user_doc['email'], user_doc['name'], verification_token):
+            print(f"✅ Verification email queued for {user_doc['email']}")
         return {"message": "Verification email sent successfully"}
     except Exception as e:
         print(f"⚠️ Failed to send verification email: {str(e)}")
@@ -2012,11 +2697,27 @@ async def update_profile(update: UserUpdate, request: Request):
     user = await get_current_user(request)
     
     update_data = {k: v for k, v in update.dict().items() if v is not None}
+    changes: Dict[str, Any] = {}
+    if "profile_slug" in update_data:
+        requested_slug = update_data.pop("profile_slug").strip()
+        if requested_slug:
+            profile_slug = slugify(requested_slug, fallback="")
+            if not profile_slug:
+                raise HTTPException(status_code=400, detail="Profile URL must contain letters or numbers")
+            update_data["profile_slug"] = profile_slug
+        else:
+            # An empty profile URL clears it instead of claiming "" under the unique index
+            changes["$unset"] = {"profile_slug": ""}
     if update_data:
-        await db.users.update_one(
-            {"_id": user.id},
-            {"$set": update_data}
-        )
+        changes["$set"] = update_data
+    if changes:
+        try:
+            await db.users.update_one({"_id": user.id}, changes)
+        except DuplicateKeyError:
+            raise HTTPException(status_code=400, detail="This profile URL is already taken")
+        invalidate_public_profile(user.profile_slug)
+        if "profile_slug" in update_data or "$unset" in changes:
+            await mark_sitemap_stale()
     
     return {"message": "Profile updated successfully"}
 
@@ -2030,31 +2731,23 @@ async def upload_profile_photo(request: Request, file: UploadFile = File(...)):
     if not file.content_type or not file.content_type.startswith('image/'):
         raise HTTPException(status_code=400, detail="File must be an image")
     
-    # Create uploads directory if it doesn't exist
-    uploads_dir = Path("uploads/profile_photos")
-    uploads_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Generate unique filename
-    file_extension = Path(file.filename).suffix
-    filename = f"{user.id}{file_extension}"
-    file_path = uploads_dir / filename
-    
     # Save file
     try:
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-    except Exception as e:
+        blob = await store_upload(file, variants="avatar")
+    except OSError as e:
         raise HTTPException(status_code=500, detail=f"Failed to save file: {str(e)}")
+    variants = blob["variants"]["avatar"]
+    photo_url = blob_store.url_for(blob["path"])
     
     # Update user profile with photo URL
-    photo_url = f"/api/uploads/profile_photos/{filename}"
     await db.users.update_one(
         {"_id": user.id},
-        {"$set": {"profile_photo": photo_url}}
+        {"$set": {"profile_photo": photo_url, "profile_photo_variants": variants}}
     )
+    await blob_store.swap(user.profile_photo, photo_url)
+    invalidate_public_profile(user.profile_slug)
     
-    return {"photo_url": photo_url, "message": "Profile photo uploaded successfully"}
+    return {"photo_url": photo_url, "variants": variants, "message": "Profile photo uploaded successfully"}
 
 @api_router.post("/users/generate-slug")
 async def generate_profile_slug(request: Request):
@@ -2065,22 +2758,14 @@ async def generate_profile_slug(request: Request):
     if user.profile_slug:
         return {"slug": user.profile_slug, "message": "Using existing slug"}
     
-    # Generate slug from name
-    base_slug = user.name.lower().replace(' ', '-')
-    base_slug = re.sub(r'[^a-z0-9-]', '', base_slug)
-    
-    # Check if slug exists and make it unique
-    slug = base_slug
-    counter = 1
-    while await db.users.find_one({"profile_slug": slug}):
-        slug = f"{base_slug}-{counter}"
-        counter += 1
-    
-    # Update user with slug
-    await db.users.update_one(
-        {"_id": user.id},
-        {"$set": {"profile_slug": slug}}
+    # Claim the next free slug based on the user's name
+    slug = await allocate_unique_slug(
+        db.users,
+        "profile_slug",
+        slugify(user.name, fallback="user"),
+        lambda slug: db.users.update_one({"_id": user.id}, {"$set": {"profile_slug": slug}})
     )
+    await mark_sitemap_stale()
     
     return {"slug": slug, "message": "Profile slug generated successfully"}
 
@@ -2095,146 +2780,96 @@ async def check_user_slug(request: Request):
     }
 
 
+def public_profile_pipeline(slug: str) -> List[dict]:
+    """User, registrations and hackathon summaries in one round trip, projected to public fields"""
+    return [
+        {"$match": {"profile_slug": slug}},
+        {"$limit": 1},
+        {"$project": {
+            "name": 1, "bio": 1, "profile_photo": 1, "profile_photo_variants": 1,
+            "github_link": 1, "linkedin_link": 1, "role": 1
+        }},
+        # Concise lookups: the equality join uses the registrations.user_id / hackathons._id
+        # indexes, and the sub-pipelines keep only card fields in the joined arrays
+        {"$lookup": {
+            "from": "registrations",
+            "localField": "_id",
+            "foreignField": "user_id",
+            "pipeline": [
+                {"$project": {"_id": 0, "hackathon_id": 1}},
+                {"$lookup": {
+                    "from": "hackathons",
+                    "localField": "hackathon_id",
+                    "foreignField": "_id",
+                    "pipeline": [
+                        # Only include hackathons that have a title
+                        {"$match": {"title": {"$type": "string", "$ne": ""}}},
+                        {"$project": {
+                            "id": "$_id", "_id": 0,
+                            "name": "$title", "slug": 1,
+                            "start_date": "$event_start", "end_date": "$event_end",
+                            "location": 1, "status": 1
+                        }}
+                    ],
+                    "as": "hackathon"
+                }},
+                {"$unwind": "$hackathon"},
+                {"$replaceWith": "$hackathon"}
+            ],
+            "as": "participated_hackathons"
+        }},
+        {"$project": {"_id": 0}}
+    ]
+
 @api_router.get("/users/public/{slug}")
-async def get_public_profile(slug: str):
+async def get_public_profile(slug: str, request: Request):
     """Get public profile by slug"""
-    user_doc = await db.users.find_one({"profile_slug": slug})
-    if not user_doc:
-        raise HTTPException(status_code=404, detail="Profile not found")
-    
-    user_id = user_doc["_id"]
-    
-    # Get user's participated hackathons
-    registrations = await db.registrations.find({"user_id": user_id}).to_list(length=None)
-    hackathon_ids = [reg["hackathon_id"] for reg in registrations]
-    
-    participated_hackathons = []
-    if hackathon_ids:
-        hackathons = await db.hackathons.find({"_id": {"$in": hackathon_ids}}).to_list(length=None)
-        for hackathon in hackathons:
-            # Only include hackathons that have a name
-            if hackathon.get("name"):
-                participated_hackathons.append({
-                    "id": hackathon.get("_id"),
-                    "name": hackathon.get("name"),
-                    "slug": hackathon.get("slug"),
-                    "start_date": hackathon.get("start_date"),
-                    "end_date": hackathon.get("end_date"),
-                    "location": hackathon.get("location"),
-                    "status": hackathon.get("status")
-                })
-    
-    # Build public profile
-    public_profile = {
-        "name": user_doc.get("name"),
-        "bio": user_doc.get("bio"),
-        "profile_photo": user_doc.get("profile_photo"),
-        "github_link": user_doc.get("github_link"),
-        "linkedin_link": user_doc.get("linkedin_link"),
-        "role": user_doc.get("role"),
-        "participated_hackathons": participated_hackathons
-    }
-    
-    return public_profile
-
-@api_router.get("/users/{user_id}")
-
-
-@api_router.get("/sitemap.xml")
-async def get_sitemap():
-    """Generate dynamic sitemap for SEO"""
-    from datetime import datetime
-    
-    # Get all published hackathons
-    hackathons = await db.hackathons.find({"status": "published"}).to_list(length=None)
-    
-    # Get all public profiles
-    users_with_slugs = await db.users.find({"profile_slug": {"$exists": True, "$ne": None}}).to_list(length=None)
-    
-    base_url = os.environ.get('FRONTEND_URL', 'https://hackov8.xyz')
-    current_date = datetime.now().strftime('%Y-%m-%d')
-    
-    # Build sitemap XML
-    sitemap = '<?xml version="1.0" encoding="UTF-8"?>\n'
-    sitemap += '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
-    
-    # Homepage
-    sitemap += '  <url>\n'
-    sitemap += f'    <loc>{base_url}</loc>\n'
-    sitemap += f'    <lastmod>{current_date}</lastmod>\n'
-    sitemap += '    <changefreq>daily</changefreq>\n'
-    sitemap += '    <priority>1.0</priority>\n'
-    sitemap += '  </url>\n'
-    
-    # About page
-    sitemap += '  <url>\n'
-    sitemap += f'    <loc>{base_url}/about</loc>\n'
-    sitemap += f'    <lastmod>{current_date}</lastmod>\n'
-    sitemap += '    <changefreq>monthly</changefreq>\n'
-    sitemap += '    <priority>0.8</priority>\n'
-    sitemap += '  </url>\n'
-    
-    # Certificate service
-    sitemap += '  <url>\n'
-    sitemap += f'    <loc>{base_url}/certificate-service</loc>\n'
-    sitemap += f'    <lastmod>{current_date}</lastmod>\n'
-    sitemap += '    <changefreq>monthly</changefreq>\n'
-    sitemap += '    <priority>0.7</priority>\n'
-    sitemap += '  </url>\n'
-    
-    # Individual hackathons
-    for hackathon in hackathons:
-        if hackathon.get('slug'):
-            sitemap += '  <url>\n'
-            sitemap += f'    <loc>{base_url}/hackathons/{hackathon["slug"]}</loc>\n'
-            if hackathon.get('updated_at'):
-                updated_date = hackathon["updated_at"]
-                if hasattr(updated_date, 'strftime'):
-                    sitemap += f'    <lastmod>{updated_date.strftime("%Y-%m-%d")}</lastmod>\n'
-                else:
-                    sitemap += f'    <lastmod>{str(updated_date)[:10]}</lastmod>\n'
-            else:
-                sitemap += f'    <lastmod>{current_date}</lastmod>\n'
-            sitemap += '    <changefreq>weekly</changefreq>\n'
-            sitemap += '    <priority>0.9</priority>\n'
-            sitemap += '  </url>\n'
-    
-    # Public profiles
-    for user in users_with_slugs:
-        if user.get('profile_slug'):
-            sitemap += '  <url>\n'
-            sitemap += f'    <loc>{base_url}/profile/{user["profile_slug"]}</loc>\n'
-            sitemap += f'    <lastmod>{current_date}</lastmod>\n'
-            sitemap += '    <changefreq>monthly</changefreq>\n'
-            sitemap += '    <priority>0.6</priority>\n'
-            sitemap += '  </url>\n'
-    
-    sitemap += '</urlset>'
-    
-    return Response(content=sitemap, media_type="application/xml")
-
-@api_router.get("/hackathons/{hackathon_slug}/structured-data")
-async def get_hackathon_structured_data(hackathon_slug: str):
-    """Get structured data (JSON-LD) for a hackathon for SEO"""
-    hackathon = await db.hackathons.find_one({"slug": hackathon_slug})
-    if not hackathon:
-        raise HTTPException(status_code=404, detail="Hackathon not found")
-    
-    base_url = os.environ.get('FRONTEND_URL', 'https://hackov8.xyz')
-    
-    # Build JSON-LD structured data for events
+    body = public_profile_cache.get(slug)
+    if body is None:
+        profiles = await db.users.aggregate(public_profile_pipeline(slug)).to_list(1)
+        if not profiles:
+            raise HTTPException(status_code=404, detail="Profile not found")
+        body = serialize_json(profiles[0])
+        public_profile_cache[slug] = body
+    
+    return etag_response(request, body)
+
+# ==================== STRUCTURED DATA ====================
+
+# JSON-LD for each hackathon is serialized once when the hackathon changes and
+# kept in hackathon_seo (keyed by hackathon _id) together with its ETag and the
+# canonical URL/lastmod the sitemap lists, so page views never rebuild it.
+ATTENDANCE_MODES = {
+    "offline": "https://schema.org/OfflineEventAttendanceMode",
+    "hybrid": "https://schema.org/MixedEventAttendanceMode",
+}
+
+def _prize_total(prizes: List[Dict[str, Any]]) -> float:
+    """Sum prize amounts, which are free text such as "$5,000" """
+    total = 0.0
+    for prize in prizes or []:
+        digits = re.sub(r"[^0-9.]", "", str(prize.get("amount", "")))
+        try:
+            total += float(digits)
+        except ValueError:
+            continue
+    return total
+
+def build_hackathon_jsonld(hackathon: Dict[str, Any], url: str, base_url: str) -> Dict[str, Any]:
+    """schema.org Event for a hackathon document"""
+    mode = hackathon.get("location", "online")
     structured_data = {
         "@context": "https://schema.org",
         "@type": "Event",
-        "name": hackathon.get("name", ""),
-        "description": hackathon.get("description", "")[:200] if hackathon.get("description") else "",
-        "url": f"{base_url}/hackathons/{hackathon_slug}",
+        "name": hackathon.get("title", ""),
+        "description": (hackathon.get("description") or "")[:200],
+        "url": url,
         "eventStatus": "https://schema.org/EventScheduled" if hackathon.get("status") == "published" else "https://schema.org/EventCancelled",
-        "eventAttendanceMode": "https://schema.org/OfflineEventAttendanceMode" if hackathon.get("mode") == "offline" else "https://schema.org/OnlineEventAttendanceMode",
-        "location": {
+        "eventAttendanceMode": ATTENDANCE_MODES.get(mode, "https://schema.org/OnlineEventAttendanceMode"),
+        "location": {"@type": "VirtualLocation", "url": url} if mode == "online" else {
             "@type": "Place",
-            "name": hackathon.get("location", "Online"),
-            "address": hackathon.get("location", "Online")
+            "name": hackathon.get("venue") or mode,
+            "address": hackathon.get("venue") or mode
         },
         "organizer": {
             "@type": "Organization",
@@ -2243,31 +2878,342 @@ async def get_hackathon_structured_data(hackathon_slug: str):
         }
     }
     
-    # Add dates if available
-    if hackathon.get("start_date"):
-        structured_data["startDate"] = hackathon["start_date"]
-    if hackathon.get("end_date"):
-        structured_data["endDate"] = hackathon["end_date"]
-    
-    # Add image if available
-    if hackathon.get("banner_image"):
-        structured_data["image"] = f"{base_url}{hackathon['banner_image']}"
-    
-    # Add offers/prizes
-    if hackathon.get("prizes") and len(hackathon["prizes"]) > 0:
-        total_prize = sum(prize.get("amount", 0) for prize in hackathon["prizes"])
-        if total_prize > 0:
-            structured_data["offers"] = {
-                "@type": "Offer",
-                "price": total_prize,
-                "priceCurrency": "USD",
-                "availability": "https://schema.org/InStock"
-            }
+    if hackathon.get("event_start"):
+        structured_data["startDate"] = hackathon["event_start"]
+    if hackathon.get("event_end"):
+        structured_data["endDate"] = hackathon["event_end"]
+    
+    cover_image = hackathon.get("cover_image")
+    if cover_image:
+        structured_data["image"] = cover_image if cover_image.startswith("http") else f"{base_url}{cover_image}"
+    
+    total_prize = _prize_total(hackathon.get("prizes"))
+    if total_prize > 0:
+        structured_data["offers"] = {
+            "@type": "Offer",
+            "price": total_prize,
+            "priceCurrency": "USD",
+            "availability": "https://schema.org/InStock"
+        }
     
     return structured_data
 
+async def refresh_hackathon_structured_data(hackathon_id: str) -> Optional[Dict[str, Any]]:
+    """Regenerate and store a hackathon's serialized JSON-LD; call after any change to the hackathon"""
+    hackathon = await db.hackathons.find_one({"_id": hackathon_id})
+    if not hackathon or not hackathon.get("slug"):
+        await db.hackathon_seo.delete_one({"_id": hackathon_id})
+        return None
+    
+    base_url = os.environ.get('FRONTEND_URL', 'https://hackov8.xyz')
+    url = f"{base_url}/hackathon/{hackathon['slug']}"
+    jsonld = serialize_json(build_hackathon_jsonld(hackathon, url, base_url))
+    doc = {
+        "slug": hackathon["slug"],
+        "published": hackathon.get("status") == "published",
+        "url": url,
+        # Always a datetime (or None), even for hackathons imported with string dates
+        "lastmod": coerce_timestamp(hackathon.get("updated_at")) or coerce_timestamp(hackathon.get("created_at")),
+        "jsonld": jsonld,
+        "etag": f'"{hashlib.sha1(jsonld).hexdigest()}"'
+    }
+    await db.hackathon_seo.replace_one({"_id": hackathon_id}, doc, upsert=True)
+    return {"_id": hackathon_id, **doc}
+
+async def backfill_hackathon_structured_data() -> int:
+    """Generate JSON-LD for hackathons that predate hackathon_seo (or lost their entry)
+
+    Entries saved with a string lastmod (from imported hackathons) are regenerated too.
+    """
+    have = {doc["_id"] async for doc in db.hackathon_seo.find({"lastmod": {"$not": {"$type": "string"}}}, {"_id": 1})}
+    generated = 0
+    async for h in db.hackathons.find({}, {"_id": 1}):
+        if h["_id"] not in have:
+            await refresh_hackathon_structured_data(h["_id"])
+            generated += 1
+    return generated
+
+# ==================== SITEMAP ====================
+
+# Sitemaps are pre-generated into sitemap_chunks (ordered pieces of each file,
+# written as the cursors are walked) with one sitemaps document per file
+# pointing at its current build. mark_sitemap_stale() bumps the version and
+# the next request triggers a rebuild. Builds are serialised across workers by
+# a lease on the sitemap_state document, since a build deletes chunks of
+# builds other than the committed ones.
+SITEMAP_MAX_URLS = 50000  # Per-file limit from the sitemap protocol
+SITEMAP_CHUNK_BYTES = 256 * 1024
+SITEMAP_STATIC_PAGES = [("", "daily", "1.0"), ("/about", "monthly", "0.8")]
+URLSET_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+URLSET_FOOTER = '</urlset>\n'
+SITEMAP_INDEX_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+SITEMAP_INDEX_FOOTER = '</sitemapindex>\n'
+SITEMAP_LEASE_SECONDS = 600
+SITEMAP_WORKER_ID = uuid.uuid4().hex  # Lease owner for this process
+sitemap_build_lock = asyncio.Lock()
+
+async def _take_sitemap_lease(upsert: bool = True) -> bool:
+    """Take (or extend) the build lease unless another live worker holds it"""
+    now = datetime.now(timezone.utc)
+    try:
+        state = await db.sitemap_state.find_one_and_update(
+            {
+                "_id": "sitemap",
+                "$or": [
+                    {"lease_owner": None},
+                    {"lease_owner": SITEMAP_WORKER_ID},
+                    {"lease_expires": {"$lt": now}}
+                ]
+            },
+            {"$set": {"lease_owner": SITEMAP_WORKER_ID, "lease_expires": now + timedelta(seconds=SITEMAP_LEASE_SECONDS)}},
+            upsert=upsert
+        )
+    except DuplicateKeyError:
+        # The document exists and the filter did not match: the lease is held
+        return False
+    return upsert or state is not None
+
+async def _renew_sitemap_lease():
+    """Abort a build whose lease lapsed; another worker may have taken over"""
+    if not await _take_sitemap_lease(upsert=False):
+        raise RuntimeError("Sitemap build lease lost")
+
+async def _release_sitemap_lease():
+    await db.sitemap_state.update_one(
+        {"_id": "sitemap", "lease_owner": SITEMAP_WORKER_ID},
+        {"$unset": {"lease_owner": "", "lease_expires": ""}}
+    )
+
+async def mark_sitemap_stale():
+    await db.sitemap_state.update_one({"_id": "sitemap"}, {"$inc": {"version": 1}}, upsert=True)
+
+def _sitemap_url(loc: str, changefreq: str, priority: str, lastmod: Optional[datetime] = None) -> str:
+    # Entries written before lastmod was coerced may still hold ISO strings; unreadable ones are left out
+    lastmod = coerce_timestamp(lastmod)
+    lastmod_tag = f"<lastmod>{lastmod.strftime('%Y-%m-%d')}</lastmod>" if lastmod else ""
+    return f"<url><loc>{html.escape(loc)}</loc>{lastmod_tag}<changefreq>{changefreq}</changefreq><priority>{priority}</priority></url>\n"
+
+class SitemapFileWriter:
+    """Appends one sitemap file to sitemap_chunks as it is generated, hashing on the way"""
+
+    def __init__(self, name: str, build_id: str):
+        self.name = name
+        self.build_id = build_id
+        self.digest = hashlib.sha1()
+        self.buffer: List[str] = []
+        self.buffered = 0
+        self.seq = 0
+
+    async def write(self, text: str):
+        self.buffer.append(text)
+        self.buffered += len(text)
+        if self.buffered >= SITEMAP_CHUNK_BYTES:
+            await self.flush()
+
+    async def flush(self):
+        if not self.buffer:
+            return
+        data = "".join(self.buffer).encode()
+        self.digest.update(data)
+        await db.sitemap_chunks.insert_one({
+            "file": self.name, "build": self.build_id, "seq": self.seq, "data": data
+        })
+        self.buffer, self.buffered = [], 0
+        self.seq += 1
+
+async def _write_urlset_shards(family: str, cursor, render, build_id: str) -> List[SitemapFileWriter]:
+    """Stream a cursor into {family}-0, {family}-1, ... files of at most SITEMAP_MAX_URLS each"""
+    writers: List[SitemapFileWriter] = []
+    urls_in_file = 0
+    async for doc in cursor:
+        if not writers or urls_in_file == SITEMAP_MAX_URLS:
+            if writers:
+                await writers[-1].write(URLSET_FOOTER)
+                await writers[-1].flush()
+                await _renew_sitemap_lease()
+            writers.append(SitemapFileWriter(f"{family}-{len(writers)}", build_id))
+            await writers[-1].write(URLSET_HEADER)
+            urls_in_file = 0
+        await writers[-1].write(render(doc))
+        urls_in_file += 1
+    if writers:
+        await writers[-1].write(URLSET_FOOTER)
+        await writers[-1].flush()
+    return writers
+
+async def build_sitemaps(version: int):
+    """Regenerate the sitemap index and its shards; memory is bounded by one chunk per file"""
+    base_url = os.environ.get('FRONTEND_URL', 'https://hackov8.xyz')
+    now = datetime.now(timezone.utc)
+    build_id = uuid.uuid4().hex
+
+    pages = SitemapFileWriter("pages", build_id)
+    await pages.write(URLSET_HEADER)
+    for path, changefreq, priority in SITEMAP_STATIC_PAGES:
+        await pages.write(_sitemap_url(f"{base_url}{path}", changefreq, priority))
+    await pages.write(URLSET_FOOTER)
+    await pages.flush()
+
+    writers = [pages]
+    writers += await _write_urlset_shards(
+        "hackathons",
+        # Canonical URLs and lastmod come from the same records as the JSON-LD
+        db.hackathon_seo.find({"published": True}, {"url": 1, "lastmod": 1, "_id": 0}).sort("slug", 1),
+        lambda h: _sitemap_url(h["url"], "weekly", "0.9", h.get("lastmod")),
+        build_id
+    )
+    writers += await _write_urlset_shards(
+        "profiles",
+        # Served straight from the partial profile_slug index
+        db.users.find({"profile_slug": {"$type": "string"}}, {"profile_slug": 1, "_id": 0}).sort("profile_slug", 1),
+        lambda u: _sitemap_url(f"{base_url}/profile/{u['profile_slug']}", "monthly", "0.6"),
+        build_id
+    )
+
+    # Nothing is committed or deleted unless this worker still holds the lease
+    await _renew_sitemap_lease()
+    existing = {
+        doc["_id"]: doc
+        async for doc in db.sitemaps.find({}, {"sha1": 1, "build": 1, "generated_at": 1})
+    }
+
+    async def commit(writer: SitemapFileWriter) -> datetime:
+        """Point the file at this build, unless its content is unchanged (keeps Last-Modified for 304s)"""
+        digest = writer.digest.hexdigest()
+        previous = existing.get(writer.name)
+        if previous and previous["sha1"] == digest:
+            await db.sitemap_chunks.delete_many({"file": writer.name, "build": build_id})
+            return previous["generated_at"]
+        await db.sitemaps.replace_one(
+            {"_id": writer.name},
+            {
+                "build": build_id,
+                # Streams already reading the previous build can finish
+                "previous_build": previous["build"] if previous else None,
+                "sha1": digest,
+                "generated_at": now
+            },
+            upsert=True
+        )
+        return now
+
+    index = SitemapFileWriter("index", build_id)
+    await index.write(SITEMAP_INDEX_HEADER)
+    for writer in writers:
+        lastmod = await commit(writer)
+        await index.write(
+            f"<sitemap><loc>{html.escape(base_url)}/api/sitemaps/{writer.name}.xml</loc>"
+            f"<lastmod>{lastmod.strftime('%Y-%m-%dT%H:%M:%SZ')}</lastmod></sitemap>\n"
+        )
+    await index.write(SITEMAP_INDEX_FOOTER)
+    await index.flush()
+    await commit(index)
+
+    # Drop files that no longer exist and chunks from builds nobody can be reading
+    names = [writer.name for writer in writers] + ["index"]
+    await db.sitemaps.delete_many({"_id": {"$nin": names}})
+    await db.sitemap_chunks.delete_many({"file": {"$nin": names}})
+    async for doc in db.sitemaps.find({}, {"build": 1, "previous_build": 1}):
+        await db.sitemap_chunks.delete_many({
+            "file": doc["_id"],
+            "build": {"$nin": [doc["build"], doc.get("previous_build")]}
+        })
+
+    await db.sitemap_state.update_one(
+        {"_id": "sitemap"},
+        {"$set": {"built_version": version, "built_at": now}},
+        upsert=True
+    )
+
+def _sitemaps_current(state: Dict[str, Any]) -> bool:
+    return "built_version" in state and state["built_version"] == state.get("version", 0)
+
+async def rebuild_sitemaps_if_stale(wait_for_first_build: bool = False):
+    async with sitemap_build_lock:
+        while not await _take_sitemap_lease():
+            # Another worker is building; only a request with nothing to serve waits for it
+            state = await db.sitemap_state.find_one({"_id": "sitemap"}) or {}
+            if not wait_for_first_build or "built_version" in state:
+                return
+            await asyncio.sleep(1)
+        try:
+            state = await db.sitemap_state.find_one({"_id": "sitemap"}) or {}
+            if not _sitemaps_current(state):
+                await build_sitemaps(state.get("version", 0))
+        finally:
+            await _release_sitemap_lease()
+
+async def _rebuild_sitemaps_in_background():
+    try:
+        await rebuild_sitemaps_if_stale()
+    except Exception as e:
+        print(f"Sitemap rebuild failed: {str(e)}")
+
+async def ensure_sitemaps_fresh():
+    """Serve the last build while a newer one is generated; only the very first build is awaited"""
+    state = await db.sitemap_state.find_one({"_id": "sitemap"}) or {}
+    if _sitemaps_current(state):
+        return
+    if "built_version" not in state:
+        await rebuild_sitemaps_if_stale(wait_for_first_build=True)
+    elif not sitemap_build_lock.locked():
+        asyncio.create_task(_rebuild_sitemaps_in_background())
+
+async def serve_sitemap_file(request: Request, name: str) -> Response:
+    await ensure_sitemaps_fresh()
+    doc = await db.sitemaps.find_one({"_id": name})
+    if not doc:
+        raise HTTPException(status_code=404, detail="Sitemap not found")
+
+    last_modified = doc["generated_at"].replace(tzinfo=timezone.utc, microsecond=0)
+    headers = {
+        "Last-Modified": format_datetime(last_modified, usegmt=True),
+        "Cache-Control": "public, max-age=3600"
+    }
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            if last_modified <= parsedate_to_datetime(if_modified_since):
+                return Response(status_code=304, headers=headers)
+        except (TypeError, ValueError):
+            pass
+
+    async def chunks():
+        cursor = db.sitemap_chunks.find(
+            {"file": name, "build": doc["build"]}, {"data": 1, "_id": 0}
+        ).sort("seq", 1)
+        async for chunk in cursor:
+            yield chunk["data"]
+
+    return StreamingResponse(chunks(), media_type="application/xml", headers=headers)
+
+@api_router.get("/sitemap.xml")
+async def get_sitemap(request: Request):
+    """Sitemap index pointing at the page, hackathon and profile shards"""
+    return await serve_sitemap_file(request, "index")
+
+@api_router.get("/sitemaps/{name}.xml")
+async def get_sitemap_shard(name: str, request: Request):
+    if name == "index":
+        raise HTTPException(status_code=404, detail="Sitemap not found")
+    return await serve_sitemap_file(request, name)
+
+@api_router.get("/hackathons/{hackathon_slug}/structured-data")
+async def get_hackathon_structured_data(hackathon_slug: str, request: Request):
+    """Get structured data (JSON-LD) for a hackathon for SEO"""
+    seo = await db.hackathon_seo.find_one({"slug": hackathon_slug}, {"jsonld": 1, "etag": 1})
+    if not seo:
+        hackathon = await db.hackathons.find_one({"slug": hackathon_slug}, {"_id": 1})
+        seo = hackathon and await refresh_hackathon_structured_data(hackathon["_id"])
+        if not seo:
+            raise HTTPException(status_code=404, detail="Hackathon not found")
+    
+    return etag_response(request, seo["jsonld"], media_type="application/ld+json", etag=seo["etag"])
+
+@api_router.get("/users/{user_id}")
 async def get_user(user_id: str):
-    user_doc = await db.users.find_one({"_id": user_id})
+    # Public route (registration lists look participants up here), so credentials stay out
+    user_doc = await db.users.find_one({"_id": user_id}, {"password_hash": 0, "verification_token": 0})
     if not user_doc:
         raise HTTPException(status_code=404, detail="User not found")
     user_doc["id"] = user_doc.pop("_id")
@@ -2275,13 +3221,7 @@ async def get_user(user_id: str):
 
 # ==================== HACKATHON ROUTES ====================
 
-@api_router.get("/hackathons")
-async def get_hackathons(
-    status: Optional[str] = None,
-    category: Optional[str] = None,
-    location: Optional[str] = None,
-    featured_only: bool = False
-):
+def build_hackathon_filter(status: Optional[str], category: Optional[str], location: Optional[str], featured_only: bool) -> Dict[str, Any]:
     query = {}
     if status:
         query["status"] = status
@@ -2291,18 +3231,190 @@ async def get_hackathons(
         query["location"] = location
     if featured_only:
         query["featured"] = True
+    return query
+
+# Sort: featured first, then by creation date; _id breaks ties for keyset paging
+HACKATHON_LISTING_SORT = {"featured": -1, "created_at": -1, "_id": -1}
+
+# Just what a listing card renders; rules, FAQs, judges, sponsors etc. stay behind
+HACKATHON_CARD_PROJECTION = {
+    "title": 1,
+    "slug": 1,
+    "description": {"$substrCP": [{"$ifNull": ["$description", ""]}, 0, 300]},
+    "cover_image": 1,
+    "cover_image_variants": 1,
+    "organizer_name": 1,
+    "category": 1,
+    "location": 1,
+    "status": 1,
+    "featured": 1,
+    "registration_end": 1,
+    "event_start": 1,
+    "event_end": 1,
+    "min_team_size": 1,
+    "max_team_size": 1,
+    "prizes": 1,
+    "created_at": 1
+}
+
+def encode_hackathon_cursor(hackathon: Dict[str, Any]) -> str:
+    position = [bool(hackathon.get("featured")), hackathon["created_at"].isoformat(), hackathon["_id"]]
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+def hackathon_cursor_filter(cursor: str) -> Dict[str, Any]:
+    """Match everything after the cursor position in HACKATHON_LISTING_SORT order"""
+    try:
+        featured, created_at, hackathon_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        created_at = datetime.fromisoformat(created_at)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    clauses = [
+        {"featured": featured, "created_at": {"$lt": created_at}},
+        {"featured": featured, "created_at": created_at, "_id": {"$lt": hackathon_id}}
+    ]
+    if featured:
+        clauses.append({"featured": False})
+    return {"$or": clauses}
+
+@api_router.get("/hackathons")
+async def get_hackathons(
+    request: Request,
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    location: Optional[str] = None,
+    featured_only: bool = False
+):
+    cache_key = ("all", status, category, location, featured_only)
+    body = hackathon_listing_cache.get(cache_key)
+    if body is None:
+        query = build_hackathon_filter(status, category, location, featured_only)
+        hackathons = await db.hackathons.find(query).sort(list(HACKATHON_LISTING_SORT.items())).to_list(100)
+        body = serialize_json([{**h, "id": h.pop("_id")} for h in hackathons])
+        hackathon_listing_cache[cache_key] = body
+    
+    return etag_response(request, body)
+
+@api_router.get("/hackathons/listing")
+async def get_hackathon_listing(
+    request: Request,
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    location: Optional[str] = None,
+    featured_only: bool = False,
+    limit: int = 20,
+    cursor: Optional[str] = None
+):
+    """Paginated hackathon cards for listing pages; pass next_cursor back to get the next page"""
+    limit = max(1, min(limit, 50))
+    cache_key = ("cards", status, category, location, featured_only, limit, cursor)
+    body = hackathon_listing_cache.get(cache_key)
+    if body is None:
+        query = build_hackathon_filter(status, category, location, featured_only)
+        if cursor:
+            query = {"$and": [query, hackathon_cursor_filter(cursor)]}
+        
+        # Fetch one extra card to know whether another page exists
+        cards = await db.hackathons.aggregate([
+            {"$match": query},
+            {"$sort": HACKATHON_LISTING_SORT},
+            {"$limit": limit + 1},
+            {"$project": HACKATHON_CARD_PROJECTION}
+        ]).to_list(limit + 1)
+        
+        has_more = len(cards) > limit
+        cards = cards[:limit]
+        next_cursor = encode_hackathon_cursor(cards[-1]) if has_more else None
+        body = serialize_json({
+            "items": [{**c, "id": c.pop("_id")} for c in cards],
+            "next_cursor": next_cursor
+        })
+        hackathon_listing_cache[cache_key] = body
     
-    # Sort: featured first, then by creation date
-    hackathons = await db.hackathons.find(query).sort([("featured", -1), ("created_at", -1)]).to_list(100)
-    return [{**h, "id": h.pop("_id")} for h in hackathons]
+    return etag_response(request, body)
+
+@api_router.get("/hackathons/search")
+async def search_hackathons(
+    request: Request,
+    q: Optional[str] = None,
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    location: Optional[str] = None,
+    limit: int = 20,
+    skip: int = 0
+):
+    """Full-text hackathon search with per-category/location/status facet counts"""
+    q = (q or "").strip()[:200]
+    limit = max(1, min(limit, 50))
+    skip = max(0, min(skip, 1000))
+    cache_key = ("search", q, status, category, location, limit, skip)
+    body = hackathon_listing_cache.get(cache_key)
+    if body is None:
+        filters = {"status": status, "category": category, "location": location}
+        
+        def match_except(dimension: Optional[str] = None) -> Dict[str, Any]:
+            # Each facet ignores its own filter so the UI can still offer the alternatives
+            return {field: value for field, value in filters.items() if value and field != dimension}
+        
+        pipeline = []
+        if q:
+            # $text must be the first stage; the text index covers title, category and description
+            pipeline.append({"$match": {"$text": {"$search": q}}})
+            pipeline.append({"$addFields": {"score": {"$meta": "textScore"}}})
+            sort = {"score": -1, **HACKATHON_LISTING_SORT}
+        else:
+            sort = HACKATHON_LISTING_SORT
+        
+        # Every $facet branch gets its own copy of the input, so trim documents to
+        # the card fields first (they include the facet and sort fields)
+        pipeline.append({"$project": {**HACKATHON_CARD_PROJECTION, **({"score": 1} if q else {})}})
+        pipeline.append({"$facet": {
+            "results": [
+                {"$match": match_except()},
+                {"$sort": sort},
+                {"$skip": skip},
+                {"$limit": limit}
+            ],
+            "total": [{"$match": match_except()}, {"$count": "count"}],
+            **{
+                dimension: [
+                    {"$match": match_except(dimension)},
+                    {"$group": {"_id": f"${dimension}", "count": {"$sum": 1}}},
+                    {"$sort": {"count": -1, "_id": 1}}
+                ]
+                for dimension in ("category", "location", "status")
+            }
+        }})
+        
+        result = (await db.hackathons.aggregate(pipeline).to_list(1))[0]
+        body = serialize_json({
+            "items": [{**h, "id": h.pop("_id")} for h in result["results"]],
+            "total": result["total"][0]["count"] if result["total"] else 0,
+            "facets": {
+                dimension: [{"value": bucket["_id"], "count": bucket["count"]} for bucket in result[dimension]]
+                for dimension in ("category", "location", "status")
+            }
+        })
+        hackathon_listing_cache[cache_key] = body
+    
+    return etag_response(request, body)
 
 @api_router.get("/hackathons/slug/{slug}")
-async def get_hackathon_by_slug(slug: str):
-    """Get hackathon by SEO-friendly slug"""
-    hackathon = await db.hackathons.find_one({"slug": slug})
+async def get_hackathon_by_slug(slug: str, request: Request):
+    """Get hackathon by SEO-friendly slug, with its JSON-LD as structured_data"""
+    hackathon, seo = await asyncio.gather(
+        db.hackathons.find_one({"slug": slug}),
+        db.hackathon_seo.find_one({"slug": slug}, {"jsonld": 1})
+    )
     if not hackathon:
         raise HTTPException(status_code=404, detail="Hackathon not found")
-    return {**hackathon, "id": hackathon.pop("_id")}
+    if not seo or seo["_id"] != hackathon["_id"]:
+        seo = await refresh_hackathon_structured_data(hackathon["_id"])
+    
+    # Splice the stored JSON-LD bytes in rather than re-encoding them
+    body = serialize_json({**hackathon, "id": hackathon.pop("_id")})
+    body = body[:-1] + b',"structured_data":' + seo["jsonld"] + b"}"
+    return etag_response(request, body)
 
 @api_router.get("/hackathons/{hackathon_id}")
 async def get_hackathon(hackathon_id: str):
@@ -2321,20 +3433,28 @@ async def create_hackathon(hackathon_data: HackathonCreate, request: Request):
     # Set status to pending_approval for organizers, published for admins
     initial_status = "published" if user.role == "admin" else "pending_approval"
     
-    # Generate unique slug from title
-    existing_hackathons = await db.hackathons.find({}, {"slug": 1}).to_list(1000)
-    existing_slugs = [h.get("slug", "") for h in existing_hackathons if h.get("slug")]
-    slug = generate_slug(hackathon_data.title, existing_slugs)
-    
+    base_slug = slugify(hackathon_data.title, fallback="hackathon")
     hackathon = Hackathon(
         **hackathon_data.dict(),
-        slug=slug,
+        slug=base_slug,
+        cover_image_variants=await blob_store.variants_for_url(hackathon_data.cover_image, "banner"),
         organizer_id=user.id,
         organizer_name=user.name,
         status=initial_status
     )
     hackathon_dict = hackathon.dict(by_alias=True)
-    await db.hackathons.insert_one(hackathon_dict)
+    
+    # Insert under the next free slug; the unique index settles races
+    async def insert_with_slug(slug: str):
+        hackathon_dict["slug"] = slug
+        await db.hackathons.insert_one(hackathon_dict)
+    
+    hackathon.slug = await allocate_unique_slug(db.hackathons, "slug", base_slug, insert_with_slug)
+    await blob_store.retain(hackathon.cover_image)
+    await record_daily_stat("hackathon_creations")
+    await refresh_hackathon_structured_data(hackathon.id)
+    invalidate_hackathon_listings()
+    await mark_sitemap_stale()
     
     # Send notification to all admins when hackathon is submitted for approval
     if initial_status == "pending_approval":
@@ -2368,19 +3488,40 @@ async def update_hackathon(hackathon_id: str, update_data: Dict[str, Any], reque
     if not (is_organizer or is_co_organizer or is_admin):
         raise HTTPException(status_code=403, detail="Not authorized")
     
+    cover_image_changed = "cover_image" in update_data and update_data["cover_image"] != hackathon.get("cover_image")
+    if cover_image_changed:
+        update_data["cover_image_variants"] = await blob_store.variants_for_url(update_data["cover_image"], "banner")
+    
     await db.hackathons.update_one(
         {"_id": hackathon_id},
-        {"$set": update_data}
+        {"$set": {**update_data, "updated_at": datetime.now(timezone.utc)}}
     )
+    if cover_image_changed:
+        await blob_store.swap(hackathon.get("cover_image"), update_data["cover_image"])
+    await refresh_hackathon_structured_data(hackathon_id)
+    invalidate_hackathon_listings()
+    await mark_sitemap_stale()
     
     return {"message": "Hackathon updated successfully"}
 
+async def delete_hackathon_and_related(hackathon_id: str):
+    """Delete a hackathon with its registrations, referral counters, submissions, teams and SEO data"""
+    deleted = await db.hackathons.find_one_and_delete({"_id": hackathon_id}, {"cover_image": 1})
+    await blob_store.release((deleted or {}).get("cover_image"))
+    await db.registrations.delete_many({"hackathon_id": hackathon_id})
+    await db.referral_stats.delete_many({"hackathon_id": hackathon_id})
+    await db.submissions.delete_many({"hackathon_id": hackathon_id})
+    await db.teams.delete_many({"hackathon_id": hackathon_id})
+    await db.hackathon_seo.delete_one({"_id": hackathon_id})
+    invalidate_hackathon_listings()
+    await mark_sitemap_stale()
+
 @api_router.delete("/hackathons/{hackathon_id}")
 async def delete_hackathon(hackathon_id: str, request: Request):
     user = await get_current_user(request)
     await require_role(user, ["admin"])
     
-    await db.hackathons.delete_one({"_id": hackathon_id})
+    await delete_hackathon_and_related(hackathon_id)
     return {"message": "Hackathon deleted successfully"}
 
 @api_router.get("/hackathons/organizer/my")
@@ -2620,7 +3761,7 @@ async def get_judge_hackathons(request: Request):
     return co_organizers
 
 @api_router.post("/hackathons/{hackathon_id}/notify-participants")
-async def notify_hackathon_participants(hackathon_id: str, title: str, message: str, request: Request):
+async def notify_hackathon_participants(hackathon_id: str, title: str, message: str, request: Request, send_email: bool = False):
     user = await get_current_user(request)
     
     # Check if user is the organizer, co-organizer, or admin
@@ -2651,9 +3792,28 @@ async def notify_hackathon_participants(hackathon_id: str, title: str, message:
         await db.notifications.insert_one(notification.dict(by_alias=True))
         notifications_sent += 1
     
+    # Optionally fan the announcement out as email too
+    emails_queued = 0
+    if send_email and participant_ids:
+        frontend_url = os.environ.get('FRONTEND_URL', 'https://hackov8.xyz')
+        hackathon_url = f"{frontend_url}/hackathon/{hackathon.get('slug', hackathon_id)}"
+        participants = db.users.find({"_id": {"$in": participant_ids}}, {"email": 1, "name": 1})
+        async for participant in participants:
+            if queue_email(
+                "hackathon_announcement",
+                participant["email"],
+                user_name=participant.get("name", ""),
+                hackathon_title=hackathon["title"],
+                hackathon_url=hackathon_url,
+                title=title,
+                message=message
+            ):
+                emails_queued += 1
+    
     return {
         "message": f"Notification sent to {notifications_sent} participants",
-        "count": notifications_sent
+        "count": notifications_sent,
+        "emails_queued": emails_queued
     }
 
 # Duplicate function removed - using the first add_co_organizer function above
@@ -2721,42 +3881,199 @@ async def remove_winner(submission_id: str, request: Request):
 
 # ==================== FILE UPLOAD ROUTES ====================
 
+# Every upload goes through spool_upload(): the body is copied in chunks to a
+# local temp file, hashed and size-checked on the way, with all disk I/O in a
+# worker thread. From there files go to the storage backend (storage.py):
+# images and templates through the content-addressed blob store (blobs.py).
+UPLOADS_DIR = Path("/app/uploads")  # Root of the local backend, served at /api/uploads
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+MAX_IMAGE_UPLOAD_BYTES = int(os.environ.get("MAX_IMAGE_UPLOAD_MB", "5")) * 1024 * 1024
+MAX_CSV_UPLOAD_BYTES = 2 * 1024 * 1024
+IMAGE_CONTENT_TYPES = ["image/jpeg", "image/jpg", "image/png", "image/webp", "image/gif"]
+BLOB_GC_GRACE = timedelta(hours=int(os.environ.get("BLOB_GC_GRACE_HOURS", "24")))
+BLOB_GC_INTERVAL_SECONDS = 6 * 3600
+# (collection, field) pairs that hold blob URLs; reconciliation counts references here
+BLOB_REFERENCES = [("hackathons", "cover_image"), ("users", "profile_photo"), ("certificate_templates", "template_url")]
+
+storage = storage_from_env(UPLOADS_DIR)
+blob_store = BlobStore(db.blobs, storage)
+
+def _upload_too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(status_code=413, detail=f"File too large. Max {max_bytes // (1024 * 1024)}MB allowed.")
+
+def _open_spool_file() -> tuple:
+    storage.spool_dir.mkdir(parents=True, exist_ok=True)
+    fd, name = tempfile.mkstemp(dir=storage.spool_dir)
+    return os.fdopen(fd, "wb"), Path(name)
+
+def _write_and_hash(buffer, digest, chunk: bytes):
+    buffer.write(chunk)
+    digest.update(chunk)
+
+def _discard(path: Path):
+    path.unlink(missing_ok=True)
+
+async def spool_upload(file: UploadFile, max_bytes: int) -> tuple:
+    """Copy an upload to a temp file chunk by chunk; returns (path, sha256, size) and the caller must store or discard it"""
+    # The multipart parser already knows the size, so oversized files fail before any copying
+    if file.size is not None and file.size > max_bytes:
+        raise _upload_too_large(max_bytes)
+    
+    buffer, path = await asyncio.to_thread(_open_spool_file)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with buffer:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise _upload_too_large(max_bytes)
+                await asyncio.to_thread(_write_and_hash, buffer, digest, chunk)
+    except BaseException:
+        await asyncio.to_thread(_discard, path)
+        raise
+    return path, digest.hexdigest(), size
+
+async def store_upload(file: UploadFile, max_bytes: int = MAX_IMAGE_UPLOAD_BYTES,
+                       variants: Optional[str] = None) -> Dict[str, Any]:
+    """Stream an upload into the blob store (identical content is stored once) and return the blob document.
+    
+    With `variants`, that IMAGE_VARIANT_PRESETS entry is rendered from the local spool
+    unless the blob already has it, so the original is never read back from storage.
+    """
+    path, digest, size = await spool_upload(file, max_bytes)
+    try:
+        blob = await blob_store.claim(digest, size, upload_extension(file), file.content_type)
+        if variants and variants not in blob["variants"]:
+            blob["variants"][variants] = await render_image_variants(blob, variants, path)
+    except BaseException:
+        await asyncio.to_thread(_discard, path)
+        raise
+    await blob_store.place(blob, path)
+    return blob
+
+async def read_upload(file: UploadFile, max_bytes: int) -> bytes:
+    """Read a small upload (e.g. a CSV) into memory, enforcing the size limit while reading"""
+    if file.size is not None and file.size > max_bytes:
+        raise _upload_too_large(max_bytes)
+    chunks, size = [], 0
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        size += len(chunk)
+        if size > max_bytes:
+            raise _upload_too_large(max_bytes)
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+def upload_extension(file: UploadFile, default: str = "bin") -> str:
+    """Lower-cased extension of the client's filename, restricted to safe characters"""
+    extension = Path(file.filename or "").suffix.lstrip(".").lower()
+    return extension if extension.isalnum() else default
+
+async def collect_upload_garbage() -> Dict[str, int]:
+    """Recount blob references, then delete blobs unreferenced for longer than the grace period"""
+    counts: Dict[str, int] = {}
+    for collection_name, field in BLOB_REFERENCES:
+        groups = db[collection_name].aggregate([
+            # Covers absolute URLs too: the frontend stores cover_image with its backend origin
+            {"$match": {field: {"$regex": f"{UPLOADS_URL_PATTERN}{BLOB_DIR}/"}}},
+            {"$group": {"_id": f"${field}", "count": {"$sum": 1}}}
+        ])
+        async for group in groups:
+            digest = blob_store.digest_for_url(group["_id"])
+            if digest:
+                counts[digest] = counts.get(digest, 0) + group["count"]
+    
+    result = await blob_store.reconcile(counts)
+    result["collected"] = await blob_store.collect_garbage(BLOB_GC_GRACE)
+    return result
+
+@api_router.post("/admin/uploads/gc")
+async def collect_upload_garbage_admin(request: Request):
+    """Fix drifted blob refcounts and delete orphaned uploads (admin only)"""
+    user = await get_current_user(request)
+    await require_role(user, ["admin"])
+    
+    return await collect_upload_garbage()
+
+# Uploaded images get EXIF-free WebP renditions next to the blob, rendered in a
+# small thread pool (Pillow releases the GIL while resizing and encoding) and
+# recorded on the blob, so re-uploads of the same image reuse them. Listings put
+# them in srcset so cards download a few KB instead of the original.
+IMAGE_VARIANT_PRESETS = {
+    # name: (widths, square crop)
+    "banner": ((320, 640, 1280), False),
+    "avatar": ((64, 128, 256), True),
+}
+IMAGE_VARIANT_QUALITY = 80
+image_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("IMAGE_WORKERS", "2")),
+    thread_name_prefix="image-variants"
+)
+
+def _render_image_variants(source: Path, widths: tuple, square: bool) -> List[tuple]:
+    """Render WebP variants of a local image beside it (never upscaling); returns [(width, path)]"""
+    from PIL import Image, ImageOps
+    
+    try:
+        with Image.open(source) as original:
+            # JPEGs can be decoded straight at a reduced scale
+            original.draft("RGB", (max(widths), max(widths)))
+            # Bake the orientation into the pixels; EXIF itself is never copied to the variants
+            image = ImageOps.exif_transpose(original)
+            image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        raise ValueError(f"Unreadable image: {e}")
+    
+    if square:
+        side = min(image.size)
+        image = ImageOps.fit(image, (side, side))
+    
+    rendered = []
+    for width in sorted({min(width, image.width) for width in widths}):
+        height = max(1, round(image.height * width / image.width))
+        variant = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+        destination = source.with_name(f"{source.name}-{width}w.webp")
+        variant.save(destination, "WEBP", quality=IMAGE_VARIANT_QUALITY, method=4)
+        rendered.append((width, destination))
+    return rendered
+
+async def render_image_variants(blob: Dict[str, Any], name: str, source: Path) -> List[Dict[str, Any]]:
+    """Render a variant preset off the event loop and store it with the blob; a file that is not an image is rejected"""
+    widths, square = IMAGE_VARIANT_PRESETS[name]
+    loop = asyncio.get_running_loop()
+    try:
+        rendered = await loop.run_in_executor(image_executor, _render_image_variants, source, widths, square)
+    except ValueError:
+        await blob_store.discard_if_unreferenced(blob["_id"])
+        raise HTTPException(status_code=400, detail="File is not a valid image")
+    return await blob_store.put_variants(blob, name, rendered)
+
+@api_router.get("/uploads/{key:path}")
+async def download_upload(key: str):
+    """Redirect to the storage backend's URL for a file (the local backend is served by a mount instead)"""
+    if not is_public_key(key):
+        raise HTTPException(status_code=404, detail="Not found")
+    return RedirectResponse(
+        await storage.download_url(key),
+        status_code=307,
+        headers={"Cache-Control": f"public, max-age={storage.url_max_age}"}
+    )
+
 @api_router.post("/upload/image")
 async def upload_image(file: UploadFile = File(...), request: Request = None):
     user = await get_current_user(request)
     
     # Validate file type
-    allowed_types = ["image/jpeg", "image/jpg", "image/png", "image/webp", "image/gif"]
-    if file.content_type not in allowed_types:
+    if file.content_type not in IMAGE_CONTENT_TYPES:
         raise HTTPException(status_code=400, detail="Invalid file type. Only images allowed.")
     
-    # Validate file size (max 5MB)
-    file_size = 0
-    chunk_size = 1024 * 1024  # 1MB chunks
-    temp_file = f"/tmp/{uuid.uuid4()}"
-    
-    with open(temp_file, "wb") as buffer:
-        while chunk := await file.read(chunk_size):
-            file_size += len(chunk)
-            if file_size > 5 * 1024 * 1024:  # 5MB
-                os.remove(temp_file)
-                raise HTTPException(status_code=400, detail="File too large. Max 5MB allowed.")
-            buffer.write(chunk)
-    
-    # Generate unique filename
-    file_extension = file.filename.split(".")[-1]
-    unique_filename = f"{uuid.uuid4()}.{file_extension}"
-    upload_path = f"/app/uploads/hackathon_banners/{unique_filename}"
-    
-    # Move file to uploads directory
-    shutil.move(temp_file, upload_path)
-    
-    # Return URL (will be served by static files)
-    file_url = f"/api/uploads/hackathon_banners/{unique_filename}"
+    # Unreferenced until a hackathon uses it as cover_image; GC removes it otherwise
+    blob = await store_upload(file, variants="banner")
     
     return {
-        "url": file_url,
-        "filename": unique_filename,
+        "url": blob_store.url_for(blob["path"]),
+        "filename": Path(blob["path"]).name,
+        "variants": blob["variants"]["banner"],
         "message": "File uploaded successfully"
     }
 
@@ -2799,6 +4116,12 @@ async def register_for_hackathon(
         utm_medium=utm_medium
     )
     await db.registrations.insert_one(registration.dict(by_alias=True))
+    await db.hackathons.update_one({"_id": hackathon_id}, {"$inc": {"registration_count": 1}})
+    await db.users.update_one({"_id": user.id}, {"$inc": {"participation_count": 1}})
+    if referred_by_user_id:
+        await record_referral(hackathon_id, referred_by_user_id, registration.registered_at)
+    invalidate_public_profile(user.profile_slug)
+    await record_daily_stat("registrations")
     
     # Create notification for registrant
     notification = Notification(
@@ -2819,6 +4142,15 @@ async def register_for_hackathon(
             message=f"Someone registered for {hackathon.get('title', 'a hackathon')} using your referral link!"
         )
         await db.notifications.insert_one(referrer_notification.dict(by_alias=True))
+        
+        frontend_url = os.environ.get('FRONTEND_URL', 'https://hackov8.xyz')
+        queue_email(
+            "referral_success",
+            referring_user["email"],
+            user_name=referring_user.get("name", ""),
+            hackathon_title=hackathon.get("title", "a hackathon"),
+            referral_link=f"{frontend_url}/hackathon/{hackathon.get('slug', hackathon_id)}?ref={ref}"
+        )
     
     return {"message": "Registered successfully", "referred_by": referred_by_user_id is not None}
 
@@ -2850,12 +4182,12 @@ async def get_hackathon_registrations(hackathon_id: str, request: Request):
 @api_router.get("/hackathons/{hackathon_id}/registrations/count")
 async def get_hackathon_registration_count(hackathon_id: str):
     """Get registration count for a hackathon (public endpoint)"""
-    # First try to get the count from the hackathon document (allows manual count updates)
-    hackathon = await db.hackathons.find_one({"_id": hackathon_id})
-    if hackathon and "registration_count" in hackathon and hackathon["registration_count"] is not None:
+    # Maintained on the hackathon document by register_for_hackathon
+    hackathon = await db.hackathons.find_one({"_id": hackathon_id}, {"registration_count": 1})
+    if hackathon and hackathon.get("registration_count") is not None:
         return {"count": hackathon["registration_count"]}
     
-    # Fallback to counting actual registration documents
+    # Fallback for hackathons not yet backfilled by reconcile_hackathon_counters
     count = await db.registrations.count_documents({"hackathon_id": hackathon_id})
     return {"count": count}
 
@@ -2962,6 +4294,7 @@ async def create_submission(submission_data: SubmissionCreate, request: Request)
     submission = Submission(**submission_data.dict())
     submission_dict = submission.dict(by_alias=True)
     await db.submissions.insert_one(submission_dict)
+    await db.hackathons.update_one({"_id": submission.hackathon_id}, {"$inc": {"submission_count": 1}})
     
     # Notify team members
     for member_id in team["members"]:
@@ -3104,7 +4437,7 @@ async def mark_notification_read(notification_id: str, request: Request):
     
     await db.notifications.update_one(
         {"_id": notification_id, "user_id": user.id},
-        {"$set": {"read": True}}
+        {"$set": {"read": True, "read_at": datetime.now(timezone.utc)}}
     )
     
     return {"message": "Notification marked as read"}
@@ -3116,12 +4449,86 @@ async def mark_all_notifications_read(request: Request):
     
     result = await db.notifications.update_many(
         {"user_id": user.id, "read": False},
-        {"$set": {"read": True}}
+        {"$set": {"read": True, "read_at": datetime.now(timezone.utc)}}
     )
     
     return {"message": f"Marked {result.modified_count} notifications as read"}
 
 
+@api_router.get("/notifications/archive")
+async def get_archived_notifications(request: Request, months: int = 6):
+    """Get the user's archived (compacted) notifications, newest month first"""
+    user = await get_current_user(request)
+    
+    buckets = await db.notification_archives.find(
+        {"user_id": user.id}
+    ).sort("month", -1).to_list(max(1, min(months, 24)))
+    return [{**b, "id": b.pop("_id")} for b in buckets]
+
+
+async def _flush_notification_archive(buckets: Dict[tuple, List[dict]], notification_ids: List[str]) -> int:
+    """Append a batch of notifications to their monthly buckets, then drop the originals"""
+    operations = [
+        UpdateOne(
+            {"_id": f"{user_id}:{month}"},
+            {
+                "$setOnInsert": {"user_id": user_id, "month": month},
+                # $addToSet keeps a re-run after a partial failure idempotent
+                "$addToSet": {"notifications": {"$each": items}}
+            },
+            upsert=True
+        )
+        for (user_id, month), items in buckets.items()
+    ]
+    await db.notification_archives.bulk_write(operations, ordered=False)
+    result = await db.notifications.delete_many({"_id": {"$in": notification_ids}})
+    return result.deleted_count
+
+
+async def compact_notifications(batch_size: int = 1000) -> Dict[str, int]:
+    """Expire old read notifications and archive old unread ones into monthly buckets"""
+    now = datetime.now(timezone.utc)
+    read_cutoff = now - timedelta(days=NOTIFICATION_READ_TTL_DAYS)
+    archive_cutoff = now - timedelta(days=NOTIFICATION_ARCHIVE_AFTER_DAYS)
+    
+    # The TTL index only covers documents with read_at; notifications marked
+    # read before read_at existed are expired here by created_at instead
+    expired = await db.notifications.delete_many({
+        "read": True,
+        "$or": [
+            {"read_at": {"$lt": read_cutoff}},
+            {"read_at": None, "created_at": {"$lt": read_cutoff}}
+        ]
+    })
+    
+    archived = 0
+    buckets: Dict[tuple, List[dict]] = {}
+    batch_ids = []
+    cursor = db.notifications.find(
+        {"read": False, "created_at": {"$lt": archive_cutoff}},
+        {"user_id": 1, "type": 1, "title": 1, "message": 1, "created_at": 1}
+    )
+    async for notification in cursor:
+        month = notification["created_at"].strftime("%Y-%m")
+        buckets.setdefault((notification["user_id"], month), []).append({
+            "id": notification["_id"],
+            "type": notification.get("type"),
+            "title": notification.get("title"),
+            "message": notification.get("message"),
+            "created_at": notification["created_at"]
+        })
+        batch_ids.append(notification["_id"])
+        
+        if len(batch_ids) >= batch_size:
+            archived += await _flush_notification_archive(buckets, batch_ids)
+            buckets, batch_ids = {}, []
+    
+    if batch_ids:
+        archived += await _flush_notification_archive(buckets, batch_ids)
+    
+    return {"expired": expired.deleted_count, "archived": archived}
+
+
 # ==================== ADMIN ROUTES ====================
 
 # Hackathon Management
@@ -3136,19 +4543,13 @@ async def get_admin_hackathons(request: Request, status: Optional[str] = None):
     
     hackathons = await db.hackathons.find(query).sort("created_at", -1).to_list(1000)
     
-    # Enrich with counts
-    result = []
-    for h in hackathons:
-        reg_count = await db.registrations.count_documents({"hackathon_id": h["_id"]})
-        sub_count = await db.submissions.count_documents({"hackathon_id": h["_id"]})
-        result.append({
-            **h,
-            "id": h.pop("_id"),
-            "registration_count": reg_count,
-            "submission_count": sub_count
-        })
-    
-    return result
+    # Counts are denormalized onto each hackathon, so this stays a single query
+    return [{
+        "registration_count": 0,
+        "submission_count": 0,
+        **h,
+        "id": h.pop("_id")
+    } for h in hackathons]
 
 @api_router.put("/admin/hackathons/{hackathon_id}/approve")
 async def approve_hackathon(hackathon_id: str, request: Request):
@@ -3167,6 +4568,9 @@ async def approve_hackathon(hackathon_id: str, request: Request):
             "approved_by": user.id
         }}
     )
+    await refresh_hackathon_structured_data(hackathon_id)
+    invalidate_hackathon_listings()
+    await mark_sitemap_stale()
     
     # Send notification to organizer
     await db.notifications.insert_one({
@@ -3194,6 +4598,9 @@ async def reject_hackathon(hackathon_id: str, reason: str, request: Request):
         {"_id": hackathon_id},
         {"$set": {"status": "rejected"}}
     )
+    await refresh_hackathon_structured_data(hackathon_id)
+    invalidate_hackathon_listings()
+    await mark_sitemap_stale()
     
     # Send notification to organizer
     await db.notifications.insert_one({
@@ -3226,6 +4633,8 @@ async def toggle_featured_hackathon(hackathon_id: str, featured: bool, request:
         {"_id": hackathon_id},
         {"$set": update_data}
     )
+    invalidate_hackathon_listings()
+    await mark_sitemap_stale()
     
     action = "featured" if featured else "unfeatured"
     return {"message": f"Hackathon {action} successfully"}
@@ -3235,15 +4644,89 @@ async def delete_hackathon_admin(hackathon_id: str, request: Request):
     user = await get_current_user(request)
     await require_role(user, ["admin"])
     
-    # Delete hackathon and related data
-    await db.hackathons.delete_one({"_id": hackathon_id})
-    await db.registrations.delete_many({"hackathon_id": hackathon_id})
-    await db.submissions.delete_many({"hackathon_id": hackathon_id})
-    await db.teams.delete_many({"hackathon_id": hackathon_id})
-    
+    await delete_hackathon_and_related(hackathon_id)
     return {"message": "Hackathon deleted successfully"}
 
+
+async def _decrement_hackathon_counters(collection, owner_query: Dict[str, Any], field: str):
+    """Subtract a user's documents from the per-hackathon counter before they are deleted"""
+    per_hackathon = collection.aggregate([
+        {"$match": owner_query},
+        {"$group": {"_id": "$hackathon_id", "count": {"$sum": 1}}}
+    ])
+    operations = [
+        UpdateOne({"_id": group["_id"]}, {"$inc": {field: -group["count"]}})
+        async for group in per_hackathon
+    ]
+    if operations:
+        await db.hackathons.bulk_write(operations, ordered=False)
+
+
+async def reconcile_hackathon_counters() -> Dict[str, int]:
+    """Recount registrations and submissions per hackathon and fix any drifted counters"""
+    actual = {"registration_count": {}, "submission_count": {}}
+    for field, collection in (("registration_count", db.registrations), ("submission_count", db.submissions)):
+        async for group in collection.aggregate([{"$group": {"_id": "$hackathon_id", "count": {"$sum": 1}}}]):
+            actual[field][group["_id"]] = group["count"]
+    
+    operations = []
+    cursor = db.hackathons.find({}, {"registration_count": 1, "submission_count": 1})
+    async for h in cursor:
+        drifted = {
+            field: counts.get(h["_id"], 0)
+            for field, counts in actual.items()
+            if h.get(field) != counts.get(h["_id"], 0)
+        }
+        if drifted:
+            operations.append(UpdateOne({"_id": h["_id"]}, {"$set": drifted}))
+    
+    for i in range(0, len(operations), 1000):
+        await db.hackathons.bulk_write(operations[i:i + 1000], ordered=False)
+    
+    return {"corrected": len(operations)}
+
+
+@api_router.post("/admin/hackathons/reconcile-counters")
+async def reconcile_counters(request: Request):
+    """Recompute denormalized registration/submission counts (admin only)"""
+    user = await get_current_user(request)
+    await require_role(user, ["admin"])
+    
+    result = await reconcile_hackathon_counters()
+    if result["corrected"]:
+        invalidate_hackathon_listings()
+        await mark_sitemap_stale()
+    return result
+
 # Analytics & Stats
+async def _count_by(collection, field: str, default: Optional[str] = None) -> Dict[str, int]:
+    """Server-side $group count of a collection by one field"""
+    key = {"$ifNull": [f"${field}", default]} if default else f"${field}"
+    groups = await collection.aggregate([
+        {"$group": {"_id": key, "count": {"$sum": 1}}}
+    ]).to_list(None)
+    return {g["_id"]: g["count"] for g in groups}
+
+async def get_platform_totals() -> Dict[str, Any]:
+    """Entity totals and role distribution, gathered concurrently without transferring documents"""
+    role_distribution, hackathon_statuses, total_registrations, total_submissions, total_teams = await asyncio.gather(
+        _count_by(db.users, "role", default="participant"),
+        _count_by(db.hackathons, "status"),
+        db.registrations.count_documents({}),
+        db.submissions.count_documents({}),
+        db.teams.count_documents({})
+    )
+    return {
+        "total_users": sum(role_distribution.values()),
+        "total_hackathons": sum(hackathon_statuses.values()),
+        "pending_hackathons": hackathon_statuses.get("pending_approval", 0),
+        "published_hackathons": hackathon_statuses.get("published", 0),
+        "total_registrations": total_registrations,
+        "total_submissions": total_submissions,
+        "total_teams": total_teams,
+        "role_distribution": role_distribution
+    }
+
 @api_router.get("/admin/stats/overview")
 async def get_admin_stats_overview(request: Request, days: int = 30):
     user = await get_current_user(request)
@@ -3251,32 +4734,11 @@ async def get_admin_stats_overview(request: Request, days: int = 30):
     
     cutoff_date = datetime.now(timezone.utc) - timedelta(days=days if days > 0 else 36500)  # All time if days = 0
     
-    total_users = await db.users.count_documents({})
-    new_users = await db.users.count_documents({"created_at": {"$gte": cutoff_date}})
-    total_hackathons = await db.hackathons.count_documents({})
-    pending_hackathons = await db.hackathons.count_documents({"status": "pending_approval"})
-    published_hackathons = await db.hackathons.count_documents({"status": "published"})
-    total_registrations = await db.registrations.count_documents({})
-    total_submissions = await db.submissions.count_documents({})
-    total_teams = await db.teams.count_documents({})
-    
-    # Get user role distribution
-    users = await db.users.find().to_list(10000)
-    role_distribution = {}
-    for u in users:
-        role = u.get("role", "participant")
-        role_distribution[role] = role_distribution.get(role, 0) + 1
+    totals, daily_rows = await asyncio.gather(get_platform_totals(), get_daily_stats(cutoff_date))
     
     return {
-        "total_users": total_users,
-        "new_users": new_users,
-        "total_hackathons": total_hackathons,
-        "pending_hackathons": pending_hackathons,
-        "published_hackathons": published_hackathons,
-        "total_registrations": total_registrations,
-        "total_submissions": total_submissions,
-        "total_teams": total_teams,
-        "role_distribution": role_distribution,
+        **totals,
+        "new_users": sum(row.get("user_signups", 0) for row in daily_rows),
         "period_days": days
     }
 
@@ -3287,75 +4749,45 @@ async def get_growth_stats(request: Request, days: int = 30):
     
     cutoff_date = datetime.now(timezone.utc) - timedelta(days=days if days > 0 else 36500)
     
-    # Get daily user signups
-    users = await db.users.find({"created_at": {"$gte": cutoff_date}}).to_list(10000)
-    
-    # Get daily hackathon creation
-    hackathons = await db.hackathons.find({"created_at": {"$gte": cutoff_date}}).to_list(10000)
-    
-    # Get daily registrations
-    registrations = await db.registrations.find({"created_at": {"$gte": cutoff_date}}).to_list(10000)
-    
-    # Group by date
-    user_growth = {}
-    hackathon_growth = {}
-    registration_growth = {}
-    
-    for u in users:
-        date_key = u["created_at"].date().isoformat()
-        user_growth[date_key] = user_growth.get(date_key, 0) + 1
-    
-    for h in hackathons:
-        date_key = h["created_at"].date().isoformat()
-        hackathon_growth[date_key] = hackathon_growth.get(date_key, 0) + 1
-    
-    for r in registrations:
-        date_key = r["created_at"].date().isoformat()
-        registration_growth[date_key] = registration_growth.get(date_key, 0) + 1
-    
-    # Convert to sorted arrays
-    dates = sorted(set(list(user_growth.keys()) + list(hackathon_growth.keys()) + list(registration_growth.keys())))
+    # One pre-aggregated row per active day
+    rows = await get_daily_stats(cutoff_date)
     
     return {
-        "dates": dates,
-        "user_signups": [user_growth.get(d, 0) for d in dates],
-        "hackathon_creations": [hackathon_growth.get(d, 0) for d in dates],
-        "registrations": [registration_growth.get(d, 0) for d in dates]
+        "dates": [row["_id"] for row in rows],
+        "user_signups": [row.get("user_signups", 0) for row in rows],
+        "hackathon_creations": [row.get("hackathon_creations", 0) for row in rows],
+        "registrations": [row.get("registrations", 0) for row in rows]
     }
 
+@api_router.post("/admin/stats/rebuild-daily")
+async def rebuild_daily_stats(request: Request, days: int = 0):
+    """Recompute daily_stats rollups from source data; days=0 rebuilds all history (admin only)"""
+    user = await get_current_user(request)
+    await require_role(user, ["admin"])
+    
+    since = None
+    if days > 0:
+        since = (datetime.now(timezone.utc) - timedelta(days=days)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return {"days_written": await backfill_daily_stats(since)}
+
 @api_router.get("/admin/stats/retention")
 async def get_retention_stats(request: Request):
     user = await get_current_user(request)
     await require_role(user, ["admin"])
     
-    now = datetime.now(timezone.utc)
-    seven_days_ago = now - timedelta(days=7)
-    thirty_days_ago = now - timedelta(days=30)
-    
-    # Total users
-    total_users = await db.users.count_documents({})
-    
-    # Users who logged in within last 7 days
-    active_7_days = await db.users.count_documents({
-        "last_login": {"$gte": seven_days_ago}
-    })
-    
-    # Users who logged in within last 30 days
-    active_30_days = await db.users.count_documents({
-        "last_login": {"$gte": thirty_days_ago}
-    })
-    
-    # Users who participated in multiple hackathons
-    registrations = await db.registrations.find().to_list(10000)
-    user_participation = {}
-    for reg in registrations:
-        user_id = reg["user_id"]
-        user_participation[user_id] = user_participation.get(user_id, 0) + 1
-    
-    multi_hackathon_users = sum(1 for count in user_participation.values() if count > 1)
+    # Active users are HyperLogLog estimates over the daily login sketches;
+    # multi-participation reads the per-user registration counter
+    total_users, active_today, active_7_days, active_30_days, multi_hackathon_users = await asyncio.gather(
+        db.users.count_documents({}),
+        count_active_users(1),
+        count_active_users(7),
+        count_active_users(30),
+        db.users.count_documents({"participation_count": {"$gt": 1}})
+    )
     
     return {
         "total_users": total_users,
+        "active_today": active_today,
         "active_7_days": active_7_days,
         "active_30_days": active_30_days,
         "retention_rate_7_days": round((active_7_days / total_users * 100) if total_users > 0 else 0, 2),
@@ -3364,41 +4796,121 @@ async def get_retention_stats(request: Request):
         "multi_participation_rate": round((multi_hackathon_users / total_users * 100) if total_users > 0 else 0, 2)
     }
 
+async def reconcile_participation_counts() -> Dict[str, int]:
+    """Recount registrations per user and fix any drifted participation_count"""
+    actual = {
+        group["_id"]: group["count"]
+        async for group in db.registrations.aggregate([{"$group": {"_id": "$user_id", "count": {"$sum": 1}}}])
+    }
+    
+    operations = []
+    async for u in db.users.find({}, {"participation_count": 1}):
+        count = actual.get(u["_id"], 0)
+        if u.get("participation_count") != count:
+            operations.append(UpdateOne({"_id": u["_id"]}, {"$set": {"participation_count": count}}))
+    
+    for i in range(0, len(operations), 1000):
+        await db.users.bulk_write(operations[i:i + 1000], ordered=False)
+    
+    return {"corrected": len(operations)}
+
+@api_router.post("/admin/stats/reconcile-participation")
+async def reconcile_participation(request: Request):
+    """Recompute per-user participation counters (admin only)"""
+    user = await get_current_user(request)
+    await require_role(user, ["admin"])
+    
+    return await reconcile_participation_counts()
+
 @api_router.get("/admin/stats")
 async def get_admin_stats(request: Request):
     user = await get_current_user(request)
     await require_role(user, ["admin"])
     
-    total_users = await db.users.count_documents({})
-    total_hackathons = await db.hackathons.count_documents({})
-    total_registrations = await db.registrations.count_documents({})
-    total_submissions = await db.submissions.count_documents({})
-    total_teams = await db.teams.count_documents({})
-    
-    # Get user role distribution
-    users = await db.users.find().to_list(10000)
-    role_distribution = {}
-    for u in users:
-        role = u.get("role", "participant")
-        role_distribution[role] = role_distribution.get(role, 0) + 1
+    totals = await get_platform_totals()
     
     return {
-        "total_users": total_users,
-        "total_hackathons": total_hackathons,
-        "total_registrations": total_registrations,
-        "total_submissions": total_submissions,
-        "total_teams": total_teams,
-        "role_distribution": role_distribution
+        key: totals[key]
+        for key in ("total_users", "total_hackathons", "total_registrations",
+                    "total_submissions", "total_teams", "role_distribution")
     }
 
+# Only what the admin user table shows; never password hashes or CV arrays
+ADMIN_USER_PROJECTION = {
+    "name": 1, "email": 1, "role": 1, "email_verified": 1, "picture": 1,
+    "profile_slug": 1, "created_at": 1, "last_login": 1, "participation_count": 1
+}
+ADMIN_USER_SORT = [("created_at", -1), ("_id", -1)]
+# Case-insensitive; name/email indexes are built with the same collation
+USER_SEARCH_COLLATION = {"locale": "en", "strength": 2}
+
+def encode_user_cursor(user_doc: Dict[str, Any]) -> str:
+    position = [user_doc["created_at"].isoformat(), user_doc["_id"]]
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+def user_cursor_filter(cursor: str) -> Dict[str, Any]:
+    """Match everything after the cursor position in ADMIN_USER_SORT order"""
+    try:
+        created_at, user_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        created_at = datetime.fromisoformat(created_at)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    return {"$or": [
+        {"created_at": {"$lt": created_at}},
+        {"created_at": created_at, "_id": {"$lt": user_id}}
+    ]}
+
+def build_admin_user_query(q: Optional[str], role: Optional[str], cursor: Optional[str]) -> Dict[str, Any]:
+    clauses = []
+    if role:
+        clauses.append({"role": role})
+    if q and q.strip():
+        # Prefix range instead of a regex, so the collated indexes serve it
+        prefix = q.strip()
+        prefix_range = {"$gte": prefix, "$lt": prefix + "\uffff"}
+        clauses.append({"$or": [{"name": prefix_range}, {"email": prefix_range}]})
+    if cursor:
+        clauses.append(user_cursor_filter(cursor))
+    return {"$and": clauses} if clauses else {}
+
 @api_router.get("/admin/users")
-async def get_all_users(request: Request):
+async def get_all_users(request: Request, q: Optional[str] = None, role: Optional[str] = None):
     user = await get_current_user(request)
     await require_role(user, ["admin"])
     
-    users = await db.users.find().sort("created_at", -1).to_list(1000)
+    users = await db.users.find(
+        build_admin_user_query(q, role, None), ADMIN_USER_PROJECTION,
+        collation=USER_SEARCH_COLLATION if q else None
+    ).sort(ADMIN_USER_SORT).to_list(1000)
     return [{**u, "id": u.pop("_id")} for u in users]
 
+@api_router.get("/admin/users/listing")
+async def get_admin_user_listing(
+    request: Request,
+    q: Optional[str] = None,
+    role: Optional[str] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None
+):
+    """Paginated admin user table with name/email prefix search; pass next_cursor back for more"""
+    user = await get_current_user(request)
+    await require_role(user, ["admin"])
+    
+    limit = max(1, min(limit, 200))
+    users = await db.users.find(
+        build_admin_user_query(q, role, cursor), ADMIN_USER_PROJECTION,
+        collation=USER_SEARCH_COLLATION if q else None
+    ).sort(ADMIN_USER_SORT).limit(limit + 1).to_list(limit + 1)
+    
+    has_more = len(users) > limit
+    users = users[:limit]
+    next_cursor = encode_user_cursor(users[-1]) if has_more else None
+    return {
+        "items": [{**u, "id": u.pop("_id")} for u in users],
+        "next_cursor": next_cursor
+    }
+
 @api_router.put("/admin/users/{user_id}/role")
 async def update_user_role(user_id: str, new_role: str, request: Request):
     user = await get_current_user(request)
@@ -3430,18 +4942,71 @@ async def delete_user(user_id: str, request: Request):
     if not target_user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    # Delete user's related data
+    # Delete user's related data, keeping hackathon counters in step
+    await _decrement_hackathon_counters(db.registrations, {"user_id": user_id}, "registration_count")
+    await _decrement_referral_stats({"user_id": user_id})
     await db.registrations.delete_many({"user_id": user_id})
     await db.teams.delete_many({"leader_id": user_id})
+    await _decrement_hackathon_counters(db.submissions, {"user_id": user_id}, "submission_count")
     await db.submissions.delete_many({"user_id": user_id})
     await db.notifications.delete_many({"user_id": user_id})
+    await db.notification_archives.delete_many({"user_id": user_id})
     
     # Delete the user
     await db.users.delete_one({"_id": user_id})
+    await blob_store.release(target_user.get("profile_photo"))
+    if target_user.get("profile_slug"):
+        invalidate_public_profile(target_user["profile_slug"])
+        await mark_sitemap_stale()
     
     return {"message": f"User {target_user.get('name', 'Unknown')} deleted successfully"}
 
 
+@api_router.get("/admin/email/metrics")
+async def get_email_metrics(request: Request):
+    """Get background mailer queue and throughput metrics (admin only)"""
+    user = await get_current_user(request)
+    await require_role(user, ["admin"])
+    
+    return mailer.stats()
+
+
+@api_router.post("/admin/notifications/compact")
+async def compact_notifications_admin(request: Request):
+    """Run notification retention: expire read and archive old unread notifications (admin only)"""
+    user = await get_current_user(request)
+    await require_role(user, ["admin"])
+    
+    result = await compact_notifications()
+    
+    return {
+        "message": f"Expired {result['expired']} and archived {result['archived']} notifications",
+        **result
+    }
+
+
+def _top_values(field: str, default: str, limit: int = 10) -> List[dict]:
+    """$facet branch: most frequent values of one field"""
+    return [
+        {"$group": {"_id": {"$ifNull": [f"${field}", default]}, "count": {"$sum": 1}}},
+        {"$sort": {"count": -1, "_id": 1}},
+        {"$limit": limit},
+        {"$project": {"_id": 0, "name": "$_id", "count": 1}}
+    ]
+
+def utm_analytics_pipeline(start_date: datetime) -> List[dict]:
+    """One pass over the date range (registered_at index) computing every UTM top-N"""
+    return [
+        {"$match": {"registered_at": {"$gte": start_date}}},
+        {"$facet": {
+            "total": [{"$count": "count"}],
+            "utm_sources": _top_values("utm_source", "direct"),
+            "utm_campaigns": _top_values("utm_campaign", "none"),
+            "utm_mediums": _top_values("utm_medium", "none"),
+            "top_referrers": [{"$match": {"referred_by": {"$type": "string"}}}] + _top_values("referred_by", "none")
+        }}
+    ]
+
 @api_router.get("/admin/analytics/utm")
 async def get_utm_analytics(request: Request, days: int = 30):
     """Get UTM tracking analytics for the platform"""
@@ -3452,91 +5017,174 @@ async def get_utm_analytics(request: Request, days: int = 30):
     end_date = datetime.now(timezone.utc)
     start_date = end_date - timedelta(days=days if days > 0 else 365)
     
-    # Get all registrations with UTM data
-    registrations = await db.registrations.find({
-        "created_at": {"$gte": start_date}
-    }).to_list(10000)
-    
-    # Get all users with UTM data
-    users = await db.users.find({
-        "created_at": {"$gte": start_date}
-    }).to_list(10000)
-    
-    # Aggregate UTM data
-    utm_sources = {}
-    utm_campaigns = {}
-    utm_mediums = {}
-    utm_contents = {}
-    referrers = {}
-    
-    # Process registrations
-    for reg in registrations:
-        utm_data = reg.get("utm_data", {})
-        source = utm_data.get("utm_source", "direct")
-        campaign = utm_data.get("utm_campaign", "none")
-        medium = utm_data.get("utm_medium", "none")
-        content = utm_data.get("utm_content", "none")
-        ref = utm_data.get("ref", "none")
-        
-        utm_sources[source] = utm_sources.get(source, 0) + 1
-        utm_campaigns[campaign] = utm_campaigns.get(campaign, 0) + 1
-        utm_mediums[medium] = utm_mediums.get(medium, 0) + 1
-        utm_contents[content] = utm_contents.get(content, 0) + 1
-        referrers[ref] = referrers.get(ref, 0) + 1
-    
-    # Process user signups
-    signup_sources = {}
-    for user_doc in users:
-        utm_data = user_doc.get("utm_data", {})
-        source = utm_data.get("utm_source", "direct")
-        signup_sources[source] = signup_sources.get(source, 0) + 1
-    
-    # Sort and get top entries
-    top_sources = sorted(utm_sources.items(), key=lambda x: x[1], reverse=True)[:10]
-    top_campaigns = sorted(utm_campaigns.items(), key=lambda x: x[1], reverse=True)[:10]
-    top_mediums = sorted(utm_mediums.items(), key=lambda x: x[1], reverse=True)[:10]
-    top_referrers = sorted(referrers.items(), key=lambda x: x[1], reverse=True)[:10]
+    # Users carry no UTM fields, so signups are only counted (created_at index)
+    registration_facets, total_signups = await asyncio.gather(
+        db.registrations.aggregate(utm_analytics_pipeline(start_date), allowDiskUse=True).to_list(1),
+        db.users.count_documents({"created_at": {"$gte": start_date}})
+    )
+    registration_facets = registration_facets[0]
+    
+    # Show referrer names instead of user IDs; only the top N are looked up
+    top_referrers = registration_facets["top_referrers"]
+    referrer_names = {
+        u["_id"]: u.get("name", "Unknown")
+        async for u in db.users.find({"_id": {"$in": [r["name"] for r in top_referrers]}}, {"name": 1})
+    }
     
     return {
         "period_days": days,
-        "total_tracked_registrations": len(registrations),
-        "total_tracked_signups": len(users),
-        "utm_sources": [{"name": k, "count": v} for k, v in top_sources],
-        "utm_campaigns": [{"name": k, "count": v} for k, v in top_campaigns],
-        "utm_mediums": [{"name": k, "count": v} for k, v in top_mediums],
-        "top_referrers": [{"name": k, "count": v} for k, v in top_referrers],
-        "signup_sources": [{"name": k, "count": v} for k, v in sorted(signup_sources.items(), key=lambda x: x[1], reverse=True)[:10]]
+        "total_tracked_registrations": registration_facets["total"][0]["count"] if registration_facets["total"] else 0,
+        "total_tracked_signups": total_signups,
+        "utm_sources": registration_facets["utm_sources"],
+        "utm_campaigns": registration_facets["utm_campaigns"],
+        "utm_mediums": registration_facets["utm_mediums"],
+        "top_referrers": [
+            {"name": referrer_names.get(r["name"], r["name"]), "user_id": r["name"], "count": r["count"]}
+            for r in top_referrers
+        ]
     }
 
+# Exports stream from a cursor, so memory stays bounded however many rows there are
+EXPORT_BATCH_SIZE = 1000
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+PARQUET_TYPES = {"string": "string", "int": "int64", "timestamp": "timestamp[ms]"}  # Mongo datetimes are naive UTC
+
+async def _csv_chunks(cursor, columns):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([header for header, _, _, _ in columns])
+    rows = 0
+    async for doc in cursor:
+        writer.writerow([getter(doc) for _, _, getter, _ in columns])
+        rows += 1
+        if rows % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate(0)
+    yield buffer.getvalue().encode()
+
+async def _ndjson_chunks(cursor, columns):
+    lines = []
+    async for doc in cursor:
+        lines.append(json.dumps(jsonable_encoder({key: getter(doc) for _, key, getter, _ in columns})))
+        if len(lines) >= EXPORT_BATCH_SIZE:
+            yield ("\n".join(lines) + "\n").encode()
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode()
+
+def _write_parquet_rows(writer, schema, rows: List[dict]):
+    writer.write_table(pyarrow.Table.from_pylist(rows, schema=schema))
+
+async def _parquet_chunks(cursor, columns):
+    # Parquet's footer points back into the file, so row groups are spooled
+    # (to disk past 8 MB) and streamed once the writer is closed. Encoding and
+    # file I/O run in worker threads to keep the event loop free.
+    schema = pyarrow.schema([(key, PARQUET_TYPES[kind]) for _, key, _, kind in columns])
+    with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as spool:
+        writer = pyarrow.parquet.ParquetWriter(spool, schema)
+        rows = []
+        async for doc in cursor:
+            rows.append({
+                key: coerce_timestamp(getter(doc)) if kind == "timestamp" else getter(doc)
+                for _, key, getter, kind in columns
+            })
+            if len(rows) >= EXPORT_BATCH_SIZE * 10:
+                await asyncio.to_thread(_write_parquet_rows, writer, schema, rows)
+                rows = []
+        if rows:
+            await asyncio.to_thread(_write_parquet_rows, writer, schema, rows)
+        await asyncio.to_thread(writer.close)
+        
+        spool.seek(0)
+        while chunk := await asyncio.to_thread(spool.read, 256 * 1024):
+            yield chunk
+
+async def _gzip_chunks(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+def stream_export(cursor, columns: List[tuple], name: str, export_format: str, compress: bool) -> StreamingResponse:
+    """Stream a cursor as CSV, NDJSON or Parquet; columns are (header, key, getter, kind)"""
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format. Use one of: {', '.join(EXPORT_FORMATS)}")
+    if export_format == "parquet" and not PARQUET_AVAILABLE:
+        raise HTTPException(status_code=400, detail="Parquet export requires pyarrow to be installed")
+    
+    media_type, extension = EXPORT_FORMATS[export_format]
+    chunk_builder = {"csv": _csv_chunks, "ndjson": _ndjson_chunks, "parquet": _parquet_chunks}[export_format]
+    chunks = chunk_builder(cursor.batch_size(EXPORT_BATCH_SIZE), columns)
+    headers = {"Content-Disposition": f"attachment; filename={name}.{extension}"}
+    if compress:
+        chunks = _gzip_chunks(chunks)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(chunks, media_type=media_type, headers=headers)
+
+USER_EXPORT_COLUMNS = [
+    ("ID", "id", lambda u: u["_id"], "string"),
+    ("Name", "name", lambda u: u.get("name", ""), "string"),
+    ("Email", "email", lambda u: u.get("email", ""), "string"),
+    ("Role", "role", lambda u: u.get("role", "participant"), "string"),
+    ("Created At", "created_at", lambda u: u.get("created_at"), "timestamp"),
+]
+
+HACKATHON_EXPORT_COLUMNS = [
+    ("ID", "id", lambda h: h["_id"], "string"),
+    ("Title", "title", lambda h: h.get("title", ""), "string"),
+    ("Organizer", "organizer", lambda h: h.get("organizer_name", "N/A"), "string"),
+    ("Status", "status", lambda h: h.get("status", ""), "string"),
+    ("Registrations", "registrations", lambda h: h.get("registration_count", 0), "int"),
+    ("Submissions", "submissions", lambda h: h.get("submission_count", 0), "int"),
+    ("Created At", "created_at", lambda h: h.get("created_at"), "timestamp"),
+]
+
 @api_router.get("/admin/export/users")
-async def export_users(request: Request):
+async def export_users(request: Request, format: str = "csv", gzip: bool = False):
     user = await get_current_user(request)
     await require_role(user, ["admin"])
     
-    users = await db.users.find().to_list(10000)
-    csv_data = "ID,Name,Email,Role,Created At\n"
-    for u in users:
-        csv_data += f"{u['_id']},{u['name']},{u['email']},{u.get('role', 'participant')},{u['created_at']}\n"
-    
-    return Response(content=csv_data, media_type="text/csv", headers={"Content-Disposition": "attachment; filename=users.csv"})
+    cursor = db.users.find({}, {"name": 1, "email": 1, "role": 1, "created_at": 1})
+    return stream_export(cursor, USER_EXPORT_COLUMNS, "users", format, gzip)
 
 @api_router.get("/admin/export/hackathons")
-async def export_hackathons(request: Request):
+async def export_hackathons(request: Request, format: str = "csv", gzip: bool = False):
     user = await get_current_user(request)
     await require_role(user, ["admin"])
     
-    hackathons = await db.hackathons.find().to_list(10000)
-    csv_data = "ID,Title,Organizer,Status,Registrations,Submissions,Created At\n"
-    for h in hackathons:
-        reg_count = await db.registrations.count_documents({"hackathon_id": h["_id"]})
-        sub_count = await db.submissions.count_documents({"hackathon_id": h["_id"]})
-        csv_data += f"{h['_id']},{h['title']},{h.get('organizer_name', 'N/A')},{h['status']},{reg_count},{sub_count},{h['created_at']}\n"
+    # Counts come from the denormalized counters, so this is one query
+    cursor = db.hackathons.find({}, {
+        "title": 1, "organizer_name": 1, "status": 1, "created_at": 1,
+        "registration_count": 1, "submission_count": 1
+    })
+    return stream_export(cursor, HACKATHON_EXPORT_COLUMNS, "hackathons", format, gzip)
+
+class UploadStaticFiles(CachedStaticFiles):
+    """Local uploads; content-addressed blobs (and their variants) are served as immutable"""
     
-    return Response(content=csv_data, media_type="text/csv", headers={"Content-Disposition": "attachment; filename=hackathons.csv"})
+    async def get_response(self, path: str, scope) -> Response:
+        # Spool and trash directories are internal
+        if not is_public_key(path):
+            raise HTTPException(status_code=404, detail="Not found")
+        return await super().get_response(path, scope)
 
 # Mount static files BEFORE including router (order matters!)
-# Mount under /api prefix so Kubernetes ingress routes to backend
-app.mount("/api/uploads", StaticFiles(directory="/app/uploads"), name="uploads")
+# Mount under /api prefix so Kubernetes ingress routes to backend.
+# Other storage backends are served by the download_upload redirect instead.
+if storage.serves_locally:
+    UPLOADS_DIR.mkdir(parents=True, exist_ok=True)
+    app.mount(
+        "/api/uploads",
+        UploadStaticFiles(directory=str(UPLOADS_DIR), immutable_prefixes=(f"{BLOB_DIR}/",)),
+        name="uploads"
+    )
 
 # Include the router in the main app
 app.include_router(api_router)
@@ -3556,6 +5204,154 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def create_indexes():
+    # Hot path for the notification bell
+    await db.notifications.create_index([("user_id", 1), ("created_at", -1)])
+    
+    # Read notifications expire automatically; unread ones have no read_at
+    ttl_seconds = NOTIFICATION_READ_TTL_DAYS * 86400
+    try:
+        await db.notifications.create_index("read_at", name="read_at_ttl", expireAfterSeconds=ttl_seconds)
+    except OperationFailure:
+        # Retention period changed since the index was built
+        await db.command("collMod", "notifications", index={"name": "read_at_ttl", "expireAfterSeconds": ttl_seconds})
+    
+    await db.notification_archives.create_index([("user_id", 1), ("month", -1)])
+    
+    await db.users.create_index("participation_count")
+    await db.registrations.create_index("user_id")
+    await db.sitemap_chunks.create_index([("file", 1), ("build", 1), ("seq", 1)])
+    await db.hackathon_seo.create_index("slug")
+    await db.blobs.create_index([("refcount", 1), ("touched_at", 1)])
+    await db.hackathon_seo.create_index([("published", 1), ("slug", 1)])
+    await db.users.create_index("created_at")
+    await db.users.create_index(ADMIN_USER_SORT)
+    await db.users.create_index([("role", 1), ("created_at", -1), ("_id", -1)])
+    await db.users.create_index("name", name="name_ci", collation=USER_SEARCH_COLLATION)
+    await db.users.create_index("email", name="email_ci", collation=USER_SEARCH_COLLATION)
+    await db.registrations.create_index("registered_at")
+    # Per-referrer lookups, and the prefix serves per-hackathon registration queries
+    await db.registrations.create_index([("hackathon_id", 1), ("referred_by", 1), ("registered_at", -1)])
+    await db.referral_stats.create_index([("hackathon_id", 1), ("referrer_id", 1)], unique=True)
+    await db.referral_stats.create_index([("hackathon_id", 1), ("count", -1), ("last_referred_at", -1)])
+    await db.activity_sketches.create_index("day", expireAfterSeconds=ACTIVITY_SKETCH_RETENTION_DAYS * 86400)
+    
+    # Keyset paging over the listing sort assumes featured is always a bool
+    await db.hackathons.update_many({"featured": {"$not": {"$type": "bool"}}}, {"$set": {"featured": False}})
+    await db.hackathons.create_index([("featured", -1), ("created_at", -1), ("_id", -1)])
+    await ensure_slug_indexes(db)
+    await db.hackathons.create_index([("status", 1), ("featured", -1), ("created_at", -1), ("_id", -1)])
+    await db.hackathons.create_index(
+        [("title", "text"), ("category", "text"), ("description", "text")],
+        weights={"title": 10, "category": 5, "description": 1},
+        name="hackathon_text_search"
+    )
+
+@app.on_event("startup")
+async def convert_legacy_timestamps():
+    # Awaited rather than run in the background so the backfills below only see dates
+    for collection_name, fields in LEGACY_TIMESTAMP_FIELDS.items():
+        try:
+            converted = await migrate_legacy_timestamps(collection_name, fields)
+            converted_timestamps[collection_name] = converted
+            if converted:
+                print(f"Converted string timestamps on {converted} {collection_name}")
+        except Exception as e:
+            print(f"Could not convert string timestamps on {collection_name}: {str(e)}")
+
+@app.on_event("startup")
+async def backfill_hackathon_counters():
+    # Runs in the background so a large recount never delays startup
+    async def run():
+        try:
+            result = await reconcile_hackathon_counters()
+            print(f"Hackathon counters reconciled: {result['corrected']} corrected")
+            result = await reconcile_participation_counts()
+            print(f"Participation counters reconciled: {result['corrected']} corrected")
+            result = await reconcile_referral_stats()
+            print(f"Referral counters reconciled: {result['corrected']} corrected")
+        except Exception as e:
+            print(f"Could not reconcile hackathon counters: {str(e)}")
+    asyncio.create_task(run())
+
+@app.on_event("startup")
+async def backfill_structured_data():
+    async def run():
+        try:
+            generated = await backfill_hackathon_structured_data()
+            if generated:
+                print(f"Structured data generated for {generated} hackathons")
+                await mark_sitemap_stale()
+        except Exception as e:
+            print(f"Could not backfill structured data: {str(e)}")
+    asyncio.create_task(run())
+
+@app.on_event("startup")
+async def start_upload_gc():
+    async def run():
+        while True:
+            await asyncio.sleep(BLOB_GC_INTERVAL_SECONDS)
+            try:
+                result = await collect_upload_garbage()
+                if result["corrected"] or result["collected"]:
+                    print(f"Upload GC: {result['corrected']} refcounts corrected, {result['collected']} blobs deleted")
+            except Exception as e:
+                print(f"Upload GC failed: {str(e)}")
+    asyncio.create_task(run())
+
+@app.on_event("startup")
+async def seed_daily_stats():
+    async def run():
+        try:
+            # Registration rollups, growth and UTM analytics all bucket on registered_at
+            migrated = await backfill_registered_at()
+            if migrated:
+                print(f"registered_at set on {migrated} imported registrations")
+            # First deploy with rollups, or history that only just got dates: build daily_stats from it
+            newly_dated = any(converted_timestamps.get(name) for name, _ in DAILY_STAT_SOURCES.values())
+            if migrated or newly_dated or not await db.daily_stats.find_one({}, {"_id": 1}):
+                result = await backfill_daily_stats()
+                print(f"Daily stats backfilled: {result}")
+        except Exception as e:
+            print(f"Could not backfill daily stats: {str(e)}")
+    asyncio.create_task(run())
+
+@app.on_event("startup")
+async def seed_activity_sketches_if_empty():
+    if await db.activity_sketches.find_one({}, {"_id": 1}):
+        return
+    try:
+        days = await seed_activity_sketches()
+        print(f"Activity sketches seeded for {days} days")
+    except Exception as e:
+        print(f"Could not seed activity sketches: {str(e)}")
+
+@app.on_event("startup")
+async def warm_google_jwks():
+    if not os.environ.get('GOOGLE_CLIENT_ID'):
+        return
+    try:
+        await google_jwks.refresh()
+    except Exception as e:
+        print(f"Could not prefetch Google JWKS: {str(e)}")
+
+@app.on_event("startup")
+async def start_mailer():
+    mailer.start()
+
+@app.on_event("shutdown")
+async def stop_mailer():
+    await mailer.stop()
+
+@app.on_event("shutdown")
+async def stop_image_workers():
+    image_executor.shutdown(wait=False)
+
+@app.on_event("shutdown")
+async def close_http_client():
+    await http_client.aclose()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
     client.close()
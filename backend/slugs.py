@@ -0,0 +1,86 @@
+"""
+Slug allocation shared by server.py and the maintenance scripts.
+
+Uniqueness is enforced by unique indexes, not by loading existing slugs into
+memory. The next free suffix is found with one anchored prefix query, and a
+concurrent writer taking the same slug just triggers a retry.
+"""
+import re
+import secrets
+from typing import Awaitable, Callable
+
+from pymongo.errors import DuplicateKeyError, OperationFailure
+
+
+def slugify(text: str, fallback: str = "item") -> str:
+    """Convert text to a URL-friendly slug"""
+    # Convert to lowercase and replace spaces with hyphens
+    slug = (text or "").lower().strip()
+    # Remove special characters, keep only alphanumeric and hyphens
+    slug = re.sub(r'[^a-z0-9\s-]', '', slug)
+    slug = re.sub(r'\s+', '-', slug)
+    slug = re.sub(r'-+', '-', slug)
+    slug = slug.strip('-')
+    return slug or fallback
+
+
+async def next_free_slug(collection, field: str, base: str) -> str:
+    """Return `base`, or `base-N` with the smallest free N, using one index-backed query"""
+    # An anchored, case-sensitive regex is answered as a range scan on the index
+    pattern = f"^{re.escape(base)}(-[0-9]+)?$"
+    taken_suffixes = set()
+    async for doc in collection.find({field: {"$regex": pattern}}, {field: 1, "_id": 0}):
+        suffix = doc[field][len(base):]
+        taken_suffixes.add(int(suffix[1:]) if suffix else 0)
+
+    if 0 not in taken_suffixes:
+        return base
+    counter = 1
+    while counter in taken_suffixes:
+        counter += 1
+    return f"{base}-{counter}"
+
+
+async def allocate_unique_slug(
+    collection,
+    field: str,
+    base: str,
+    write: Callable[[str], Awaitable[object]],
+    max_attempts: int = 5
+) -> str:
+    """Pick the next free slug and persist it with `write`, retrying on unique index conflicts"""
+    for _ in range(max_attempts):
+        slug = await next_free_slug(collection, field, base)
+        try:
+            await write(slug)
+            return slug
+        except DuplicateKeyError as e:
+            # Only a clash on the slug itself is worth retrying
+            if field not in (e.details or {}).get("keyPattern", {}):
+                raise
+
+    # Heavy contention on one base: fall back to a random suffix
+    slug = f"{base}-{secrets.token_hex(3)}"
+    await write(slug)
+    return slug
+
+
+async def ensure_slug_indexes(db) -> bool:
+    """Create the unique slug indexes; returns False if existing duplicates block them"""
+    try:
+        await db.hackathons.create_index(
+            "slug",
+            unique=True,
+            partialFilterExpression={"slug": {"$type": "string"}},
+            name="slug_unique"
+        )
+        await db.users.create_index(
+            "profile_slug",
+            unique=True,
+            partialFilterExpression={"profile_slug": {"$type": "string"}},
+            name="profile_slug_unique"
+        )
+    except (DuplicateKeyError, OperationFailure) as e:
+        print(f"⚠️ Could not create unique slug indexes ({e}); run fix_hackathon_slugs.py")
+        return False
+    return True
@@ -0,0 +1,280 @@
+"""
+Serving files from the local uploads directory.
+
+Starlette's StaticFiles always sends the whole file, with an ETag derived
+from the mtime and no cache policy. CachedStaticFiles adds, per response:
+
+- Cache-Control: immutable for content-addressed paths, a short max-age
+  with revalidation for everything else
+- strong ETags (from the file name for content-addressed paths) and 304s for
+  If-None-Match / If-Modified-Since
+- single byte ranges (206 / 416, honouring If-Range)
+- precompressed .br / .gz siblings of compressible files, picked from
+  Accept-Encoding (write_precompressed() creates them when a file is stored)
+- zero-copy transfer through the ASGI zerocopysend / pathsend extensions when
+  the server offers them, large chunked reads in a worker thread otherwise
+"""
+import asyncio
+import gzip
+import mimetypes
+import os
+from email.utils import formatdate, parsedate
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# Types worth compressing; images other than SVG are already compressed
+COMPRESSIBLE_TYPES = {
+    "image/svg+xml", "application/json", "application/xml", "text/xml",
+    "text/plain", "text/csv", "text/css", "text/html", "text/javascript", "application/javascript"
+}
+# (Content-Encoding, file suffix) in order of preference
+PRECOMPRESSED_ENCODINGS = [("br", ".br"), ("gzip", ".gz")]
+# A precompressed copy is only kept if it saves at least this fraction
+MIN_COMPRESSION_SAVING = 0.1
+DEFAULT_CACHE_CONTROL = "public, max-age=3600, must-revalidate"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def _compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=11)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def write_precompressed(path: Path, content_type: Optional[str]) -> List[Path]:
+    """Write .br / .gz siblings of a compressible file (blocking); returns the files written
+
+    Siblings left over from an earlier file under the same name are removed.
+    """
+    compressible = (content_type or "").split(";")[0].strip().lower() in COMPRESSIBLE_TYPES
+    data = path.read_bytes() if compressible else b""
+    written = []
+    for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+        sibling = path.with_name(path.name + suffix)
+        compressed = _compress(data, encoding) if compressible and (encoding != "br" or BROTLI_AVAILABLE) else None
+        if compressed is None or len(compressed) > len(data) * (1 - MIN_COMPRESSION_SAVING):
+            sibling.unlink(missing_ok=True)
+            continue
+        partial = sibling.with_name(sibling.name + ".partial")
+        partial.write_bytes(compressed)
+        os.replace(partial, sibling)
+        written.append(sibling)
+    return written
+
+
+def precompressed_siblings(path: Path) -> List[Path]:
+    return [path.with_name(path.name + suffix) for _, suffix in PRECOMPRESSED_ENCODINGS]
+
+
+def _accepted_encodings(accept_encoding: str) -> set:
+    """Codings the client accepts (q > 0), from an Accept-Encoding header"""
+    accepted = set()
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding and q > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_byte_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """(first, last) byte of a single "bytes=" range, or None to send the whole file
+
+    Multiple ranges are answered with the whole file, which RFC 9110 allows.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, dash, last = spec.strip().partition("-")
+    if not dash:
+        return None
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+            if start > end and start < size:
+                # Invalid, so ignored (an unsatisfiable start is reported below)
+                return None
+        else:
+            # Suffix range: the last N bytes
+            length = int(last)
+            if length == 0:
+                raise RangeNotSatisfiable()
+            start, end = max(size - length, 0), size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable()
+    return start, min(end, size - 1)
+
+
+class StaticFileResponse(Response):
+    """A file with conditional, range and content-encoding handling; all file I/O off the event loop"""
+
+    chunk_size = 256 * 1024
+
+    def __init__(self, path: str, stat_result: os.stat_result, etag: str, cache_control: str,
+                 media_type: Optional[str] = None):
+        self.path = path
+        self.stat_result = stat_result
+        self.etag = etag
+        self.status_code = 200
+        self.media_type = media_type or "application/octet-stream"
+        self.compressible = self.media_type in COMPRESSIBLE_TYPES
+        self.background = None
+        self.init_headers({"cache-control": cache_control})
+
+    def _select_representation(self, accept_encoding: str) -> Tuple[str, os.stat_result, Optional[str]]:
+        """The file to send: a fresh precompressed sibling the client accepts, else the original"""
+        if self.compressible:
+            accepted = _accepted_encodings(accept_encoding)
+            for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+                if encoding not in accepted and "*" not in accepted:
+                    continue
+                try:
+                    stat_result = os.stat(self.path + suffix)
+                except OSError:
+                    continue
+                if stat_result.st_mtime >= self.stat_result.st_mtime:
+                    return self.path + suffix, stat_result, encoding
+        return self.path, self.stat_result, None
+
+    def _not_modified(self, request_headers: Headers, etag: str) -> bool:
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match is not None:
+            # Weak comparison, as RFC 9110 requires for If-None-Match
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            return "*" in tags or etag in tags
+        if_modified_since = parsedate(request_headers.get("if-modified-since", ""))
+        return if_modified_since is not None and parsedate(self.headers["last-modified"]) <= if_modified_since
+
+    def _range_applies(self, request_headers: Headers, etag: str) -> bool:
+        if_range = request_headers.get("if-range")
+        # Strong comparison only: a weak validator never satisfies If-Range
+        return if_range is None or if_range == etag or if_range == self.headers["last-modified"]
+
+    async def _send_body(self, scope, send, path: str, start: int, length: int, whole: bool):
+        extensions = scope.get("extensions") or {}
+        if "http.response.zerocopysend" in extensions:
+            file = await asyncio.to_thread(open, path, "rb")
+            try:
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": file, "offset": start, "count": length, "more_body": False
+                })
+            finally:
+                await asyncio.to_thread(file.close)
+        elif whole and "http.response.pathsend" in extensions:
+            await send({"type": "http.response.pathsend", "path": path})
+        else:
+            file = await asyncio.to_thread(open, path, "rb")
+            try:
+                await asyncio.to_thread(file.seek, start)
+                remaining = length
+                while remaining > 0:
+                    chunk = await asyncio.to_thread(file.read, min(self.chunk_size, remaining))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+                if remaining > 0:
+                    # The file shrank under us; end the response instead of hanging
+                    await send({"type": "http.response.body", "body": b"", "more_body": False})
+            finally:
+                await asyncio.to_thread(file.close)
+
+    async def __call__(self, scope, receive, send):
+        request_headers = Headers(scope=scope)
+        path, stat_result, encoding = await asyncio.to_thread(
+            self._select_representation, request_headers.get("accept-encoding", "")
+        )
+        # Each encoding is a different representation, so it needs its own strong ETag
+        etag = f'{self.etag[:-1]}-{encoding}"' if encoding else self.etag
+        self.headers["content-type"] = self.media_type
+        self.headers["etag"] = etag
+        self.headers["last-modified"] = formatdate(self.stat_result.st_mtime, usegmt=True)
+        if self.compressible:
+            self.headers["vary"] = "Accept-Encoding"
+
+        if self._not_modified(request_headers, etag):
+            del self.headers["content-type"]
+            await send({"type": "http.response.start", "status": 304, "headers": self.raw_headers})
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        if encoding:
+            self.headers["content-encoding"] = encoding
+        self.headers["accept-ranges"] = "bytes"
+        size = stat_result.st_size
+        start, end, status = 0, size - 1, 200
+        range_header = request_headers.get("range")
+        if range_header and self._range_applies(request_headers, etag):
+            try:
+                byte_range = parse_byte_range(range_header, size)
+            except RangeNotSatisfiable:
+                self.headers["content-range"] = f"bytes */{size}"
+                self.headers["content-length"] = "0"
+                await send({"type": "http.response.start", "status": 416, "headers": self.raw_headers})
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+                return
+            if byte_range:
+                start, end = byte_range
+                status = 206
+                self.headers["content-range"] = f"bytes {start}-{end}/{size}"
+
+        length = end - start + 1
+        self.headers["content-length"] = str(length)
+        await send({"type": "http.response.start", "status": status, "headers": self.raw_headers})
+        if scope["method"] == "HEAD" or length <= 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        else:
+            await self._send_body(scope, send, path, start, length, whole=status == 200)
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles with cache headers, ranges and precompressed variants
+
+    Paths under immutable_prefixes must be content-addressed: their names change
+    whenever their bytes do, so the name doubles as the ETag.
+    """
+
+    def __init__(self, *args, immutable_prefixes: Tuple[str, ...] = (),
+                 cache_control: str = DEFAULT_CACHE_CONTROL, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.immutable_prefixes = immutable_prefixes
+        self.cache_control = cache_control
+
+    def file_response(self, full_path, stat_result, scope, status_code=200) -> Response:
+        full_path = str(full_path)
+        relative = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+        if relative.startswith(self.immutable_prefixes):
+            etag = f'"{Path(full_path).stem}"'
+            cache_control = IMMUTABLE_CACHE_CONTROL
+        else:
+            etag = f'"{stat_result.st_ino:x}-{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"'
+            cache_control = self.cache_control
+        return StaticFileResponse(
+            full_path, stat_result, etag, cache_control,
+            media_type=mimetypes.guess_type(full_path)[0]
+        )
@@ -0,0 +1,281 @@
+"""
+Where uploaded and generated files live.
+
+Code addresses files by key ("blobs/ab/<sha256>.png", "certificates/<id>.png")
+and documents store /api/uploads/<key> URLs, which stay valid whichever backend
+holds the bytes:
+
+- LocalStorage keeps files in a directory that the app serves itself (see
+  static_files.py), with precompressed copies of compressible files.
+- S3Storage keeps them in an S3-compatible bucket (AWS S3, MinIO, R2, ...) and
+  /api/uploads/<key> redirects to a presigned URL, or to S3_PUBLIC_URL when the
+  bucket sits behind a public CDN.
+
+STORAGE_BACKEND=local|s3 picks the driver (see storage_from_env).
+"""
+import abc
+import asyncio
+import os
+import re
+import shutil
+import tempfile
+from pathlib import Path, PurePosixPath
+from typing import Optional
+from urllib.parse import urlsplit
+
+from static_files import precompressed_siblings, write_precompressed
+
+try:
+    import boto3
+    from botocore.config import Config as BotoConfig
+    from botocore.exceptions import ClientError
+    S3_AVAILABLE = True
+except ImportError:
+    S3_AVAILABLE = False
+
+UPLOADS_URL_PREFIX = "/api/uploads/"
+# Matches upload URLs stored either relative or with an http(s) origin in front
+UPLOADS_URL_PATTERN = r"^(https?://[^/]+)?" + re.escape(UPLOADS_URL_PREFIX)
+
+
+class StorageBackend(abc.ABC):
+    """Interface shared by the drivers; every method is safe to await from the event loop"""
+
+    serves_locally = False
+    # Local directory for spooling uploads before put_file()
+    spool_dir: Path
+    # How long a client may cache the redirect from /api/uploads/<key>
+    url_max_age = 3600
+
+    def url_for(self, key: str) -> str:
+        return f"{UPLOADS_URL_PREFIX}{key}"
+
+    def key_for_url(self, url: Optional[str]) -> Optional[str]:
+        """The key behind an /api/uploads URL, or None for external URLs and unsafe paths
+
+        Absolute URLs (the frontend prefixes its backend origin) are matched on their path.
+        """
+        if not url:
+            return None
+        parts = urlsplit(url)
+        path = parts.path if parts.scheme in ("http", "https") else url
+        if not path.startswith(UPLOADS_URL_PREFIX):
+            return None
+        key = path[len(UPLOADS_URL_PREFIX):]
+        return key if is_public_key(key) else None
+
+    @abc.abstractmethod
+    async def put_file(self, key: str, source: Path, content_type: Optional[str] = None,
+                       cache_control: Optional[str] = None):
+        """Store a local file under key; the source file is consumed"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def put_bytes(self, key: str, data: bytes, content_type: Optional[str] = None,
+                        cache_control: Optional[str] = None):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def read_bytes(self, key: str) -> bytes:
+        """Raises FileNotFoundError if the key does not exist"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def delete(self, key: str):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def rename(self, key: str, new_key: str):
+        """Raises FileNotFoundError if the key does not exist"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def download_url(self, key: str) -> str:
+        raise NotImplementedError
+
+
+def is_public_key(key: str) -> bool:
+    """Keys must be relative, without traversal, and outside dot-directories (.trash, .incoming)"""
+    parts = PurePosixPath(key).parts
+    return bool(parts) and not key.startswith("/") and not any(part.startswith(".") for part in parts)
+
+
+class LocalStorage(StorageBackend):
+    """Files in a local directory, served at /api/uploads by CachedStaticFiles"""
+
+    serves_locally = True
+
+    def __init__(self, root: Path):
+        self.root = root
+        # Same filesystem as the files, so storing a spooled upload is a rename
+        self.spool_dir = root / ".incoming"
+
+    def _path(self, key: str) -> Path:
+        return self.root / key
+
+    def _put_file(self, key: str, source: Path, content_type: Optional[str]):
+        destination = self._path(key)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        source.chmod(0o644)  # mkstemp creates files readable by the owner only
+        try:
+            os.replace(source, destination)
+        except OSError:
+            # Source on another filesystem
+            shutil.move(str(source), destination)
+        write_precompressed(destination, content_type)
+
+    def _put_bytes(self, key: str, data: bytes, content_type: Optional[str]):
+        destination = self._path(key)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        partial = destination.with_name(destination.name + ".partial")
+        partial.write_bytes(data)
+        os.replace(partial, destination)
+        write_precompressed(destination, content_type)
+
+    def _rename(self, key: str, new_key: str):
+        source, destination = self._path(key), self._path(new_key)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(source, destination)
+        # Precompressed copies travel with the file
+        for sibling, new_sibling in zip(precompressed_siblings(source), precompressed_siblings(destination)):
+            if sibling.exists():
+                os.replace(sibling, new_sibling)
+
+    def _delete(self, key: str):
+        path = self._path(key)
+        for file in [path, *precompressed_siblings(path)]:
+            file.unlink(missing_ok=True)
+
+    async def put_file(self, key, source, content_type=None, cache_control=None):
+        await asyncio.to_thread(self._put_file, key, source, content_type)
+
+    async def put_bytes(self, key, data, content_type=None, cache_control=None):
+        await asyncio.to_thread(self._put_bytes, key, data, content_type)
+
+    async def read_bytes(self, key):
+        return await asyncio.to_thread(self._path(key).read_bytes)
+
+    async def exists(self, key):
+        return await asyncio.to_thread(self._path(key).is_file)
+
+    async def delete(self, key):
+        await asyncio.to_thread(self._delete, key)
+
+    async def rename(self, key, new_key):
+        await asyncio.to_thread(self._rename, key, new_key)
+
+    async def download_url(self, key):
+        return self.url_for(key)
+
+
+class S3Storage(StorageBackend):
+    """Files in an S3-compatible bucket; boto3 calls run in worker threads (clients are thread-safe)"""
+
+    def __init__(self, bucket: str, endpoint_url: Optional[str] = None, region: Optional[str] = None,
+                 public_url: Optional[str] = None, presign_expiry: int = 3600):
+        if not S3_AVAILABLE:
+            raise RuntimeError("STORAGE_BACKEND=s3 needs boto3 installed")
+        self.bucket = bucket
+        self.public_url = public_url.rstrip("/") if public_url else None
+        self.presign_expiry = presign_expiry
+        self.url_max_age = 3600 if self.public_url else presign_expiry // 2
+        self.spool_dir = Path(tempfile.gettempdir()) / "upload-spool"
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            region_name=region,
+            # MinIO and most S3-compatible servers want path-style addressing
+            config=BotoConfig(signature_version="s3v4", s3={"addressing_style": "path" if endpoint_url else "auto"})
+        )
+
+    @staticmethod
+    def _missing(error: "ClientError") -> bool:
+        return error.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound")
+
+    @staticmethod
+    def _extra_args(content_type: Optional[str], cache_control: Optional[str]) -> dict:
+        extra = {}
+        if content_type:
+            extra["ContentType"] = content_type
+        if cache_control:
+            extra["CacheControl"] = cache_control
+        return extra
+
+    def _put_file(self, key, source, content_type, cache_control):
+        try:
+            self.client.upload_file(str(source), self.bucket, key, ExtraArgs=self._extra_args(content_type, cache_control))
+        finally:
+            source.unlink(missing_ok=True)
+
+    def _read_bytes(self, key):
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=key)["Body"].read()
+        except ClientError as e:
+            if self._missing(e):
+                raise FileNotFoundError(key)
+            raise
+
+    def _exists(self, key):
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+            return True
+        except ClientError as e:
+            if self._missing(e):
+                return False
+            raise
+
+    def _rename(self, key, new_key):
+        try:
+            self.client.copy_object(Bucket=self.bucket, Key=new_key, CopySource={"Bucket": self.bucket, "Key": key})
+        except ClientError as e:
+            if self._missing(e):
+                raise FileNotFoundError(key)
+            raise
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    async def put_file(self, key, source, content_type=None, cache_control=None):
+        await asyncio.to_thread(self._put_file, key, source, content_type, cache_control)
+
+    async def put_bytes(self, key, data, content_type=None, cache_control=None):
+        await asyncio.to_thread(
+            self.client.put_object, Bucket=self.bucket, Key=key, Body=data,
+            **self._extra_args(content_type, cache_control)
+        )
+
+    async def read_bytes(self, key):
+        return await asyncio.to_thread(self._read_bytes, key)
+
+    async def exists(self, key):
+        return await asyncio.to_thread(self._exists, key)
+
+    async def delete(self, key):
+        await asyncio.to_thread(self.client.delete_object, Bucket=self.bucket, Key=key)
+
+    async def rename(self, key, new_key):
+        await asyncio.to_thread(self._rename, key, new_key)
+
+    async def download_url(self, key):
+        if self.public_url:
+            return f"{self.public_url}/{key}"
+        # Signing is local computation, no request is made
+        return self.client.generate_presigned_url(
+            "get_object", Params={"Bucket": self.bucket, "Key": key}, ExpiresIn=self.presign_expiry
+        )
+
+
+def storage_from_env(local_root: Path) -> StorageBackend:
+    """Build the configured backend: STORAGE_BACKEND=local (default) or s3 with S3_* settings"""
+    if os.environ.get("STORAGE_BACKEND", "local") == "s3":
+        # Credentials come from the usual AWS_ACCESS_KEY_ID / AWS_SECRET_ACCESS_KEY / IAM role chain
+        return S3Storage(
+            bucket=os.environ["S3_BUCKET"],
+            endpoint_url=os.environ.get("S3_ENDPOINT_URL"),  # e.g. http://minio:9000
+            region=os.environ.get("S3_REGION"),
+            public_url=os.environ.get("S3_PUBLIC_URL"),
+            presign_expiry=int(os.environ.get("S3_PRESIGN_EXPIRY", "3600"))
+        )
+    return LocalStorage(local_root)
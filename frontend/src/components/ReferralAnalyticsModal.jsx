@@ -147,9 +147,9 @@ export default function ReferralAnalyticsModal({ hackathon, onClose }) {
                               {ref.user_name} • {formatDate(ref.registered_at)}
                             </Badge>
                           ))}
-                          {referrer.recent_referrals.length > 3 && (
+                          {referrer.count > 3 && (
                             <Badge variant="outline" className="text-xs">
-                              +{referrer.recent_referrals.length - 3} more
+                              +{referrer.count - 3} more
                             </Badge>
                           )}
                         </div>
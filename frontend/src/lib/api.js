@@ -63,6 +63,8 @@ export const userAPI = {
 // Hackathon APIs
 export const hackathonAPI = {
   getAll: (params) => api.get('/hackathons', { params }),
+  getListing: (params) => api.get('/hackathons/listing', { params }),
+  search: (params) => api.get('/hackathons/search', { params }),
   getById: (id) => api.get(`/hackathons/${id}`),
   getBySlug: (slug) => api.get(`/hackathons/slug/${slug}`),
   create: (data) => api.post('/hackathons', data),
@@ -153,6 +155,7 @@ export const adminAPI = {
   getGrowthStats: (days = 30) => api.get('/admin/stats/growth', { params: { days } }),
   getRetentionStats: () => api.get('/admin/stats/retention'),
   getAllUsers: () => api.get('/admin/users'),
+  getUsersPage: (params) => api.get('/admin/users/listing', { params }),
   getAllHackathons: (status) => api.get('/admin/hackathons', { params: { status } }),
   approveHackathon: (hackathonId) => api.put(`/admin/hackathons/${hackathonId}/approve`),
   rejectHackathon: (hackathonId, reason) => api.put(`/admin/hackathons/${hackathonId}/reject`, null, { params: { reason } }),
@@ -161,8 +164,8 @@ export const adminAPI = {
   updateUserRole: (userId, role) => api.put(`/admin/users/${userId}/role`, null, { params: { new_role: role } }),
   deleteUser: (userId) => api.delete(`/admin/users/${userId}`),
   getUTMAnalytics: (days = 30) => api.get('/admin/analytics/utm', { params: { days } }),
-  exportUsers: () => api.get('/admin/export/users', { responseType: 'blob' }),
-  exportHackathons: () => api.get('/admin/export/hackathons', { responseType: 'blob' }),
+  exportUsers: (params) => api.get('/admin/export/users', { params, responseType: 'blob' }),
+  exportHackathons: (params) => api.get('/admin/export/hackathons', { params, responseType: 'blob' }),
 };
 
 
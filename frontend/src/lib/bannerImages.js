@@ -1,3 +1,5 @@
+import { buildSrcSet } from '@/lib/utils';
+
 // Random cool banner images for hackathons
 const BANNER_IMAGES = [
   'https://images.unsplash.com/photo-1517694712202-14dd9538aa97?w=1200&h=400&fit=crop', // Code on screen
@@ -34,3 +36,17 @@ export const getRandomBanner = (hackathonId) => {
 export const getHackathonBanner = (hackathon) => {
   return hackathon.cover_image || getRandomBanner(hackathon.id);
 };
+
+/**
+ * Responsive WebP renditions of an uploaded cover image (undefined for
+ * external or random banners, which fall back to src). Variant URLs are
+ * backend-relative, like profile photos.
+ */
+export const getHackathonBannerSrcSet = (hackathon) => {
+  return hackathon.cover_image
+    ? buildSrcSet(hackathon.cover_image_variants, process.env.REACT_APP_BACKEND_URL)
+    : undefined;
+};
+
+// Listing grids are 1 / 2 / 3 columns wide
+export const BANNER_CARD_SIZES = '(min-width: 1024px) 33vw, (min-width: 768px) 50vw, 100vw';
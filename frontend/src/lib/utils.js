@@ -4,3 +4,11 @@ import { twMerge } from "tailwind-merge"
 export function cn(...inputs) {
   return twMerge(clsx(inputs));
 }
+
+/**
+ * Build an <img srcSet> value from server-generated image variants ([{width, url}])
+ */
+export function buildSrcSet(variants, prefix = "") {
+  if (!variants || variants.length === 0) return undefined;
+  return variants.map((variant) => `${prefix}${variant.url} ${variant.width}w`).join(", ");
+}
@@ -18,6 +18,8 @@ import {
   PieChart, Pie, Cell
 } from 'recharts';
 
+const USERS_PAGE_SIZE = 50;
+
 export default function AdminDashboard() {
   const navigate = useNavigate();
   const [stats, setStats] = useState(null);
@@ -25,6 +27,10 @@ export default function AdminDashboard() {
   const [retentionData, setRetentionData] = useState(null);
   const [hackathons, setHackathons] = useState([]);
   const [users, setUsers] = useState([]);
+  const [usersCursor, setUsersCursor] = useState(null);
+  const [userSearch, setUserSearch] = useState('');
+  const [userRoleFilter, setUserRoleFilter] = useState('');
+  const [loadingUsers, setLoadingUsers] = useState(false);
   const [utmData, setUtmData] = useState(null);
   const [loading, setLoading] = useState(true);
   const [selectedPeriod, setSelectedPeriod] = useState(30);
@@ -34,18 +40,16 @@ export default function AdminDashboard() {
     setLoading(true);
     try {
       // Use Promise.allSettled to handle individual failures gracefully
-      const [statsRes, growthRes, retentionRes, hackathonsRes, usersRes] = await Promise.allSettled([
+      const [statsRes, growthRes, retentionRes, hackathonsRes] = await Promise.allSettled([
         adminAPI.getStatsOverview(selectedPeriod === 0 ? 0 : selectedPeriod),
         adminAPI.getGrowthStats(selectedPeriod === 0 ? 365 : selectedPeriod),
         adminAPI.getRetentionStats(),
-        adminAPI.getAllHackathons(),
-        adminAPI.getAllUsers()
+        adminAPI.getAllHackathons()
       ]);
 
       // Set data with fallbacks for failed requests
       setStats(statsRes.status === 'fulfilled' ? statsRes.value.data : null);
       setGrowthData(growthRes.status === 'fulfilled' ? growthRes.value.data : null);
-      setUsers(usersRes.status === 'fulfilled' ? (usersRes.value.data || []) : []);
       setRetentionData(retentionRes.status === 'fulfilled' ? retentionRes.value.data : null);
       setHackathons(hackathonsRes.status === 'fulfilled' ? hackathonsRes.value.data : []);
       
@@ -54,8 +58,7 @@ export default function AdminDashboard() {
         { name: 'Stats Overview', result: statsRes },
         { name: 'Growth Stats', result: growthRes },
         { name: 'Retention Stats', result: retentionRes },
-        { name: 'Hackathons', result: hackathonsRes },
-        { name: 'Users', result: usersRes }
+        { name: 'Hackathons', result: hackathonsRes }
       ];
       
       const failedRequests = allRequests.filter(req => req.result.status === 'rejected');
@@ -67,7 +70,7 @@ export default function AdminDashboard() {
         
         // Only show toast if critical data failed (not just growth/retention)
         const criticalFailed = failedRequests.some(req => 
-          req.name === 'Stats Overview' || req.name === 'Hackathons' || req.name === 'Users'
+          req.name === 'Stats Overview' || req.name === 'Hackathons'
         );
         
         if (criticalFailed) {
@@ -88,6 +91,32 @@ export default function AdminDashboard() {
     fetchData();
   }, [fetchData]);
 
+  // Users are paged and searched server-side; cursor = null starts a new list
+  const fetchUsers = useCallback(async (cursor = null) => {
+    setLoadingUsers(true);
+    try {
+      const params = { limit: USERS_PAGE_SIZE };
+      if (userSearch.trim()) params.q = userSearch.trim();
+      if (userRoleFilter) params.role = userRoleFilter;
+      if (cursor) params.cursor = cursor;
+
+      const response = await adminAPI.getUsersPage(params);
+      const { items, next_cursor } = response.data;
+      setUsers(prev => (cursor ? [...prev, ...items] : items));
+      setUsersCursor(next_cursor);
+    } catch (error) {
+      console.error('Failed to load users:', error);
+      toast.error('Failed to load users');
+    } finally {
+      setLoadingUsers(false);
+    }
+  }, [userSearch, userRoleFilter]);
+
+  useEffect(() => {
+    const timer = setTimeout(() => fetchUsers(), 300);
+    return () => clearTimeout(timer);
+  }, [fetchUsers]);
+
   const handleApproveHackathon = async (hackathonId) => {
     try {
       await adminAPI.approveHackathon(hackathonId);
@@ -148,6 +177,7 @@ export default function AdminDashboard() {
     try {
       await adminAPI.updateUserRole(userId, newRole);
       toast.success(`Role updated to ${newRole} successfully`);
+      setUsers(prev => prev.map(u => (u.id === userId ? { ...u, role: newRole } : u)));
       fetchData();
     } catch (error) {
       toast.error(error.response?.data?.detail || 'Failed to update role');
@@ -195,6 +225,7 @@ export default function AdminDashboard() {
     try {
       await adminAPI.deleteUser(userId);
       toast.success(`User ${userName} deleted successfully`);
+      setUsers(prev => prev.filter(u => u.id !== userId));
       fetchData(); // Refresh data
     } catch (error) {
       toast.error(error.response?.data?.detail || 'Failed to delete user');
@@ -839,10 +870,32 @@ export default function AdminDashboard() {
                   <span className="gradient-text">User Management</span>
                 </h2>
                 <Badge className="bg-purple-600/20 text-purple-400 border-purple-600">
-                  {users.length} Total Users
+                  {stats?.total_users || 0} Total Users
                 </Badge>
               </div>
 
+              {/* Search & Role Filter */}
+              <div className="flex flex-col md:flex-row gap-3 mb-6">
+                <input
+                  type="text"
+                  value={userSearch}
+                  onChange={(e) => setUserSearch(e.target.value)}
+                  placeholder="Search by name or email prefix..."
+                  className="flex-1 bg-gray-800 border border-gray-700 text-white px-4 py-2 rounded-lg text-sm focus:border-purple-600 focus:outline-none"
+                />
+                <select
+                  value={userRoleFilter}
+                  onChange={(e) => setUserRoleFilter(e.target.value)}
+                  className="bg-gray-800 border border-gray-700 text-white px-3 py-2 rounded-lg text-sm focus:border-purple-600 focus:outline-none"
+                >
+                  <option value="">All Roles</option>
+                  <option value="participant">Participant</option>
+                  <option value="organizer">Organizer</option>
+                  <option value="judge">Judge</option>
+                  <option value="admin">Admin</option>
+                </select>
+              </div>
+
               {/* Users List */}
               <div className="space-y-4">
                 {users.map((user) => (
@@ -918,7 +971,20 @@ export default function AdminDashboard() {
                 ))}
               </div>
 
-              {users.length === 0 && (
+              {usersCursor && (
+                <div className="text-center mt-6">
+                  <Button
+                    variant="outline"
+                    onClick={() => fetchUsers(usersCursor)}
+                    disabled={loadingUsers}
+                    className="border-purple-600 text-purple-400 hover:bg-purple-600/20"
+                  >
+                    {loadingUsers ? 'Loading...' : 'Load More'}
+                  </Button>
+                </div>
+              )}
+
+              {users.length === 0 && !loadingUsers && (
                 <div className="text-center py-12 text-gray-400">
                   <Users className="w-16 h-16 mx-auto mb-4 opacity-50" />
                   <p>No users found</p>
@@ -8,7 +8,7 @@ import { toast } from 'sonner';
 import { hackathonAPI, registrationAPI, teamAPI, authAPI, notificationAPI, referralAPI } from '@/lib/api';
 import ReferralModal from '@/components/ReferralModal';
 import { isAuthenticated, getUser, clearAuth } from '@/lib/auth';
-import { getHackathonBanner } from '@/lib/bannerImages';
+import { getHackathonBanner, getHackathonBannerSrcSet, BANNER_CARD_SIZES } from '@/lib/bannerImages';
 
 export default function Dashboard() {
   const navigate = useNavigate();
@@ -496,6 +496,9 @@ export default function Dashboard() {
                     <div className="h-40 bg-gradient-to-br from-purple-600/30 to-purple-900/30 flex items-center justify-center relative overflow-hidden">
                       <img 
                         src={getHackathonBanner(hackathon)} 
+                        srcSet={getHackathonBannerSrcSet(hackathon)}
+                        sizes={BANNER_CARD_SIZES}
+                        loading="lazy"
                         alt={hackathon.title} 
                         className="w-full h-full object-cover group-hover:scale-110 transition-transform duration-500" 
                         onError={(e) => e.target.style.display = 'none'}
@@ -581,6 +584,9 @@ export default function Dashboard() {
                   <div className="h-48 bg-gradient-to-br from-purple-600/30 to-purple-900/30 flex items-center justify-center relative overflow-hidden">
                     <img 
                       src={getHackathonBanner(hackathon)} 
+                      srcSet={getHackathonBannerSrcSet(hackathon)}
+                      sizes={BANNER_CARD_SIZES}
+                      loading="lazy"
                       alt={hackathon.title} 
                       className="w-full h-full object-cover group-hover:scale-110 transition-transform duration-500" 
                       onError={(e) => e.target.style.display = 'none'}
@@ -9,6 +9,7 @@ import { toast } from 'sonner';
 import { hackathonAPI, authAPI } from '@/lib/api';
 import { isAuthenticated, setAuth } from '@/lib/auth';
 import AuthModal from '@/components/AuthModal';
+import { getHackathonBannerSrcSet, BANNER_CARD_SIZES } from '@/lib/bannerImages';
 
 export default function Landing() {
   const navigate = useNavigate();
@@ -215,7 +216,7 @@ export default function Landing() {
               {/* Cover Image */}
               <div className="h-48 bg-gradient-to-br from-purple-600/30 to-purple-900/30 flex items-center justify-center">
                 {hackathon.cover_image ? (
-                  <img src={hackathon.cover_image} alt={hackathon.title} className="w-full h-full object-cover" />
+                  <img src={hackathon.cover_image} srcSet={getHackathonBannerSrcSet(hackathon)} sizes={BANNER_CARD_SIZES} loading="lazy" alt={hackathon.title} className="w-full h-full object-cover" />
                 ) : (
                   <Code className="w-16 h-16 text-purple-500" />
                 )}
@@ -10,7 +10,7 @@ import { hackathonAPI, authAPI } from '@/lib/api';
 import { isAuthenticated, setAuth } from '@/lib/auth';
 import AuthModal from '@/components/AuthModal';
 import Footer from '@/components/Footer';
-import { getHackathonBanner } from '@/lib/bannerImages';
+import { getHackathonBanner, getHackathonBannerSrcSet, BANNER_CARD_SIZES } from '@/lib/bannerImages';
 import SEO from '@/components/SEO';
 
 export default function LandingEnhanced() {
@@ -366,6 +366,9 @@ export default function LandingEnhanced() {
               <div className="h-56 bg-gradient-to-br from-purple-600/40 to-pink-600/40 flex items-center justify-center relative overflow-hidden">
                 <img 
                   src={getHackathonBanner(hackathon)} 
+                  srcSet={getHackathonBannerSrcSet(hackathon)}
+                  sizes={BANNER_CARD_SIZES}
+                  loading="lazy"
                   alt={hackathon.title} 
                   className="w-full h-full object-cover group-hover:scale-110 transition-transform duration-500" 
                   onError={(e) => {
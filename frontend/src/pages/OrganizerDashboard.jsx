@@ -15,7 +15,7 @@ import ManageJudgesModal from '@/components/ManageJudgesModal';
 import ReferralAnalyticsModal from '@/components/ReferralAnalyticsModal';
 import ManageCertificatesModal from '@/components/ManageCertificatesModal';
 import axios from 'axios';
-import { getHackathonBanner } from '@/lib/bannerImages';
+import { getHackathonBanner, getHackathonBannerSrcSet, BANNER_CARD_SIZES } from '@/lib/bannerImages';
 
 const API_URL = process.env.REACT_APP_BACKEND_URL + '/api';
 
@@ -220,7 +220,7 @@ export default function OrganizerDashboard() {
             {myHackathons.map((hackathon) => (
               <Card key={hackathon.id} className="glass-effect hover-lift overflow-hidden" data-testid={`hackathon-card-${hackathon.id}`}>
                 <div className="h-32 bg-gradient-to-br from-purple-600/30 to-purple-900/30 flex items-center justify-center relative overflow-hidden">
-                  <img src={getHackathonBanner(hackathon)} alt={hackathon.title} className="w-full h-full object-cover" />
+                  <img src={getHackathonBanner(hackathon)} srcSet={getHackathonBannerSrcSet(hackathon)} sizes={BANNER_CARD_SIZES} loading="lazy" alt={hackathon.title} className="w-full h-full object-cover" />
                 </div>
 
                 <div className="p-4 sm:p-5 lg:p-6 space-y-3 sm:space-y-4">
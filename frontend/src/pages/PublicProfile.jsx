@@ -7,6 +7,7 @@ import { Badge } from '@/components/ui/badge';
 import { toast } from 'sonner';
 import axios from 'axios';
 import SEO from '@/components/SEO';
+import { buildSrcSet } from '@/lib/utils';
 
 const API_URL = process.env.REACT_APP_BACKEND_URL + '/api';
 
@@ -90,6 +91,8 @@ export default function PublicProfile() {
               {profile.profile_photo ? (
                 <img 
                   src={`${process.env.REACT_APP_BACKEND_URL}${profile.profile_photo}`} 
+                  srcSet={buildSrcSet(profile.profile_photo_variants, process.env.REACT_APP_BACKEND_URL)}
+                  sizes="128px"
                   alt={profile.name}
                   className="w-full h-full object-cover"
                 />
@@ -8,6 +8,7 @@ import {
 import { Button } from '@/components/ui/button';
 import { Card } from '@/components/ui/card';
 import axios from 'axios';
+import { buildSrcSet } from '@/lib/utils';
 
 const API_URL = process.env.REACT_APP_BACKEND_URL + '/api';
 
@@ -189,6 +190,8 @@ export default function PublicProfileCV() {
                     <div className="relative w-40 h-40 rounded-full overflow-hidden border-4 border-white shadow-2xl">
                       <img 
                         src={`${process.env.REACT_APP_BACKEND_URL}${profile.profile_photo}`}
+                        srcSet={buildSrcSet(profile.profile_photo_variants, process.env.REACT_APP_BACKEND_URL)}
+                        sizes="160px"
                         alt={profile.name}
                         className="w-full h-full object-cover"
                       />
@@ -91,6 +91,7 @@ async def import_registrations(csv_file_path='/app/registrations_actual.csv'):
                     "status": status if status in ["registered", "cancelled", "waitlisted"] else "registered",
                     "team_id": None,
                     "registration_date": registration_date,
+                    "registered_at": registration_date,
                     "created_at": registration_date,
                     "updated_at": datetime.utcnow()
                 }
@@ -0,0 +1,59 @@
+"""
+Shared fixtures: the backend app over an in-memory MongoDB (mongomock-motor)
+with uploads stored in a temporary directory.
+"""
+import os
+import secrets
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "hackov8_test")
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    """The server module with its database and upload storage swapped for test doubles"""
+    import server
+    from storage import LocalStorage
+
+    db = mongomock_motor.AsyncMongoMockClient()["test"]
+    storage = LocalStorage(tmp_path / "uploads")
+    monkeypatch.setattr(server, "db", db)
+    monkeypatch.setattr(server, "storage", storage)
+    monkeypatch.setattr(server.blob_store, "collection", db.blobs)
+    monkeypatch.setattr(server.blob_store, "storage", storage)
+    return server
+
+
+@pytest.fixture
+def make_user(server):
+    """Insert a user with a live session; returns (user id, auth headers)"""
+    async def make(role: str = "participant", **fields):
+        user_id = str(uuid.uuid4())
+        token = secrets.token_urlsafe(16)
+        await server.db.users.insert_one({
+            "_id": user_id,
+            "email": f"{user_id[:8]}@example.com",
+            "name": fields.pop("name", f"User {user_id[:4]}"),
+            "role": role,
+            "email_verified": True,
+            "referral_code": user_id[:8],
+            "created_at": datetime.now(timezone.utc),
+            **fields
+        })
+        await server.db.user_sessions.insert_one({
+            "user_id": user_id,
+            "session_token": token,
+            "expires_at": datetime.now(timezone.utc) + timedelta(days=1)
+        })
+        return user_id, {"Authorization": f"Bearer {token}"}
+    return make
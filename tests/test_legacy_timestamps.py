@@ -0,0 +1,109 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+
+def test_user_listing_pages_through_imported_users(server, make_user):
+    loop = asyncio.new_event_loop()
+    _, headers = loop.run_until_complete(make_user("admin"))
+    # What import_database.py loads from database_export/users.json
+    loop.run_until_complete(server.db.users.insert_many([
+        {"_id": f"imported-{i}", "email": f"imported{i}@example.com", "name": f"Imported {i}",
+         "role": "participant", "created_at": f"2025-10-{i % 28 + 1:02d}T08:31:12.781000"}
+        for i in range(30)
+    ]))
+
+    converted = loop.run_until_complete(server.migrate_legacy_timestamps("users", ["created_at"]))
+    assert converted == 30
+
+    client = TestClient(server.app)
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 7, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/api/admin/users/listing", headers=headers, params=params)
+        assert page.status_code == 200
+        seen += [u["id"] for u in page.json()["items"]]
+        cursor = page.json()["next_cursor"]
+        if not cursor:
+            break
+
+    assert len(seen) == len(set(seen)) == 31
+    loop.close()
+
+
+def test_hackathon_cursor_covers_imported_hackathons(server):
+    loop = asyncio.new_event_loop()
+    # Shaped like database_export/hackathons.json: every date is an ISO string
+    loop.run_until_complete(server.db.hackathons.insert_many([
+        {"_id": f"hack-{i}", "title": f"Hack {i}", "status": "published", "featured": i == 0,
+         "created_at": f"2025-10-{i + 1:02d}T12:25:10.152000", "event_start": "2025-11-01T09:00:00"}
+        for i in range(5)
+    ]))
+
+    converted = loop.run_until_complete(server.migrate_legacy_timestamps(
+        "hackathons", server.LEGACY_TIMESTAMP_FIELDS["hackathons"]
+    ))
+    assert converted == 5
+
+    sort = list(server.HACKATHON_LISTING_SORT.items())
+    seen, query = [], {}
+    while True:
+        page = loop.run_until_complete(server.db.hackathons.find(query).sort(sort).limit(2).to_list(2))
+        if not page:
+            break
+        seen += [h["_id"] for h in page]
+        query = server.hackathon_cursor_filter(server.encode_hackathon_cursor(page[-1]))
+
+    assert seen == ["hack-0", "hack-4", "hack-3", "hack-2", "hack-1"]
+    loop.close()
+
+
+def test_structured_data_lastmod_is_a_date_for_imported_hackathons(server):
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(server.db.hackathons.insert_one({
+        "_id": "hack-1", "title": "Imported Hack", "slug": "imported-hack", "status": "published",
+        "created_at": "2025-10-19T12:25:10.152000", "updated_at": "2025-10-20T08:00:00"
+    }))
+
+    seo = loop.run_until_complete(server.refresh_hackathon_structured_data("hack-1"))
+    assert seo["lastmod"] == server.datetime(2025, 10, 20, 8, 0)
+    loop.close()
+
+
+def test_sitemap_accepts_string_lastmod(server):
+    loop = asyncio.new_event_loop()
+    # hackathon_seo entries written before lastmod was coerced
+    loop.run_until_complete(server.db.hackathon_seo.insert_many([
+        {"_id": "hack-1", "slug": "a", "published": True, "url": "https://hackov8.example/hackathon/a",
+         "lastmod": "2025-10-19T12:25:10.152000"},
+        {"_id": "hack-2", "slug": "b", "published": True, "url": "https://hackov8.example/hackathon/b",
+         "lastmod": "not a date"},
+    ]))
+    client = TestClient(server.app)
+
+    assert client.get("/api/sitemap.xml").status_code == 200
+    shard = client.get("/api/sitemaps/hackathons-0.xml")
+    assert shard.status_code == 200
+    assert "<loc>https://hackov8.example/hackathon/a</loc><lastmod>2025-10-19</lastmod>" in shard.text
+    assert "<loc>https://hackov8.example/hackathon/b</loc><changefreq>" in shard.text
+    loop.close()
+
+
+def test_daily_stats_count_imported_registrations(server):
+    loop = asyncio.new_event_loop()
+    # database_export/registrations.json: mostly created_at only, some registered_at, all strings
+    loop.run_until_complete(server.db.registrations.insert_many([
+        {"_id": "reg-1", "user_id": "u1", "hackathon_id": "h1", "created_at": "2025-10-05T10:00:00.123000"},
+        {"_id": "reg-2", "user_id": "u2", "hackathon_id": "h1", "created_at": "2025-10-05T11:00:00"},
+        {"_id": "reg-3", "user_id": "u3", "hackathon_id": "h1", "registered_at": "2025-10-06T09:30:00"},
+    ]))
+
+    fields = server.LEGACY_TIMESTAMP_FIELDS["registrations"]
+    assert loop.run_until_complete(server.migrate_legacy_timestamps("registrations", fields)) == 3
+    assert loop.run_until_complete(server.backfill_registered_at()) == 2
+    loop.run_until_complete(server.backfill_daily_stats())
+
+    rows = {row["_id"]: row for row in loop.run_until_complete(server.db.daily_stats.find().to_list(None))}
+    assert rows["2025-10-05"]["registrations"] == 2
+    assert rows["2025-10-06"]["registrations"] == 1
+    loop.close()
@@ -0,0 +1,89 @@
+import asyncio
+import socket
+
+import pytest
+
+aiosmtpd_controller = pytest.importorskip("aiosmtpd.controller")
+
+
+class RecordingHandler:
+    """Accepts mail, except permanent (550) and one-off transient (451) recipient refusals"""
+
+    def __init__(self):
+        self.delivered = []
+        self.sessions = set()
+        self.busy_refusals = 0
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        self.sessions.add(id(session))
+        if address.startswith("bounce@"):
+            return "550 5.1.1 No such user"
+        if address.startswith("busy@") and self.busy_refusals == 0:
+            self.busy_refusals += 1
+            return "451 4.3.0 Try again later"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.delivered.extend(envelope.rcpt_tos)
+        return "250 Message accepted"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    controller = aiosmtpd_controller.Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    yield controller
+    controller.stop()
+
+
+async def wait_until_idle(mailer, timeout: float = 10):
+    async def idle():
+        while True:
+            await mailer._queue.join()
+            if not mailer._retry_tasks:
+                return
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(idle(), timeout)
+
+
+def test_mailer_pools_connection_and_retries_only_transient_failures(server, smtp_server, monkeypatch):
+    monkeypatch.setenv("SMTP_HOST", smtp_server.hostname)
+    monkeypatch.setenv("SMTP_PORT", str(smtp_server.port))
+    monkeypatch.setenv("SMTP_START_TLS", "false")
+    monkeypatch.setenv("SMTP_FROM_EMAIL", "noreply@hackov8.example")
+    monkeypatch.setenv("SMTP_POOL_SIZE", "1")
+    monkeypatch.setenv("EMAIL_RETRY_DELAY", "0.01")
+    mailer = server.Mailer()
+    assert mailer.configured
+
+    async def run():
+        mailer.start()
+        for to_email in ["a@example.com", "b@example.com", "bounce@example.com", "busy@example.com", "c@example.com"]:
+            assert mailer.enqueue(mailer.build_message(to_email, "Hi", "text", "<p>html</p>"))
+        await wait_until_idle(mailer)
+        stats = mailer.stats()
+        await mailer.stop()
+        return stats
+
+    loop = asyncio.new_event_loop()
+    stats = loop.run_until_complete(run())
+    loop.close()
+
+    handler = smtp_server.handler
+    assert sorted(handler.delivered) == ["a@example.com", "b@example.com", "busy@example.com", "c@example.com"]
+    # Every message, including the retry, went over the one pooled connection
+    assert len(handler.sessions) == 1
+    assert stats["queued"] == 5
+    assert stats["sent"] == 4
+    # The 451 is retried once; the 550 fails without being retried
+    assert stats["retried"] == 1
+    assert stats["failed"] == 1
+    assert stats["idle_connections"] == 1
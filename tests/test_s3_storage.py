@@ -0,0 +1,103 @@
+"""
+S3Storage against moto standing in for a MinIO-style server at S3_ENDPOINT_URL.
+"""
+import asyncio
+
+import pytest
+
+moto = pytest.importorskip("moto")
+requests = pytest.importorskip("requests")
+
+ENDPOINT = "http://minio.test:9000"
+
+
+@pytest.fixture
+def s3_storage(tmp_path, monkeypatch):
+    from storage import S3Storage, storage_from_env
+
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    # Route requests for the custom endpoint to moto's S3 backend
+    monkeypatch.setenv("MOTO_S3_CUSTOM_ENDPOINTS", ENDPOINT)
+    monkeypatch.setenv("STORAGE_BACKEND", "s3")
+    monkeypatch.setenv("S3_BUCKET", "uploads")
+    monkeypatch.setenv("S3_ENDPOINT_URL", ENDPOINT)
+    monkeypatch.setenv("S3_REGION", "us-east-1")
+    monkeypatch.setenv("S3_PRESIGN_EXPIRY", "600")
+    with moto.mock_aws():
+        storage = storage_from_env(tmp_path / "uploads")
+        assert isinstance(storage, S3Storage)
+        storage.client.create_bucket(Bucket="uploads")
+        yield storage
+
+
+def test_put_file_uploads_with_headers_and_consumes_source(s3_storage, tmp_path):
+    loop = asyncio.new_event_loop()
+    source = tmp_path / "upload.png"
+    source.write_bytes(b"\x89PNG banner")
+
+    loop.run_until_complete(s3_storage.put_file(
+        "blobs/ab/abcdef.png", source, content_type="image/png", cache_control="public, max-age=31536000, immutable"
+    ))
+
+    assert not source.exists()
+    assert loop.run_until_complete(s3_storage.read_bytes("blobs/ab/abcdef.png")) == b"\x89PNG banner"
+    head = s3_storage.client.head_object(Bucket="uploads", Key="blobs/ab/abcdef.png")
+    assert head["ContentType"] == "image/png"
+    assert head["CacheControl"] == "public, max-age=31536000, immutable"
+    loop.close()
+
+
+def test_missing_keys_map_to_false_and_file_not_found(s3_storage):
+    loop = asyncio.new_event_loop()
+    assert loop.run_until_complete(s3_storage.exists("missing.txt")) is False
+    with pytest.raises(FileNotFoundError):
+        loop.run_until_complete(s3_storage.read_bytes("missing.txt"))
+    with pytest.raises(FileNotFoundError):
+        loop.run_until_complete(s3_storage.rename("missing.txt", "elsewhere.txt"))
+
+    loop.run_until_complete(s3_storage.put_bytes("present.txt", b"data", content_type="text/plain"))
+    assert loop.run_until_complete(s3_storage.exists("present.txt")) is True
+    loop.run_until_complete(s3_storage.delete("present.txt"))
+    assert loop.run_until_complete(s3_storage.exists("present.txt")) is False
+    loop.close()
+
+
+def test_rename_copies_then_deletes(s3_storage):
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(s3_storage.put_bytes(".incoming/upload", b"contents"))
+
+    loop.run_until_complete(s3_storage.rename(".incoming/upload", "blobs/cd/cdef.bin"))
+
+    assert loop.run_until_complete(s3_storage.exists(".incoming/upload")) is False
+    assert loop.run_until_complete(s3_storage.read_bytes("blobs/cd/cdef.bin")) == b"contents"
+    loop.close()
+
+
+def test_download_url_is_a_working_presigned_path_style_url(s3_storage):
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(s3_storage.put_bytes("blobs/ef/ef01.txt", b"hello", content_type="text/plain"))
+
+    url = loop.run_until_complete(s3_storage.download_url("blobs/ef/ef01.txt"))
+
+    assert url.startswith(f"{ENDPOINT}/uploads/blobs/ef/ef01.txt?")
+    assert "X-Amz-Signature=" in url and "X-Amz-Expires=600" in url
+    # Clients may cache the redirect for half the signature's lifetime
+    assert s3_storage.url_max_age == 300
+    response = requests.get(url)
+    assert response.status_code == 200 and response.content == b"hello"
+    loop.close()
+
+
+def test_download_url_uses_public_url_when_configured(tmp_path, monkeypatch):
+    from storage import S3Storage
+
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    storage = S3Storage("uploads", endpoint_url=ENDPOINT, region="us-east-1", public_url="https://cdn.example/")
+
+    loop = asyncio.new_event_loop()
+    url = loop.run_until_complete(storage.download_url("blobs/ef/ef01.txt"))
+    assert url == "https://cdn.example/blobs/ef/ef01.txt"
+    assert storage.url_max_age == 3600
+    loop.close()
@@ -0,0 +1,87 @@
+import asyncio
+import io
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+from PIL import Image
+
+
+def png_bytes(size=(400, 300)) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (200, 40, 40)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def hackathon_payload(cover_image: str) -> dict:
+    start = datetime.now(timezone.utc) + timedelta(days=7)
+    return {
+        "title": "Blob Hack",
+        "description": "Testing uploads",
+        "cover_image": cover_image,
+        "category": "AI",
+        "location": "online",
+        "registration_start": datetime.now(timezone.utc).isoformat(),
+        "registration_end": start.isoformat(),
+        "event_start": start.isoformat(),
+        "event_end": (start + timedelta(days=2)).isoformat(),
+        "submission_deadline": (start + timedelta(days=2)).isoformat(),
+    }
+
+
+def test_gc_keeps_banner_referenced_by_absolute_url(server, make_user):
+    loop = asyncio.new_event_loop()
+    _, headers = loop.run_until_complete(make_user("admin"))
+    client = TestClient(server.app)
+
+    upload = client.post("/api/upload/image", headers=headers, files={"file": ("banner.png", png_bytes(), "image/png")})
+    assert upload.status_code == 200
+    relative_url = upload.json()["url"]
+
+    # What CreateHackathonModal sends: REACT_APP_BACKEND_URL + the returned url
+    absolute_url = f"https://hackov8.example{relative_url}"
+    created = client.post("/api/hackathons", headers=headers, json=hackathon_payload(absolute_url))
+    assert created.status_code == 200
+
+    digest = server.blob_store.digest_for_url(relative_url)
+    blob = loop.run_until_complete(server.db.blobs.find_one({"_id": digest}))
+    assert blob["refcount"] == 1
+
+    # Age the blob past the grace period, then collect with a fresh recount
+    loop.run_until_complete(server.db.blobs.update_one(
+        {"_id": digest},
+        {"$set": {"refcount": 0, "touched_at": datetime.now(timezone.utc) - server.BLOB_GC_GRACE * 2}}
+    ))
+    result = loop.run_until_complete(server.collect_upload_garbage())
+
+    assert result["collected"] == 0
+    blob = loop.run_until_complete(server.db.blobs.find_one({"_id": digest}))
+    assert blob is not None and blob["refcount"] == 1
+    assert loop.run_until_complete(server.storage.exists(blob["path"]))
+    loop.close()
+
+
+def test_absolute_cover_url_gets_banner_variants(server, make_user):
+    loop = asyncio.new_event_loop()
+    _, headers = loop.run_until_complete(make_user("admin"))
+    client = TestClient(server.app)
+
+    upload = client.post("/api/upload/image", headers=headers, files={"file": ("banner.png", png_bytes(), "image/png")})
+    absolute_url = f"https://hackov8.example{upload.json()['url']}"
+    created = client.post("/api/hackathons", headers=headers, json=hackathon_payload(absolute_url)).json()
+
+    hackathon = loop.run_until_complete(server.db.hackathons.find_one({"_id": created["_id"]}))
+    assert hackathon["cover_image"] == absolute_url
+    assert hackathon["cover_image_variants"] == upload.json()["variants"]
+
+    # Switching banners in the edit form looks the new variants up the same way
+    second = client.post(
+        "/api/upload/image", headers=headers, files={"file": ("other.png", png_bytes((500, 250)), "image/png")}
+    ).json()
+    updated = client.put(
+        f"/api/hackathons/{created['_id']}", headers=headers,
+        json={"cover_image": f"https://hackov8.example{second['url']}"}
+    )
+    assert updated.status_code == 200
+    hackathon = loop.run_until_complete(server.db.hackathons.find_one({"_id": created["_id"]}))
+    assert hackathon["cover_image_variants"] == second["variants"]
+    loop.close()